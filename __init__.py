@@ -183,11 +183,15 @@ def register():
     from .properties import load_properties
     load_properties()
 
-    from .customnodes.keyboardinput import register_listener
-    register_listener()
+    #interactive listeners are meaningless on a render farm
+    from .utils.farm_utils import is_render_farm
+    if (not is_render_farm()):
 
-    from .customnodes.controllerinput import register_controller_listener
-    register_controller_listener()
+        from .customnodes.keyboardinput import register_listener
+        register_listener()
+
+        from .customnodes.controllerinput import register_controller_listener
+        register_controller_listener()
 
     from .handlers import load_handlers    
     load_handlers()
@@ -223,11 +227,14 @@ def unregister():
     for cls in get_addon_classes(revert=True):
         bpy.utils.unregister_class(cls)
         
-    from .customnodes.keyboardinput import unregister_listener
-    unregister_listener()
-    
-    from .customnodes.controllerinput import unregister_controller_listener
-    unregister_controller_listener()
+    from .utils.farm_utils import is_render_farm
+    if (not is_render_farm()):
+
+        from .customnodes.keyboardinput import unregister_listener
+        unregister_listener()
+
+        from .customnodes.controllerinput import unregister_controller_listener
+        unregister_controller_listener()
     
     from .resources import unload_icons
     unload_icons() 
@@ -61,6 +61,7 @@ from . pyexpression import (
         NODEBOOSTER_NG_CP_PyExpression,
         )
 from . pynexscript import (
+        NODEBOOSTER_OT_nex_profile_export,
         NODEBOOSTER_NG_GN_PyNexScript,
         NODEBOOSTER_NG_SH_PyNexScript,
         NODEBOOSTER_NG_CP_PyNexScript,
@@ -119,6 +120,8 @@ from . interpolation.spline2dmonotonic import (
         NODEBOOSTER_ND_EnsureMonotonicity,
         )
 
+from ..utils.node_utils import add_booster_registry_hooks
+
 # For menus, in order of appearance
 # NOTE Redudancy. Perhaps menus.py could be refactored to use the _GN_, _SH_, _CP_ notations.
 # perhaps we could make use of the poll classmethod to avoid rendundancy.
@@ -277,6 +280,7 @@ classes = (
     NODEBOOSTER_NG_GN_PyExpression,
     NODEBOOSTER_NG_SH_PyExpression,
     NODEBOOSTER_NG_CP_PyExpression,
+    NODEBOOSTER_OT_nex_profile_export,
     NODEBOOSTER_NG_GN_PyNexScript,
     NODEBOOSTER_NG_SH_PyNexScript,
     NODEBOOSTER_NG_CP_PyNexScript,
@@ -312,4 +316,8 @@ classes = (
 #for utility. handlers.py module will use this list.
 allcustomnodes = tuple(cls for cls in classes if
                   (('_NG_' in cls.__name__) or
-                   ('_ND_' in cls.__name__)) )
\ No newline at end of file
+                   ('_ND_' in cls.__name__)) )
+
+#our nodes instances are kept in a registry, see 'add_booster_registry_hooks()' in 'node_utils.py'
+for cls in allcustomnodes:
+    add_booster_registry_hooks(cls)
\ No newline at end of file
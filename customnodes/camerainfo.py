@@ -9,10 +9,11 @@ from ..__init__ import get_addon_prefs
 from ..utils.str_utils import word_wrap
 from ..utils.node_utils import (
     create_new_nodegroup,
-    set_ng_socket_defvalue,
+    set_ng_socket_defvalues,
     get_booster_nodes,
     cache_booster_nodes_parent_tree,
 )
+from ..utils.dep_utils import tag_dependencies_dirty
 
 # ooooo      ooo                 .o8            
 # `888b.     `8'                "888            
@@ -29,10 +30,11 @@ class Base():
     bl_description = """Gather informations about any camera.
     • By default the camera will always use the active camera.
     • Expect updates on each depsgraph post and frame_pre update signals"""
-    auto_upd_flags = {'FRAME_PRE','DEPS_POST',}
+    auto_upd_flags = {'FRAME_PRE','DEPS_POST','PLAYBACK_BAKEABLE',}
     tree_type = "*ChildrenDefined*"
 
     def update_signal(self,context):
+        tag_dependencies_dirty()
         self.sync_out_values()
         return None 
 
@@ -114,8 +116,16 @@ class Base():
         """generic update function"""
 
         cache_booster_nodes_parent_tree(self.id_data)
+        tag_dependencies_dirty()
 
         return None
+
+    def get_dependencies(self) -> set:
+        """the data this node needs to be refreshed on, see 'dep_utils.py'"""
+
+        scene = bpy.context.scene
+        co = scene.camera if (self.use_scene_cam) else self.camera_obj
+        return {scene, co, co.data if (co) else None,}
         
     def sync_out_values(self):
         """sync output socket values with data"""
@@ -153,8 +163,7 @@ class Base():
                 values["Scale"]    = co.scale           if (valid) else (0,0,0)
                 values["Sensor Type"] = 0 if (cd.sensor_fit=='AUTO') else 2 if (cd.sensor_fit=='HORIZONTAL') else 3
 
-        for k,v in values.items():
-            set_ng_socket_defvalue(self.node_tree, socket_name=k, value=v,)
+        set_ng_socket_defvalues(self.node_tree, values)
 
         return None
 
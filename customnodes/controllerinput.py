@@ -13,7 +13,7 @@ from ..utils.zethinput import devices, reload_devices
 from ..resources import cust_icon
 from ..utils.node_utils import (
     create_new_nodegroup,
-    set_ng_socket_defvalue,
+    set_ng_socket_defvalues,
     set_ng_socket_description,
     get_booster_nodes,
     cache_booster_nodes_parent_tree,
@@ -266,25 +266,27 @@ class Base():
                         }
             controller_data = empty_dict
 
-        set_ng_socket_defvalue(ng, socket_name="Button A", value=controller_data['is_button_a_pushed'])
-        set_ng_socket_defvalue(ng, socket_name="Button B", value=controller_data['is_button_b_pushed'])
-        set_ng_socket_defvalue(ng, socket_name="Button X", value=controller_data['is_button_x_pushed'])
-        set_ng_socket_defvalue(ng, socket_name="Button Y", value=controller_data['is_button_y_pushed'])
+        set_ng_socket_defvalues(ng, {
+            "Button A": controller_data['is_button_a_pushed'],
+            "Button B": controller_data['is_button_b_pushed'],
+            "Button X": controller_data['is_button_x_pushed'],
+            "Button Y": controller_data['is_button_y_pushed'],
 
-        set_ng_socket_defvalue(ng, socket_name="Arrow Up", value=controller_data['is_arrow_up_pushed'])
-        set_ng_socket_defvalue(ng, socket_name="Arrow Down", value=controller_data['is_arrow_down_pushed'])
-        set_ng_socket_defvalue(ng, socket_name="Arrow Left", value=controller_data['is_arrow_left_pushed'])
-        set_ng_socket_defvalue(ng, socket_name="Arrow Right", value=controller_data['is_arrow_right_pushed'])
+            "Arrow Up": controller_data['is_arrow_up_pushed'],
+            "Arrow Down": controller_data['is_arrow_down_pushed'],
+            "Arrow Left": controller_data['is_arrow_left_pushed'],
+            "Arrow Right": controller_data['is_arrow_right_pushed'],
 
-        set_ng_socket_defvalue(ng, socket_name="Button Start", value=controller_data['is_start_pushed'])
+            "Button Start": controller_data['is_start_pushed'],
 
-        set_ng_socket_defvalue(ng, socket_name="Trigger LB", value=controller_data['is_left_shoulder_button'])
-        set_ng_socket_defvalue(ng, socket_name="Trigger LT", value=controller_data['left_trigger'])
-        set_ng_socket_defvalue(ng, socket_name="Trigger RB", value=controller_data['is_right_shoulder_button'])
-        set_ng_socket_defvalue(ng, socket_name="Trigger RT", value=controller_data['right_trigger'])
+            "Trigger LB": controller_data['is_left_shoulder_button'],
+            "Trigger LT": controller_data['left_trigger'],
+            "Trigger RB": controller_data['is_right_shoulder_button'],
+            "Trigger RT": controller_data['right_trigger'],
 
-        set_ng_socket_defvalue(ng, socket_name="Left Stick", value=(controller_data['leftpad_x'], controller_data['leftpad_y'], 0.0))
-        set_ng_socket_defvalue(ng, socket_name="Right Stick", value=(controller_data['rightpad_x'], controller_data['rightpad_y'], 0.0))
+            "Left Stick": (controller_data['leftpad_x'], controller_data['leftpad_y'], 0.0),
+            "Right Stick": (controller_data['rightpad_x'], controller_data['rightpad_y'], 0.0),
+            })
 
         return None
 
@@ -5,34 +5,285 @@
 
 # NOTE:
 # the evaluator module role is to evaluate the value of a socket upstream.
-# it will assume that the node class upstream possess 'node.evaluator_properties' set, 
+# it will assume that the node class upstream possess 'node.evaluator_properties' set,
 # and an evaluator() function that accepts a socket as argument.
 # the evaluator shall return the value for the equivalent passed socket.
 
-# TODO:
-# - need some sort of system to see which node is dirty.
-# - we could store the evaluated values as a node python numpy property
+# NOTE about the evaluation cache:
+# - The evaluated values are memoized per nodetree, keyed by (node pointer, output socket identifier).
+#   Several consumers (ex: the XYZ curves of a Map node, or many Map nodes) sharing an upstream branch evaluate it once.
+# - The cache of a nodetree is valid for a revision of its topology, see 'get_tree_topology_revision()' in
+#   'graph_utils.py'. Linking, unlinking, adding or removing nodes invalidates it. Values edits don't.
+# - Nodes call 'tag_evaluation_dirty(node)' when one of their properties changed, the node and all the nodes
+#   downstream are dropped from the cache, so only the changed branches are evaluated again.
+# - Nodes reading data outside of their nodetree can define a 'get_evaluator_dependencies()' method returning
+#   ID datablocks or the 'FRAME' key. These nodes are tagged dirty when their dependencies are updated, see handlers.
+# - Like in 'node_utils', we don't store any bpy object in globals. Node pointers are only valid for a revision,
+#   the cache is dropped on file load & undo.
+
+# NOTE about the compiled evaluation:
+# - Once per topology revision of a nodetree, 'compile_interpolation_graph()' resolves the upstream source of every
+#   interpolation input socket of our evaluator nodes, and sorts the interpolation nodes feeding the consumers
+#   (Map, Remap, Preview..) topologically.
+# - Consumers call 'evaluate_interpolation_graph()' first: every node is evaluated exactly once, upstream first,
+#   into the evaluation cache. Pulling the values with 'evaluate_upstream_value()' is then a cache lookup, and the
+#   sockets sources are read from the compiled plan instead of parcouring the nodetree again.
 
 
 import bpy
-from ...utils.node_utils import socket_intersections
+
+from collections import deque
+
+from ...utils.node_utils import socket_intersections, get_node_tree_owner, get_node_tree_from_owner
+from ...utils.graph_utils import get_tree_graph, get_tree_topology_revision
+
+
+_EVALUATION_CACHE = {}     #nodetree session_uid -> {'revision':tuple, 'values':{(node pointer, identifier):value}, 'nodes':{node name:node pointer}}
+_EVALUATION_DEPENDENCIES = {} #dependency key -> set of (nodetree session_uid, owner type, owner name, node name)
+_COMPILED_GRAPHS = {}      #nodetree session_uid -> compiled plan, see 'compile_interpolation_graph()'
+
+INTERPOLATION_SOCKET = 'NodeBoosterCustomSocketInterpolation'
+
+
+def clear_evaluation_cache() -> None:
+    """forget all evaluated values, ex: on file load or undo"""
+    _EVALUATION_CACHE.clear()
+    _EVALUATION_DEPENDENCIES.clear()
+    _COMPILED_GRAPHS.clear()
+    return None
+
+def _get_tree_evaluation_cache(node_tree) -> dict:
+    """get the evaluation cache of a nodetree, emptied if its topology changed"""
+
+    revision = get_tree_topology_revision(node_tree)
+
+    cache = _EVALUATION_CACHE.get(node_tree.session_uid)
+    if (cache is None) or (cache['revision']!=revision):
+        cache = _EVALUATION_CACHE[node_tree.session_uid] = {'revision':revision, 'values':{}, 'nodes':{}, 'complete':False,}
+
+    return cache
+
+def tag_evaluation_dirty(node) -> None:
+    """the values of this node changed, drop it and the nodes downstream from the evaluation cache"""
+
+    node_tree = node.id_data
+    cache = _EVALUATION_CACHE.get(node_tree.session_uid)
+    if (not cache) or (not cache['values']):
+        return None
+
+    graph = get_tree_graph(node_tree)
+    ni = graph.node_index.get(node.name)
+    if (ni is None):
+        cache['values'].clear()
+        return None
+
+    cache['complete'] = False
+    dirty = {cache['nodes'].pop(graph.node_names[nj], None) for nj in graph.reachable_nodes((ni,), direction='RIGHT')}
+    dirty.discard(None)
+    if (dirty):
+        for key in [k for k in cache['values'] if (k[0] in dirty)]:
+            del cache['values'][key]
+
+    return None
+
+def tag_evaluation_dependencies_dirty(keys:set) -> None:
+    """the given dependencies were updated, tag the nodes depending on them dirty.
+    keys are ID session_uid, or 'FRAME' on frame change"""
+
+    if (not _EVALUATION_DEPENDENCIES):
+        return None
+
+    for key in keys:
+        for uid, owner_type, owner_name, node_name in _EVALUATION_DEPENDENCIES.pop(key, ()):
+            cache = _EVALUATION_CACHE.get(uid)
+            if (not cache) or (node_name not in cache['nodes']):
+                continue
+            node_tree = get_node_tree_from_owner(owner_type, owner_name)
+            node = node_tree.nodes.get(node_name) if (node_tree and node_tree.session_uid==uid) else None
+            if (node is None):
+                del _EVALUATION_CACHE[uid]
+                continue
+            tag_evaluation_dirty(node)
+            continue
+
+    return None
+
+def tag_updated_evaluation_dependencies(depsgraph) -> None:
+    """tag the nodes depending on the IDs updated in this depsgraph signal dirty"""
+
+    if (not _EVALUATION_DEPENDENCIES):
+        return None
+
+    tag_evaluation_dependencies_dirty({upd.id.original.session_uid for upd in depsgraph.updates})
+    return None
+
+def _register_evaluator_dependencies(node) -> None:
+    """index the external dependencies of a node we just evaluated"""
+
+    get_dependencies = getattr(node, 'get_evaluator_dependencies', None)
+    if (get_dependencies is None):
+        return None
+
+    owner_type, owner_name = get_node_tree_owner(node.id_data)
+    if (owner_type is None):
+        return None
+
+    key = (node.id_data.session_uid, owner_type, owner_name, node.name)
+    for dep in get_dependencies():
+        if (dep is None):
+            continue
+        dep = dep if (type(dep) is str) else dep.original.session_uid
+        _EVALUATION_DEPENDENCIES.setdefault(dep, set()).add(key)
+        continue
+
+    return None
+
+
+def compile_interpolation_graph(node_tree) -> dict:
+    """get the compiled evaluation plan of this nodetree, compiled again if its topology changed. The plan contains:
+    - 'sources': {(node name, input identifier): [(source node name, output index, output identifier, link index)]}
+    - 'order': [(node name, [(output index, output identifier)])] interpolation nodes feeding consumers, upstream first"""
+
+    revision = get_tree_topology_revision(node_tree)
+
+    plan = _COMPILED_GRAPHS.get(node_tree.session_uid)
+    if (plan is not None) and (plan['revision']==revision):
+        return plan
+
+    graph = get_tree_graph(node_tree)
+
+    #find our evaluator nodes
+    producers, consumers = set(), set()
+    for ni, idname in enumerate(graph.node_idnames):
+        if ('NodeBooster' not in idname):
+            continue
+        properties = getattr(node_tree.nodes.get(graph.node_names[ni]), 'evaluator_properties', ())
+        if ('INTERPOLATION_NODE' in properties):
+            producers.add(ni)
+        if ('INTERPOLATION_OUTPUT' in properties):
+            consumers.add(ni)
+        continue
+
+    #resolve the sources of their interpolation sockets
+    sources, upstream = {}, {}
+    for ni in producers | consumers:
+        for si in graph.node_inputs[ni]:
+            if (graph.socket_idnames[si]!=INTERPOLATION_SOCKET):
+                continue
+            hits = []
+            for sj, lis in graph.socket_intersections(si, direction='LEFT').items():
+                hits.append((graph.node_names[graph.socket_node[sj]], graph.socket_index[sj], graph.socket_identifiers[sj], lis[0]))
+                if (graph.socket_node[sj] in producers):
+                    upstream.setdefault(ni, set()).add(graph.socket_node[sj])
+            sources[(graph.node_names[ni], graph.socket_identifiers[si])] = hits
+            continue
+
+    #sort the producers feeding our consumers, upstream first
+    needed = set()
+    stack = [nj for ni in consumers for nj in upstream.get(ni, ())]
+    while stack:
+        ni = stack.pop()
+        if (ni not in needed):
+            needed.add(ni)
+            stack.extend(upstream.get(ni, ()))
+
+    indegree = {ni:len(upstream.get(ni, set()) & needed) for ni in needed}
+    downstream = {}
+    for ni in needed:
+        for nj in upstream.get(ni, ()):
+            downstream.setdefault(nj, []).append(ni)
+
+    queue = deque(sorted(ni for ni,d in indegree.items() if (d==0)))
+    order = []
+    while queue:
+        ni = queue.popleft()
+        order.append(ni)
+        for nj in downstream.get(ni, ()):
+            indegree[nj] -= 1
+            if (indegree[nj]==0):
+                queue.append(nj)
+
+    plan = _COMPILED_GRAPHS[node_tree.session_uid] = {
+        'revision': revision,
+        'sources': sources,
+        'order': [(graph.node_names[ni],
+                   [(graph.socket_index[si], graph.socket_identifiers[si]) for si in graph.node_outputs[ni] if (graph.socket_idnames[si]==INTERPOLATION_SOCKET)])
+                  for ni in order],
+        }
+    return plan
+
+def _evaluate_node_output(node, socket):
+    """evaluate the output socket of a node, or get its value from the evaluation cache"""
+
+    cachekey = (node.as_pointer(), socket.identifier)
+
+    cache = _get_tree_evaluation_cache(node.id_data)
+    if (cachekey in cache['values']):
+        return cache['values'][cachekey]
+
+    r = node.evaluator(socket)
+
+    #the evaluation of the upstream nodes might have reset the cache, if the topology changed meanwhile.
+    cache = _get_tree_evaluation_cache(node.id_data)
+    cache['values'][cachekey] = r
+    cache['nodes'][node.name] = cachekey[0]
+    _register_evaluator_dependencies(node)
+
+    return r
+
+def evaluate_interpolation_graph(node_tree) -> None:
+    """evaluate every interpolation node feeding a consumer of this nodetree once, upstream first"""
+
+    cache = _get_tree_evaluation_cache(node_tree)
+    if (cache['complete']):
+        return None
+
+    for node_name, outputs in compile_interpolation_graph(node_tree)['order']:
+        node = node_tree.nodes.get(node_name)
+        if (node is None):
+            continue
+        for idx, _ in outputs:
+            _evaluate_node_output(node, node.outputs[idx])
+        continue
+
+    _get_tree_evaluation_cache(node_tree)['complete'] = True
+    return None
 
 
 def evaluate_upstream_value(sock, match_evaluator_properties:set=None, set_link_invalid:bool=False, cached_values:dict=None):
     """evaluate the value of a socket upstream, fallback to None if the node upstream is not compatible or not linked.
     -Pass a match_evaluator_properties set to check if the node upstream node is compatible. ex: {'INTERPOLATION_NODE',}
     -Pass a set_link_invalid to set the link invalid if the node upstream is not compatible.
-    -Pass a cached_values dict to cache the evaluated values, in order to avoid redundand evaluations calculations.
+    -Pass a cached_values dict to cache the evaluated values for the duration of a single evaluation,
+     on top of the nodetree evaluation cache.
     """
 
-    # if the socket is not links, there's nothing to fetch upstream..
-    if (not sock.links):
-        return None
+    node_tree = sock.id_data
+
+    #the sources of the interpolation sockets of our evaluator nodes are resolved in the compiled plan
+    hits = compile_interpolation_graph(node_tree)['sources'].get((sock.node.name, sock.identifier))
+    if (hits is not None):
+        graph = get_tree_graph(node_tree)
+        parcour_info = {}
+        for node_name, idx, _, li in hits:
+            node = node_tree.nodes.get(node_name)
+            link = graph.link(node_tree, li)
+            if (node is None) or (link is None):
+                parcour_info = None
+                break
+            parcour_info[node.outputs[idx]] = [link]
+
+    #else, or if the plan is not matching the nodetree anymore, we parcour the nodetree.
+    if (hits is None) or (parcour_info is None):
 
-    #get colliding nodes upstream, on the left in {socket:links}
-    #return a dictionary of {colliding_socket:parcoured_links[]}
-    parcour_info = socket_intersections(sock, direction='LEFT')
-    # print(f"DEBUG: parcour_info: {parcour_info}, len: {len(parcour_info)}")
+        # if the socket is not links, there's nothing to fetch upstream..
+        if (not sock.links):
+            return None
+
+        #get colliding nodes upstream, on the left in {socket:links}
+        #return a dictionary of {colliding_socket:parcoured_links[]}
+        parcour_info = socket_intersections(sock, direction='LEFT')
+        # print(f"DEBUG: parcour_info: {parcour_info}, len: {len(parcour_info)}")
 
     #nothing hit?
     if (not parcour_info):
@@ -52,7 +303,7 @@ def evaluate_upstream_value(sock, match_evaluator_properties:set=None, set_link_
     if (not hasattr(colliding_node,'evaluator_properties')) \
         or (not hasattr(colliding_node,'evaluator')) \
         or (not match_evaluator_properties.intersection(colliding_node.evaluator_properties)):
-        
+
         # print(f"DEBUG: parcour not successful.\n{colliding_node}")
         if (set_link_invalid and parcoured_links):
             first_link = parcoured_links[0]
@@ -60,14 +311,13 @@ def evaluate_upstream_value(sock, match_evaluator_properties:set=None, set_link_
         return None
 
     #caching system, perhaps multiple input sockets links to the same out socket..
-    if (cached_values):
-          cachekey = colliding_node.name + ':' + colliding_socket.identifier
-          r = cached_values.get(cachekey)
-    else: r = None
+    cachekey = (colliding_node.as_pointer(), colliding_socket.identifier)
+    if (cached_values is not None) and (cachekey in cached_values):
+        return cached_values[cachekey]
+
+    r = _evaluate_node_output(colliding_node, colliding_socket)
 
-    if (r is None):
-        r = colliding_node.evaluator(colliding_socket)
-        if (cached_values):
-            cached_values[cachekey] = r
+    if (cached_values is not None):
+        cached_values[cachekey] = r
 
-    return r
\ No newline at end of file
+    return r
@@ -9,9 +9,10 @@ import os
 from ...__init__ import get_addon_prefs
 from ...utils.str_utils import word_wrap
 from ...utils.bezier2d_utils import reverseengineer_curvemapping_to_bezsegs
+from ..evaluator import tag_evaluation_dirty
+from ...utils.queue_utils import queue_node_rebuild, queue_node_refresh
 from ...utils.node_utils import (
     import_new_nodegroup, 
-    send_refresh_signal,
     cache_booster_nodes_parent_tree,
 )
 
@@ -65,7 +66,7 @@ class Base():
             ("vector_mapping", "Signed Values", "Delimit your graph to signed values, ranging from -1 to 1"),
             ],
         default="float_mapping",
-        update=lambda self, context: self.update_trigger(),
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger'),
         ) #item names are name of internal nodes as well.
 
     @classmethod
@@ -172,10 +173,16 @@ class Base():
     def update_trigger(self,):
         """send an update trigger to the whole node_tree"""
 
-        send_refresh_signal(self.outputs[0])
+        #our values changed, the nodes downstream will need to evaluate us again.
+        tag_evaluation_dirty(self)
+        queue_node_refresh(self)
 
         return None
 
+    def get_evaluator_dependencies(self) -> set:
+        """our values are read from the curve mapping of our nodetree, see evaluator module"""
+        return {self.node_tree}
+
     def evaluator(self, socket_output)->list: 
         """evaluator the node required for the output evaluator"""
 
@@ -10,9 +10,9 @@ import numpy as np
 from ... import get_addon_prefs
 from ...utils.str_utils import word_wrap
 from ...utils.bezier2d_utils import looped_offset_bezsegs
-from ..evaluator import evaluate_upstream_value
+from ..evaluator import evaluate_upstream_value, tag_evaluation_dirty
+from ...utils.queue_utils import queue_node_rebuild, queue_node_refresh
 from ...utils.node_utils import (
-    send_refresh_signal,
     cache_booster_nodes_parent_tree,
 )
 
@@ -47,13 +47,13 @@ class NODEBOOSTER_ND_InterpolationLoop(bpy.types.Node):
                ('ANIMATION', 'Animation', 'Loop an animation curve'),
               ),
         default='OFFSET',
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
     offset : bpy.props.FloatProperty(
         name="Offset",
         description="The offset to loop the curve by",
         default=0.0,
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
     speed : bpy.props.FloatProperty(
         name="Speed",
@@ -61,7 +61,7 @@ class NODEBOOSTER_ND_InterpolationLoop(bpy.types.Node):
         default=1.0,
         soft_min=-10.0,
         soft_max=10.0,
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
 
     @classmethod
@@ -98,10 +98,18 @@ class NODEBOOSTER_ND_InterpolationLoop(bpy.types.Node):
     def update_trigger(self,):
         """send an update trigger to the whole node_tree"""
 
-        send_refresh_signal(self.outputs[0])
+        #our values changed, the nodes downstream will need to evaluate us again.
+        tag_evaluation_dirty(self)
+        queue_node_refresh(self)
 
         return None
 
+    def get_evaluator_dependencies(self) -> set:
+        """in animation mode our values depend on the current frame, see evaluator module"""
+        if (self.mode=='ANIMATION'):
+            return {'FRAME'}
+        return set()
+
     def evaluator(self, socket_output)->None:
         """evaluator the node required for the output evaluator"""
 
@@ -9,7 +9,8 @@ import os
 from ...__init__ import get_addon_prefs
 from ...utils.str_utils import word_wrap
 from ...utils.bezier2d_utils import bezsegs_to_curvemapping, reset_curvemapping
-from ..evaluator import evaluate_upstream_value
+from ..evaluator import evaluate_upstream_value, evaluate_interpolation_graph
+from ...utils.queue_utils import queue_node_rebuild, queue_tree_refresh
 from ...utils.node_utils import (
     import_new_nodegroup, 
     set_node_socketattr,
@@ -45,7 +46,7 @@ class Base():
         items=(('FLOAT', "Float", "Float interpolation"),
                ('COLOR', "Color", "Color interpolation"),
                ('VECTOR', "Vector", "Vector interpolation"),),
-        update= lambda self, context: self.update(),
+        update=lambda self, context: queue_node_rebuild(self, 'update'),
         )
 
     @classmethod
@@ -189,6 +190,9 @@ class Base():
         #NOTE sock_to_evaluate rerpresents the name of the our custom interpolation socket types.
         # and the equivalent node.mapping.curve that needs to be updated.
 
+        #evaluate the interpolation nodes of our nodetree once, upstream first. See the evaluator module.
+        evaluate_interpolation_graph(self.id_data)
+
         #get all nodes connected to the value socket
         cache = {}
         for k,c in sock_to_evaluate.items():
@@ -208,15 +212,13 @@ class Base():
             continue
 
         # NOTE unfortunately python API for curve mapping is meh..
-        # we need to send an update trigger. Maybe there's a solution for this?.
+        # we need to send an update trigger. Our nodegroup is tagged once on the next tick, see queue_utils.
         for nd in self.node_tree.nodes:
             if nd.name in {'float_map', 'vector_map', 'color_map'}:
-                #send a hard refresh trigger. 
                 nd.mapping.update()
-                nd.mute = not nd.mute
-                nd.mute = not nd.mute
                 nd.update()
                 continue
+        queue_tree_refresh(self.node_tree)
 
         return None
 
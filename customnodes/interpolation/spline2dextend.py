@@ -10,9 +10,9 @@ import numpy as np
 from ...__init__ import get_addon_prefs
 from ...utils.str_utils import word_wrap
 from ...utils.bezier2d_utils import extend_bezsegs
-from ..evaluator import evaluate_upstream_value
+from ..evaluator import evaluate_upstream_value, tag_evaluation_dirty
+from ...utils.queue_utils import queue_node_rebuild, queue_node_refresh
 from ...utils.node_utils import (
-    send_refresh_signal,
     cache_booster_nodes_parent_tree,
 )
 
@@ -42,7 +42,7 @@ class NODEBOOSTER_ND_2DCurveExtend(bpy.types.Node):
                ('HORIZONTAL', 'Horizontal', 'Extend the curve horizontally'),
               ),
         default='HANDLE',
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
     xloc : bpy.props.FloatProperty(
         name="X Location",
@@ -50,7 +50,7 @@ class NODEBOOSTER_ND_2DCurveExtend(bpy.types.Node):
         default=0.0,
         soft_min=-2.0,
         soft_max=2.0,
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
 
     @classmethod
@@ -89,7 +89,9 @@ class NODEBOOSTER_ND_2DCurveExtend(bpy.types.Node):
     def update_trigger(self,):
         """send an update trigger to the whole node_tree"""
 
-        send_refresh_signal(self.outputs[0])
+        #our values changed, the nodes downstream will need to evaluate us again.
+        tag_evaluation_dirty(self)
+        queue_node_refresh(self)
 
         return None
 
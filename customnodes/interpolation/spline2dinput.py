@@ -8,8 +8,9 @@ import numpy as np
 
 from ...utils.bezier2d_utils import reverseengineer_curvemapping_to_bezsegs
 from ...utils.str_utils import word_wrap # Added for draw_panel
+from ..evaluator import tag_evaluation_dirty
+from ...utils.queue_utils import queue_node_rebuild, queue_node_refresh
 from ...utils.node_utils import (
-    send_refresh_signal,
     cache_booster_nodes_parent_tree,
     )
 
@@ -29,7 +30,7 @@ class NODEBOOSTER_ND_2DCurveInput(bpy.types.Node):
         name="Curve Object",
         description="Select the 3D Curve object to sample",
         poll=lambda self, object: object.type == 'CURVE', 
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
     axis_source: bpy.props.EnumProperty(
         items=[
@@ -40,14 +41,14 @@ class NODEBOOSTER_ND_2DCurveInput(bpy.types.Node):
         name="Source Axis",
         description="Which axis of the 3D curve points maps to the 2D curve's Y value",
         default='Z',
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
     spline_index: bpy.props.IntProperty(
         name="Spline Index",
         description="Index of the spline to use within the curve object",
         default=0,
         min=0,
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
     space: bpy.props.EnumProperty(
         name="Space",
@@ -57,7 +58,7 @@ class NODEBOOSTER_ND_2DCurveInput(bpy.types.Node):
             ('WORLD', 'Relative', 'Use curve points in world space')
             ],
         default='LOCAL',
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
 
     @classmethod
@@ -88,7 +89,9 @@ class NODEBOOSTER_ND_2DCurveInput(bpy.types.Node):
     def update_trigger(self,):
         """send an update trigger to the whole node_tree"""
 
-        send_refresh_signal(self.outputs[0])
+        #our values changed, the nodes downstream will need to evaluate us again.
+        tag_evaluation_dirty(self)
+        queue_node_refresh(self)
 
         return None
 
@@ -125,6 +128,12 @@ class NODEBOOSTER_ND_2DCurveInput(bpy.types.Node):
     def draw_panel(self, layout, context):
         pass
 
+    def get_evaluator_dependencies(self) -> set:
+        """our values are read from the curve object, see evaluator module"""
+        if (self.curve_object is None):
+            return set()
+        return {self.curve_object, self.curve_object.data}
+
     def evaluator(self, socket_output)->list:
 
         curve_obj = self.curve_object
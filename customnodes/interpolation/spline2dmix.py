@@ -10,9 +10,9 @@ import numpy as np
 from ... import get_addon_prefs
 from ...utils.str_utils import word_wrap
 from ...utils.bezier2d_utils import lerp_bezsegs
-from ..evaluator import evaluate_upstream_value
+from ..evaluator import evaluate_upstream_value, tag_evaluation_dirty
+from ...utils.queue_utils import queue_node_rebuild, queue_node_refresh
 from ...utils.node_utils import (
-    send_refresh_signal,
     cache_booster_nodes_parent_tree,
 )
 
@@ -41,7 +41,7 @@ class NODEBOOSTER_ND_2DCurvesMix(bpy.types.Node):
         min=0.0,
         max=1.0,
         step=0.01,
-        update=lambda self, context: self.update_trigger(),
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger'),
         )
     
     @classmethod
@@ -79,7 +79,9 @@ class NODEBOOSTER_ND_2DCurvesMix(bpy.types.Node):
     def update_trigger(self,):
         """send an update trigger to the whole node_tree"""
 
-        send_refresh_signal(self.outputs[0])
+        #our values changed, the nodes downstream will need to evaluate us again.
+        tag_evaluation_dirty(self)
+        queue_node_refresh(self)
 
         return None
 
@@ -16,7 +16,7 @@ from ...utils.bezier2d_utils import (
     hash_bezsegs,
     sample_bezsegs,
 )
-from ..evaluator import evaluate_upstream_value
+from ..evaluator import evaluate_upstream_value, evaluate_interpolation_graph
 from ...utils.node_utils import (
     import_new_nodegroup, 
     set_node_socketattr,
@@ -174,6 +174,9 @@ class NODEBOOSTER_ND_2DCurvePreview(bpy.types.Node):
     def evaluator(self,)->None:
         """evaluator the node required for the output evaluator"""
 
+        #evaluate the interpolation nodes of our nodetree once, upstream first. See the evaluator module.
+        evaluate_interpolation_graph(self.id_data)
+
         result = evaluate_upstream_value(self.inputs[0],
             match_evaluator_properties={'INTERPOLATION_NODE',},
             set_link_invalid=True,
@@ -10,9 +10,9 @@ import numpy as np
 from ... import get_addon_prefs
 from ...utils.str_utils import word_wrap
 from ...utils.bezier2d_utils import casteljau_subdiv_bezsegs, cut_bezsegs, subdiv_project_bezsegs
-from ..evaluator import evaluate_upstream_value
+from ..evaluator import evaluate_upstream_value, tag_evaluation_dirty
+from ...utils.queue_utils import queue_node_rebuild, queue_node_refresh
 from ...utils.node_utils import (
-    send_refresh_signal,
     cache_booster_nodes_parent_tree,
 )
 
@@ -43,7 +43,7 @@ class NODEBOOSTER_ND_2DCurveSubdiv(bpy.types.Node):
                ('PROJECT', 'Project', "Subdivide the chosen curve for every projected anchor of the reference curve along their relative tangent distance"),
                ),
         default='SUBDIV',
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
     subdiv_level : bpy.props.IntProperty(
         name="Level",
@@ -51,7 +51,7 @@ class NODEBOOSTER_ND_2DCurveSubdiv(bpy.types.Node):
         default=1,
         min=1,
         soft_max=3,
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
     xloc : bpy.props.FloatProperty(
         name="X Location",
@@ -59,7 +59,7 @@ class NODEBOOSTER_ND_2DCurveSubdiv(bpy.types.Node):
         default=0.0,
         soft_min=-2.0,
         soft_max=2.0,
-        update=lambda self, context: self.update_trigger()
+        update=lambda self, context: queue_node_rebuild(self, 'update_trigger')
         )
 
     @classmethod
@@ -111,7 +111,9 @@ class NODEBOOSTER_ND_2DCurveSubdiv(bpy.types.Node):
             self.inputs[0].name = 'To Subdivide'
             self.inputs[1].enabled = True
 
-        send_refresh_signal(self.outputs[0])
+        #our values changed, the nodes downstream will need to evaluate us again.
+        tag_evaluation_dirty(self)
+        queue_node_refresh(self)
 
         return None
 
@@ -37,7 +37,7 @@ from ..utils.str_utils import word_wrap
 from ..resources import cust_icon
 from ..utils.node_utils import (
     create_new_nodegroup,
-    set_ng_socket_defvalue,
+    set_ng_socket_defvalues,
     set_ng_socket_description,
     create_ng_socket,
     remove_ng_socket,
@@ -535,27 +535,31 @@ class Base():
         ng = self.node_tree
 
         # Update node outputs based on event data
-        set_ng_socket_defvalue(ng, socket_name="Mouse Position", value=(event_data['mouse_region_x'], event_data['mouse_region_y'], 0.0))
-        set_ng_socket_defvalue(ng, socket_name="Mouse Direction", value=(event_data['mouse_direction_x'], event_data['mouse_direction_y'], 0.0))
-        set_ng_socket_defvalue(ng, socket_name="Mouse Velocity", value=event_data['mouse_velocity'])
-        set_ng_socket_defvalue(ng, socket_name="Ctrl", value=event_data['ctrl'])
-        set_ng_socket_defvalue(ng, socket_name="Shift", value=event_data['shift'])
-        set_ng_socket_defvalue(ng, socket_name="Alt", value=event_data['alt'])
-        set_ng_socket_defvalue(ng, socket_name="Left Click", value=event_data['LEFTMOUSE'])
-        set_ng_socket_defvalue(ng, socket_name="Right Click", value=event_data['RIGHTMOUSE'])
-        set_ng_socket_defvalue(ng, socket_name="Middle Click", value=event_data['MIDDLEMOUSE'])
-        set_ng_socket_defvalue(ng, socket_name="Wheel Up", value=event_data['WHEELUPMOUSE'])
-        set_ng_socket_defvalue(ng, socket_name="Wheel Down", value=event_data['WHEELDOWNMOUSE'])
+        values = {
+            "Mouse Position": (event_data['mouse_region_x'], event_data['mouse_region_y'], 0.0),
+            "Mouse Direction": (event_data['mouse_direction_x'], event_data['mouse_direction_y'], 0.0),
+            "Mouse Velocity": event_data['mouse_velocity'],
+            "Ctrl": event_data['ctrl'],
+            "Shift": event_data['shift'],
+            "Alt": event_data['alt'],
+            "Left Click": event_data['LEFTMOUSE'],
+            "Right Click": event_data['RIGHTMOUSE'],
+            "Middle Click": event_data['MIDDLEMOUSE'],
+            "Wheel Up": event_data['WHEELUPMOUSE'],
+            "Wheel Down": event_data['WHEELDOWNMOUSE'],
+            }
 
         # Update custom event outputs
         user_keys = [k.name for k in self.outputs if k.name.endswith(" Key")]
         for k in user_keys:
             data = k.replace(" Key", "")
             value = event_data.get(data, False)
-            set_ng_socket_defvalue(ng, socket_name=k, value=value)
+            values[k] = value
             if (not value):
                 STORAGE.custom_event_types.add(data)
 
+        set_ng_socket_defvalues(ng, values)
+
         return None
 
     def draw_label(self):
@@ -9,11 +9,12 @@ from ..__init__ import get_addon_prefs
 from ..utils.str_utils import word_wrap
 from ..utils.node_utils import (
     create_new_nodegroup,
-    set_ng_socket_defvalue,
+    set_ng_socket_defvalues,
     set_node_socketattr,
     get_booster_nodes,
     cache_booster_nodes_parent_tree,
 )
+from ..utils.dep_utils import tag_dependencies_dirty
 
 
 # ooooo      ooo                 .o8            
@@ -30,10 +31,11 @@ class Base():
     bl_label = "Light Info"
     bl_description = """Gather informations about any lights.
     • Expect updates on each depsgraph post and frame_pre update signals"""
-    auto_upd_flags = {'FRAME_PRE','DEPS_POST',}
+    auto_upd_flags = {'FRAME_PRE','DEPS_POST','PLAYBACK_BAKEABLE',}
     tree_type = "*ChildrenDefined*"
 
     def update_signal(self,context):
+        tag_dependencies_dirty()
         self.sync_out_values()
         return None 
 
@@ -133,9 +135,16 @@ class Base():
         """generic update function"""
 
         cache_booster_nodes_parent_tree(self.id_data)
+        tag_dependencies_dirty()
 
         return None
 
+    def get_dependencies(self) -> set:
+        """the data this node needs to be refreshed on, see 'dep_utils.py'"""
+
+        lo = self.light_obj
+        return {lo, lo.data if (lo) else None,}
+
     def sync_out_values(self):
         """sync output socket values with data"""
 
@@ -146,17 +155,18 @@ class Base():
         valid = (lo and ld)
 
         #different behavior and sockets depending on editor type and light type
+        values = {}
 
         if (not valid):
             ltype = "" if is_geonode else 0
             if (not is_geonode):
-                  set_ng_socket_defvalue(ng, socket_name="Location", value=(0,0,0))
-                  set_ng_socket_defvalue(ng, socket_name="Rotation", value=(0,0,0))
-                  set_ng_socket_defvalue(ng, socket_name="Scale", value=(0,0,0))
-            else: set_ng_socket_defvalue(ng, socket_name="Object", value=None)
-            set_ng_socket_defvalue(ng, socket_name="Type", value=ltype)
-            set_ng_socket_defvalue(ng, socket_name="Color", value=[0.0, 0.0, 0.0, 0.0])
-            set_ng_socket_defvalue(ng, socket_name="Power", value=0.0)
+                  values["Location"] = (0,0,0)
+                  values["Rotation"] = (0,0,0)
+                  values["Scale"] = (0,0,0)
+            else: values["Object"] = None
+            values["Type"] = ltype
+            values["Color"] = [0.0, 0.0, 0.0, 0.0]
+            values["Power"] = 0.0
             set_node_socketattr(self, socket_name="Shape", attribute='enabled', value=False, in_out='OUTPUT',)
             set_node_socketattr(self, socket_name="Size X", attribute='enabled', value=False, in_out='OUTPUT',)
             set_node_socketattr(self, socket_name="Size Y", attribute='enabled', value=False, in_out='OUTPUT',)
@@ -167,6 +177,7 @@ class Base():
             set_node_socketattr(self, socket_name="Size", attribute='enabled', value=False, in_out='OUTPUT',)
             set_node_socketattr(self, socket_name="Blend", attribute='enabled', value=False, in_out='OUTPUT',)
             set_node_socketattr(self, socket_name="Show Cone", attribute='enabled', value=False, in_out='OUTPUT',)
+            set_ng_socket_defvalues(ng, values)
             return None
 
         if (ld.type not in {'POINT','SUN','SPOT','AREA',}):
@@ -175,13 +186,13 @@ class Base():
         #These are always on and shared across all
         ltype = ld.type  if is_geonode else 0 if (ld.type=='POINT')   else 1 if (ld.type=='SUN')        else 2 if (ld.type=='SPOT')  else 3
         if (not is_geonode):
-              set_ng_socket_defvalue(ng, socket_name="Location", value=lo.location)
-              set_ng_socket_defvalue(ng, socket_name="Rotation", value=lo.rotation_euler)
-              set_ng_socket_defvalue(ng, socket_name="Scale", value=lo.scale)
-        else: set_ng_socket_defvalue(ng, socket_name="Object", value=lo)
-        set_ng_socket_defvalue(ng, socket_name="Type", value=ltype)
-        set_ng_socket_defvalue(ng, socket_name="Color", value=[ld.color[0], ld.color[1], ld.color[2], 1.0])
-        set_ng_socket_defvalue(ng, socket_name="Power", value=ld.energy)
+              values["Location"] = lo.location
+              values["Rotation"] = lo.rotation_euler
+              values["Scale"] = lo.scale
+        else: values["Object"] = lo
+        values["Type"] = ltype
+        values["Color"] = [ld.color[0], ld.color[1], ld.color[2], 1.0]
+        values["Power"] = ld.energy
 
         #below depends on lught type
         match ld.type:
@@ -190,8 +201,8 @@ class Base():
                 set_node_socketattr(self, socket_name="Size X", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Size Y", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Spread", attribute='enabled', value=False, in_out='OUTPUT',)
-                set_ng_socket_defvalue(ng, socket_name="Soft Falloff", value=ld.use_soft_falloff)
-                set_ng_socket_defvalue(ng, socket_name="Radius", value=ld.shadow_soft_size)
+                values["Soft Falloff"] = ld.use_soft_falloff
+                values["Radius"] = ld.shadow_soft_size
                 set_node_socketattr(self, socket_name="Angle", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Size", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Blend", attribute='enabled', value=False, in_out='OUTPUT',)
@@ -204,7 +215,7 @@ class Base():
                 set_node_socketattr(self, socket_name="Spread", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Soft Falloff", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Radius", attribute='enabled', value=False, in_out='OUTPUT',)
-                set_ng_socket_defvalue(ng, socket_name="Angle", value=ld.angle)
+                values["Angle"] = ld.angle
                 set_node_socketattr(self, socket_name="Size", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Blend", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Show Cone", attribute='enabled', value=False, in_out='OUTPUT',)
@@ -214,8 +225,8 @@ class Base():
                 set_node_socketattr(self, socket_name="Size X", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Size Y", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Spread", attribute='enabled', value=False, in_out='OUTPUT',)
-                set_ng_socket_defvalue(ng, socket_name="Soft Falloff", value=ld.use_soft_falloff)
-                set_ng_socket_defvalue(ng, socket_name="Radius", value=ld.shadow_soft_size)
+                values["Soft Falloff"] = ld.use_soft_falloff
+                values["Radius"] = ld.shadow_soft_size
                 set_node_socketattr(self, socket_name="Angle", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Size", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Blend", attribute='enabled', value=False, in_out='OUTPUT',)
@@ -223,10 +234,10 @@ class Base():
 
             case 'AREA':
                 lshape = ld.shape if is_geonode else 0 if (ld.shape=='SQUARE') else 1 if (ld.shape=='RECTANGLE') else 2 if (ld.shape=='DISK') else 3
-                set_ng_socket_defvalue(ng, socket_name="Shape", value=lshape)
-                set_ng_socket_defvalue(ng, socket_name="Size X", value=ld.size)
-                set_ng_socket_defvalue(ng, socket_name="Size Y", value=ld.size_y)
-                set_ng_socket_defvalue(ng, socket_name="Spread", value=ld.spread)
+                values["Shape"] = lshape
+                values["Size X"] = ld.size
+                values["Size Y"] = ld.size_y
+                values["Spread"] = ld.spread
                 set_node_socketattr(self, socket_name="Soft Falloff", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Radius", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Angle", attribute='enabled', value=False, in_out='OUTPUT',)
@@ -234,6 +245,7 @@ class Base():
                 set_node_socketattr(self, socket_name="Blend", attribute='enabled', value=False, in_out='OUTPUT',)
                 set_node_socketattr(self, socket_name="Show Cone", attribute='enabled', value=False, in_out='OUTPUT',)
 
+        set_ng_socket_defvalues(ng, values)
         return None
 
     def draw_label(self,):
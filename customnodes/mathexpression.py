@@ -24,7 +24,9 @@ from ..utils.str_utils import (
     replace_exact_tokens,
     is_float_compatible,
 )
+from ..utils.queue_utils import queue_node_rebuild
 from ..utils.node_utils import (
+    clear_ng_defvalues_shadow,
     create_new_nodegroup,
     create_ng_socket,
     remove_ng_socket,
@@ -36,6 +38,12 @@ from ..nex.nodesetter import (
     get_nodesetter_functions, 
     generate_documentation,
 )
+from ..nex.dryrun import (
+    dryrun_function_expression,
+    dryrun_node_tree,
+    compare_dryruns,
+)
+from ..utils.graph_utils import get_tree_revision
 
 
 DIGITS = '0123456789'
@@ -83,6 +91,9 @@ MATHNOTATIONDOC = {
 #Store the math function used to set the nodetree
 USER_FNAMES = get_nodesetter_functions(tag='mathex', get_names=True)
 
+#The dry run previews are drawn on each redraw, we cache them per node, see 'dryrun_preview()'
+_DRYRUN_PREVIEWS = {} #(nodetree session_uid, node name, check_nodetree) -> (signature, (value, message))
+
 
 def replace_superscript_exponents(expr: str, algebric_notation:bool=False,) -> str:
     """convert exponent to ** notation
@@ -300,7 +311,7 @@ class Base():
         )
 
     def update_signal(self,context):
-        self.apply_user_expression()
+        queue_node_rebuild(self, 'apply_user_expression')
         return None 
 
     user_mathexp : bpy.props.StringProperty(
@@ -359,6 +370,10 @@ class Base():
         cache_booster_nodes_parent_tree(self.id_data)
 
         return None
+
+    def get_bake_signature(self) -> tuple|None:
+        """nodes with the same signature have identical nodetrees, they can share a nodegroup once converted"""
+        return (self.user_mathexp, self.use_algrebric_multiplication, self.use_macros,)
     
     def digest_user_expression(self, expression) -> str:
         """regex transformers. We ensure the user expression is correct, if he is using correct symbols, 
@@ -573,6 +588,7 @@ class Base():
         for node in list(ng.nodes).copy():
             if (node.name not in {"Group Input", "Group Output", "EquationStorage",}):
                 ng.nodes.remove(node)
+        clear_ng_defvalues_shadow(ng)
 
         # Create new sockets depending on collected variables.
         if (elemVar):
@@ -645,6 +661,48 @@ class Base():
 
         return None
 
+    def dryrun_preview(self, check_nodetree=False,):
+        """evaluate the function expression with numpy from the current inputs values, without any node evaluation.
+        if check_nodetree, we also walk the generated nodetree and compare both results. return (value, message)"""
+
+        if (self.error_message or not self.debug_fctexp or self.debug_fctexp=='Failed'):
+            return None, "Nothing to Evaluate"
+
+        #linked inputs values are unknown to us, the default values would give a meaningless result
+        if any(s.is_linked for s in self.inputs):
+            return None, "Linked Inputs, No Preview"
+
+        vareq = {s.name:s.default_value for s in self.inputs}
+
+        #called on each redraw, only evaluate again if the expression or the inputs values changed.
+        key = (self.id_data.session_uid, self.name, check_nodetree)
+        signature = (self.debug_fctexp, tuple((k, v[:] if hasattr(v,'__len__') else v) for k,v in vareq.items()),
+            get_tree_revision(self.node_tree) if (check_nodetree) else None,)
+        cached = _DRYRUN_PREVIEWS.get(key)
+        if (cached is not None) and (cached[0]==signature):
+            return cached[1]
+
+        result = _DRYRUN_PREVIEWS[key] = (signature, self._dryrun(vareq, check_nodetree))
+        return result[1]
+
+    def _dryrun(self, vareq:dict, check_nodetree:bool,) -> tuple:
+        """evaluate the preview, see 'dryrun_preview()'"""
+
+        try:
+            value = float(dryrun_function_expression(self.debug_fctexp, vareq=vareq))
+        except Exception as e:
+            return None, str(e)
+
+        if (not check_nodetree):
+            return value, ""
+
+        try:
+            ok, maxerr = compare_dryruns(value, dryrun_node_tree(self.node_tree, vareq))
+        except Exception as e:
+            return value, str(e)
+
+        return value, "Nodes Match" if ok else f"Nodes Mismatch, Error {maxerr:.5f}"
+
     def draw_label(self,):
         """node label"""
         if (self.label==''):
@@ -719,6 +777,12 @@ class Base():
             else:
                 col.label(text="No Input Created")
 
+            value, _ = n.dryrun_preview()
+            if (value is not None):
+                row = col.row()
+                row.active = False
+                row.label(text=f"Result ≈ {value:.5g}")
+
         header, panel = layout.panel("doc_panelid", default_closed=True,)
         header.label(text="Documentation",)
         if (panel):
@@ -787,6 +851,14 @@ class Base():
             row.enabled = False
             row.prop(n, "debug_nodes_quantity", text="",)
 
+            col = panel.column(align=True)
+            col.label(text="Dry Run:")
+            value, msg = n.dryrun_preview(check_nodetree=True)
+            if (value is not None):
+                col.label(text=f"{value:.6g}")
+            if (msg):
+                col.label(text=msg)
+
         col = layout.column(align=True)
         op = col.operator("extranode.bake_customnode", text="Convert to Group",)
         op.nodegroup_name = n.node_tree.name
@@ -24,13 +24,14 @@ from ..utils.str_utils import word_wrap
 from ..resources import cust_icon
 from ..utils.node_utils import (
     create_new_nodegroup,
-    set_ng_socket_defvalue,
+    set_ng_socket_defvalues,
     set_ng_socket_description,
     create_ng_socket,
     remove_ng_socket,
     get_booster_nodes,
     cache_booster_nodes_parent_tree,
 )
+from ..utils.dep_utils import tag_dependencies_dirty
 
 DEBUG = False
 
@@ -134,8 +135,9 @@ class Base():
     • Monitors the selected object's position, rotation, and scale.
     • Calculates velocity, acceleration, and stopping power in real-time.
     • Provides damping controls to smooth the motion data."""
-    auto_upd_flags = {'FRAME_PRE',}
+    auto_upd_flags = {'FRAME_PRE','PLAYBACK_BAKEABLE',}
     tree_type = "*ChildrenDefined*"
+    history_frames = 10 #number of previous frames needed to compute the velocity
     
     target_obj: bpy.props.PointerProperty(
         type=bpy.types.Object,
@@ -214,9 +216,16 @@ class Base():
         """generic update function"""
 
         cache_booster_nodes_parent_tree(self.id_data)
+        tag_dependencies_dirty()
 
         return None
 
+    def get_dependencies(self) -> set:
+        """the data this node needs to be refreshed on, see 'dep_utils.py'"""
+
+        #the velocity is computed from a frame history.
+        return {'FRAME',}
+
     def sync_out_values(self):
         """sync output socket values with data"""
 
@@ -225,10 +234,12 @@ class Base():
 
         ng = self.node_tree
         if (not self.target_obj):
-            set_ng_socket_defvalue(ng, socket_name="Direction", value=(0.0, 0.0, 0.0))
-            set_ng_socket_defvalue(ng, socket_name="Velocity", value=0.0)
-            set_ng_socket_defvalue(ng, socket_name="Acceleration", value=0.0)
-            set_ng_socket_defvalue(ng, socket_name="Stopping Power", value=0.0)
+            set_ng_socket_defvalues(ng, {
+                "Direction": (0.0, 0.0, 0.0),
+                "Velocity": 0.0,
+                "Acceleration": 0.0,
+                "Stopping Power": 0.0,
+                })
             return None
         
         # Initialize object entry if it doesn't exist
@@ -264,7 +275,7 @@ class Base():
         # Build history list for velocity calculation
 
         history = []
-        maxhist = 10
+        maxhist = self.history_frames
         stored_frames = set(sorted(OBJVEL.keys()))
         frame_to_cover = [f for f in range(max(current_frame-maxhist,0), current_frame+1) if f in stored_frames]
         
@@ -321,10 +332,12 @@ class Base():
         #                 stopping_power = 0.0
         
         # Update node outputs
-        set_ng_socket_defvalue(ng, socket_name="Direction", value=direction)
-        set_ng_socket_defvalue(ng, socket_name="Velocity", value=velocity_magnitude)
-        set_ng_socket_defvalue(ng, socket_name="Acceleration", value=acceleration)
-        set_ng_socket_defvalue(ng, socket_name="Stopping Power", value=stopping_power)
+        set_ng_socket_defvalues(ng, {
+            "Direction": direction,
+            "Velocity": velocity_magnitude,
+            "Acceleration": acceleration,
+            "Stopping Power": stopping_power,
+            })
         
         return None
 
@@ -425,13 +438,12 @@ class Base():
     def update_all(cls, using_nodes=None, signal_from_handlers=False,):
         """update all instances of this node in all node trees"""
         
-        # Update all object velocity nodes
-        for node in get_booster_nodes(by_idnames={
-            NODEBOOSTER_NG_GN_ObjectVelocity.bl_idname,
-            NODEBOOSTER_NG_SH_ObjectVelocity.bl_idname,
-            NODEBOOSTER_NG_CP_ObjectVelocity.bl_idname,
-            }):
-            node.sync_out_values()
+        if (using_nodes is None):
+              nodes = get_booster_nodes(by_idnames={cls.bl_idname},)
+        else: nodes = [n for n in using_nodes if (n.bl_idname==cls.bl_idname)]
+
+        for n in nodes:
+            n.sync_out_values()
 
         return None
 
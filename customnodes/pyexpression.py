@@ -9,6 +9,7 @@ from ..__init__ import get_addon_prefs
 from ..resources import cust_icon
 from ..nex.pytonode import py_to_Sockdata
 from ..utils.str_utils import word_wrap
+from ..utils.queue_utils import queue_node_rebuild
 from ..utils.node_utils import (
     crosseditor_socktype_adjust,
     create_new_nodegroup,
@@ -19,6 +20,7 @@ from ..utils.node_utils import (
     get_booster_nodes,
     cache_booster_nodes_parent_tree,
 )
+from ..utils.dep_utils import tag_dependencies_dirty
 
 # ooooo      ooo                 .o8            
 # `888b.     `8'                "888            
@@ -47,13 +49,14 @@ class Base():
         default=0,
         )
     user_pyexpression : bpy.props.StringProperty(
-        update=lambda self, context: self.evaluate_python_expression(assign_socketype=True),
+        update=lambda self, context: queue_node_rebuild(self, 'evaluate_python_expression', True),
         description="type the expression you wish to evaluate right here",
         )
     execute_at_depsgraph : bpy.props.BoolProperty(
         name="Automatically Refresh",
         description="Synchronize the python values with the outputs values on each depsgraph frame and interaction. By toggling this option, your script will be executed constantly.",
         default=True,
+        update=lambda self, context: tag_dependencies_dirty(),
         )
 
     @classmethod
@@ -94,9 +97,16 @@ class Base():
         """generic update function"""
 
         cache_booster_nodes_parent_tree(self.id_data)
+        tag_dependencies_dirty()
 
         return None
 
+    def get_dependencies(self) -> set:
+        """the data this node needs to be refreshed on, see 'dep_utils.py'"""
+
+        #arbitrary python expression, we can't know what the user is reading.
+        return {'ALWAYS',} if (self.execute_at_depsgraph) else set()
+
     def evaluate_python_expression(self, assign_socketype=False,):
         """evaluate the user string and assign value to output node"""
 
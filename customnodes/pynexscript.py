@@ -5,29 +5,33 @@
 #TODO 
 # - IMPORTANT: Support Nex for Shader/Compositor
 # - Please See TODO in nextypes.py and nodesetter.py as well! ALl are related to this node!
-# - BUG? If auto depsgraph enabled, and user press exec button, execution occurs twice. due to deps trigger..
-# Bonus; 
-# -';' python notation?
 
 import bpy
 
-import re, traceback
+import traceback
+from collections import deque
 
 from ..__init__ import get_addon_prefs
 from ..resources import cust_icon
 from ..nex.nextypes import NexFactory, NexError
+from ..nex.nextransform import transform_nex_script
+from ..nex.nexlibrary import NexImporter, get_libraries_signature
 from ..nex.nodesetter import generate_documentation
 from ..utils.str_utils import word_wrap, prettyError
+from ..utils.queue_utils import queue_node_rebuild
+from ..utils.prof_utils import ProfileSession, profile_phase, write_chrome_trace
 from ..utils.node_utils import (
+    clear_ng_defvalues_shadow,
     crosseditor_socktype_adjust,
     create_new_nodegroup,
     set_ng_socket_defvalue,
     remove_ng_socket,
     set_ng_socket_label,
-    get_farest_node,
     get_booster_nodes,
     cache_booster_nodes_parent_tree,
 )
+from ..utils.spatial_utils import NodesBoundsTable
+from ..utils.dep_utils import tag_dependencies_dirty, register_feedback_echo
 
 NEXFUNCDOC = generate_documentation(tag='nexscript')
 NEXNOTATIONDOC = {
@@ -203,42 +207,46 @@ NEXNOTATIONDOC = {
                 'name':"Color to Vector.",
                 'desc':"Return a VectorXYZ from a RGBAColor."},
     }
+NEXPROFILEPHASES = ('transform','compile','exec','node_creation','linking','socket_interface','defvalue_writes','node_removal',)
+NEXPROFILEHISTORY = {} #rolling history of ProfileSession per node, key is the node.node_tree.session_uid
 
 
-def transform_nex_script(original_text:str, nextypes:list) -> str:
-    """
-    Transforms a Nex script:
-    - Remove comments
-    - Replace with custom Nex type declarations 
-        "VAR : TYPE = RESTOFTHELINE" → "VAR = TYPE('VAR', RESTOFTHELINE)"
-        "VAR : TYPE"                 → "VAR = TYPE('VAR', None)"
-    """
+class NODEBOOSTER_OT_nex_profile_export(bpy.types.Operator):
+    """Export the execution profiles history of this Nex node as a Chrome-Trace json file"""
 
-    #TODO support ';' python notation?
+    bl_idname = "nodebooster.nex_profile_export"
+    bl_label = "Export Profile"
+    bl_description = "Export the execution profiles history of this node as a Chrome-Trace json file, readable in 'chrome://tracing' or 'ui.perfetto.dev'"
+    bl_options = {'REGISTER', 'INTERNAL'}
 
-    def replacer(match):
-        varname = match.group(1)
-        typename = match.group(2)
-        rest = match.group(3)
-        if (rest is None or rest.strip() == ''):
-              return f"{varname} = {typename}('{varname}', None)"
-        else: return f"{varname} = {typename}('{varname}', {rest.strip()})"
+    node_name : bpy.props.StringProperty()
+    filepath : bpy.props.StringProperty(subtype='FILE_PATH',)
+    filter_glob : bpy.props.StringProperty(default="*.json", options={'HIDDEN'},)
 
-    pattern = re.compile(rf"\b(\w+)\s*:\s*({'|'.join(nextypes)})\s*(?:=\s*(.+))?")
+    def invoke(self, context, event):
+        if (not self.filepath):
+            self.filepath = f"NexProfile_{bpy.path.clean_name(self.node_name)}.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
 
-    lines = []
-    for line in original_text.splitlines():
+    def execute(self, context):
 
-        # Remove comments: delete anything from a '#' to the end of the line.
-        line = re.sub(r'#.*', '', line)
+        node = context.space_data.edit_tree.nodes.get(self.node_name)
+        if (node is None):
+            self.report({'ERROR'}, "Node with given name not found")
+            return {'CANCELLED'}
 
-        #transform type hinting notation
-        line = pattern.sub(replacer, line)
+        history = NEXPROFILEHISTORY.get(node.node_tree.session_uid)
+        if (not history):
+            self.report({'ERROR'}, "No profile recorded yet, please execute the script first")
+            return {'CANCELLED'}
+
+        filepath = write_chrome_trace(bpy.path.abspath(self.filepath), history,)
+        self.report({'INFO'}, f"Exported {len(history)} profile(s) to '{filepath}'")
+
+        return {'FINISHED'}
 
-        lines.append(line)
-        continue
 
-    return '\n'.join(lines)
 
 # ooooo      ooo                 .o8            
 # `888b.     `8'                "888            
@@ -277,17 +285,18 @@ class Base():
         name="TextData",
         description="Blender Text datablock to execute",
         poll=lambda self, data: not data.name.startswith('.'),
-        update=lambda self, context: self.interpret_nex_script(rebuild=True) if (self.user_textdata is None) else None,
+        update=lambda self, context: queue_node_rebuild(self, 'interpret_nex_script', True) if (self.user_textdata is None) else None,
         )
     execute_script : bpy.props.BoolProperty(
         name="Execute",
         description="Click here to execute the Nex script & re-building the generated node-tree",
-        update=lambda self, context: self.interpret_nex_script(rebuild=True),
+        update=lambda self, context: self.execute_script_signal(),
         )
     execute_at_depsgraph : bpy.props.BoolProperty(
         name="Automatically Refresh",
         description="Synchronize the interpreted python constants (if any) with the outputs values on each depsgraph frame and interaction. By toggling this option, your Nex script will be executed constantly on each interaction you have with blender (note that the internal nodetree will not be constantly rebuilt, press the Play button to do so.).",
         default=False,
+        update=lambda self, context: tag_dependencies_dirty(),
         )
 
     def init(self, context):
@@ -320,9 +329,24 @@ class Base():
         """generic update function"""
 
         cache_booster_nodes_parent_tree(self.id_data)
+        tag_dependencies_dirty()
 
         return None
 
+    def get_dependencies(self) -> set:
+        """the data this node needs to be refreshed on, see 'dep_utils.py'"""
+
+        #arbitrary python script, we can't know what the user is reading.
+        return {'ALWAYS',} if (self.execute_at_depsgraph) else set()
+
+    def get_bake_signature(self) -> tuple|None:
+        """nodes with the same signature have identical nodetrees, they can share a nodegroup once converted"""
+
+        #a script executed on depsgraph updates might read scene data, its nodetree is specific to this node.
+        if (self.user_textdata is None) or (self.execute_at_depsgraph):
+            return None
+        return (self.user_textdata.as_string(),)
+
     def cleanse_sockets(self, in_protectednames=None, out_protectednames=None,):
         """remove all our sockets except error socket
         optional: except give list of names"""
@@ -373,6 +397,9 @@ class Base():
             if (node.name not in {"Group Input", "Group Output", "ScriptStorage",}):
                 ng.nodes.remove(node)
 
+        #the helper nodes of rotation & matrix outputs are gone, the written values must be written again.
+        clear_ng_defvalues_shadow(ng)
+
         #move output near to input again..
         in_nod, out_nod = ng.nodes["Group Input"], ng.nodes["Group Output"]
         out_nod.location = in_nod.location
@@ -417,9 +444,38 @@ class Base():
 
         return None
 
+    def execute_script_signal(self):
+        """the user pressed the execute button"""
+
+        self.interpret_nex_script(rebuild=True)
+
+        #the depsgraph signal following our writes shouldn't re-execute the script if 'execute_at_depsgraph'
+        register_feedback_echo((self,))
+
+        return None
+
     def interpret_nex_script(self, rebuild=False):
         """Execute the Python script from a Blender Text datablock, capture local variables whose names start with "out_",
-        and update the node group's output sockets accordingly."""
+        and update the node group's output sockets accordingly. Each execution is profiled, see 'NEXPROFILEHISTORY'."""
+
+        session = ProfileSession(f"{self.id_data.name}:{self.name}", rebuild=rebuild,).start()
+        try:
+            self.interpret_nex_script_profiled(rebuild=rebuild)
+        finally:
+            session.stop()
+            session.metadata['error'] = self.error_message
+            session.metadata['nodes_count'] = self.debug_nodes_quantity
+
+            size = get_addon_prefs().nex_profile_history_size
+            history = NEXPROFILEHISTORY.get(self.node_tree.session_uid)
+            if (history is None or history.maxlen!=size):
+                history = NEXPROFILEHISTORY[self.node_tree.session_uid] = deque(history or (), maxlen=size)
+            history.append(session)
+
+        return None
+
+    def interpret_nex_script_profiled(self, rebuild=False):
+        """see 'interpret_nex_script()', this function is executed within a profiling session"""
 
         ng = self.node_tree
         in_nod, out_nod = ng.nodes["Group Input"], ng.nodes["Group Output"]
@@ -470,7 +526,10 @@ class Base():
         # Synthax:
         # replace varname:infloat=REST with varname=infloat('varname',REST) & remove comments
         # much better workflow for artists to use python type indications IMO
-        final_script = transform_nex_script(user_script, nextoys['nexusertypes'].keys(),)
+        with profile_phase('transform'):
+            final_script = transform_nex_script(user_script, nextoys['nexusertypes'].keys(),)
+            # the script also need a rebuild if one of its imported Nex libraries changed
+            final_script += get_libraries_signature(final_script, nextoys['nexusertypes'].keys(),)
 
         #did the user changes stuff in the script?
         cached_script = ''
@@ -483,15 +542,15 @@ class Base():
         # If user modified the script, the script will need a rebuild.
         if (is_dirty or rebuild):
             #Clean up nodes.. we'll rebuild the nodetree
-            self.cleanse_nodes()
+            with profile_phase('node_removal'):
+                self.cleanse_nodes()
             # We set the first node active (node arrangement in nodesetter.py module is based on active)
             ng.nodes.active = in_nod
             #when initalizing the NexTypes, the inputs/outputs sockets will be created.
 
-        # Namespace, we inject Nex types in user namespace
-        exec_namespace = {}
-        exec_namespace.update(nextoys['nexusertypes'])
-        exec_namespace.update(nextoys['nexuserfunctions'])
+        # Namespace, we inject Nex types in user namespace. The importer let the user import Nex libraries from other texts.
+        importer = NexImporter(ng, nextoys, function_call_history,)
+        exec_namespace = importer.namespace()
         script_vars = {} #catch variables from exec?
 
         #Don't want all the pretty user error wrapping for user? set it to True
@@ -504,12 +563,14 @@ class Base():
             exec(compiled_script, exec_namespace, script_vars)
         else:
             try:
-                compiled_script = compile(
-                    source=final_script,
-                    filename=self.user_textdata.name,
-                    mode="exec",
-                    )
-                exec(compiled_script, exec_namespace, script_vars)
+                with profile_phase('compile'):
+                    compiled_script = compile(
+                        source=final_script,
+                        filename=self.user_textdata.name,
+                        mode="exec",
+                        )
+                with profile_phase('exec'):
+                    exec(compiled_script, exec_namespace, script_vars)
 
             except SyntaxError as e:
                 #print more information in console
@@ -590,9 +651,10 @@ class Base():
 
         #Clean up the nodetree spacing a little, for the output node
         if (is_dirty or rebuild):
-            farest = get_farest_node(ng)
-            if (farest!=out_nod):
-                out_nod.location.x = farest.location.x + 250
+            bounds_table = NodesBoundsTable(ng)
+            farest = bounds_table.farthest('BOTTOM_RIGHT')
+            if (bounds_table.names[farest]!=out_nod.name):
+                out_nod.location.x = bounds_table.locations[farest,0] + 250
 
         return None
     
@@ -760,6 +822,26 @@ class Base():
             row.enabled = False
             row.prop(n, "debug_evaluation_counter", text="",)
 
+            history = NEXPROFILEHISTORY.get(n.node_tree.session_uid)
+            if (history):
+                last = history[-1]
+                col = panel.column(align=True)
+                col.label(text=f"Last Execution: {last.duration*1000:.2f}ms")
+                col.label(text=f"Average of {len(history)}: {sum(s.duration for s in history)/len(history)*1000:.2f}ms")
+
+                col = panel.column(align=True)
+                col.label(text="Phases (Last / Average):")
+                for phase in NEXPROFILEPHASES:
+                    lastms = last.phases.get(phase,(0.0,0))[0]*1000
+                    avgms = sum(s.phases.get(phase,(0.0,0))[0] for s in history)/len(history)*1000
+                    row = col.row()
+                    row.scale_y = 0.8
+                    row.label(text=f"  {phase}:")
+                    row.label(text=f"{lastms:.2f} / {avgms:.2f}ms")
+
+                op = panel.operator("nodebooster.nex_profile_export", text="Export Chrome-Trace", icon="EXPORT",)
+                op.node_name = n.name
+
         col = layout.column(align=True)
         op = col.operator("extranode.bake_customnode", text="Convert to Group",)
         op.nodegroup_name = n.node_tree.name
@@ -9,10 +9,11 @@ from ..__init__ import get_addon_prefs
 from ..utils.str_utils import word_wrap
 from ..utils.node_utils import (
     create_new_nodegroup,
-    set_ng_socket_defvalue,
+    set_ng_socket_defvalues,
     get_booster_nodes,
     cache_booster_nodes_parent_tree,
 )
+from ..utils.dep_utils import tag_dependencies_dirty
 
 
 # ooooo      ooo                 .o8            
@@ -29,7 +30,7 @@ class Base():
     bl_label = "Render Info"
     bl_description  = """Custom Nodgroup: Gather informations about your active scene render info.
     • Expect updates on each depsgraph post and frame_pre update signals"""
-    auto_upd_flags = {'FRAME_PRE','DEPS_POST',}
+    auto_upd_flags = {'FRAME_PRE','DEPS_POST','PLAYBACK_BAKEABLE',}
     tree_type = "*ChildrenDefined*"
 
     @classmethod
@@ -74,22 +75,30 @@ class Base():
         """generic update function"""
 
         cache_booster_nodes_parent_tree(self.id_data)
+        tag_dependencies_dirty()
 
         return None
+
+    def get_dependencies(self) -> set:
+        """the data this node needs to be refreshed on, see 'dep_utils.py'"""
+
+        return {bpy.context.scene,}
         
     def sync_out_values(self):
         """sync output socket values with data"""
 
         scene = bpy.context.scene
 
-        set_ng_socket_defvalue(self.node_tree, 0, value=scene.render.resolution_x)
-        set_ng_socket_defvalue(self.node_tree, 1, value=scene.render.resolution_y)
-        set_ng_socket_defvalue(self.node_tree, 2, value=scene.render.resolution_percentage)
-        set_ng_socket_defvalue(self.node_tree, 3, value=scene.render.pixel_aspect_x)
-        set_ng_socket_defvalue(self.node_tree, 4, value=scene.render.pixel_aspect_y)
-        set_ng_socket_defvalue(self.node_tree, 5, value=scene.frame_start)
-        set_ng_socket_defvalue(self.node_tree, 6, value=scene.frame_end)
-        set_ng_socket_defvalue(self.node_tree, 7, value=scene.frame_step)
+        set_ng_socket_defvalues(self.node_tree, {
+            0: scene.render.resolution_x,
+            1: scene.render.resolution_y,
+            2: scene.render.resolution_percentage,
+            3: scene.render.pixel_aspect_x,
+            4: scene.render.pixel_aspect_y,
+            5: scene.frame_start,
+            6: scene.frame_end,
+            7: scene.frame_step,
+            })
 
         return None
 
@@ -21,6 +21,7 @@ from ..utils.node_utils import (
     get_booster_nodes,
     cache_booster_nodes_parent_tree,
 )
+from ..utils.dep_utils import tag_dependencies_dirty, RefreshRateSettings
 from ..nex.pytonode import py_to_Sockdata
 
 
@@ -32,7 +33,7 @@ from ..nex.pytonode import py_to_Sockdata
 #  8       `888  888   888 888   888  888    .o 
 # o8o        `8  `Y8bod8P' `Y8bod88P" `Y8bod8P' 
 
-class Base():
+class Base(RefreshRateSettings):
 
     bl_idname = "NodeBoosterRNAInfo"
     bl_label = "RNA Info"
@@ -43,6 +44,7 @@ class Base():
     tree_type = "*ChildrenDefined*"
 
     def update_signal(self,context):
+        tag_dependencies_dirty()
         self.resolve_user_path(assign_socketype=True)
         return None 
 
@@ -97,45 +99,45 @@ class Base():
     # id_data: bpy.props.PointerProperty(type=bpy.types.ID) does not work......
     # what a dumb fallback.. plus, it may lead to hidden extra user if the user is not careful.
     # see https://blender.stackexchange.com/questions/214045/making-an-anytype-pointer
-    Action          : bpy.props.PointerProperty(type=bpy.types.Action)
-    Armature        : bpy.props.PointerProperty(type=bpy.types.Armature)
-    Brush           : bpy.props.PointerProperty(type=bpy.types.Brush)
-    Cachefile       : bpy.props.PointerProperty(type=bpy.types.CacheFile)
-    Camera          : bpy.props.PointerProperty(type=bpy.types.Camera)
-    Collection      : bpy.props.PointerProperty(type=bpy.types.Collection)
-    Curve           : bpy.props.PointerProperty(type=bpy.types.Curve)
-    Curves          : bpy.props.PointerProperty(type=bpy.types.Curves)
-    Linestyle       : bpy.props.PointerProperty(type=bpy.types.FreestyleLineStyle)
-    Greasepencil    : bpy.props.PointerProperty(type=bpy.types.GreasePencil)
-    Greasepencil_V3 : bpy.props.PointerProperty(type=bpy.types.GreasePencil)
-    Image           : bpy.props.PointerProperty(type=bpy.types.Image)
-    Key             : bpy.props.PointerProperty(type=bpy.types.Key)
-    Lattice         : bpy.props.PointerProperty(type=bpy.types.Lattice)
-    Library         : bpy.props.PointerProperty(type=bpy.types.Library)
-    Light           : bpy.props.PointerProperty(type=bpy.types.Light)
-    Lightprobe      : bpy.props.PointerProperty(type=bpy.types.LightProbe)
-    Mask            : bpy.props.PointerProperty(type=bpy.types.Mask)
-    Material        : bpy.props.PointerProperty(type=bpy.types.Material)
-    Mesh            : bpy.props.PointerProperty(type=bpy.types.Mesh)
-    Meta            : bpy.props.PointerProperty(type=bpy.types.MetaBall)
-    Movieclip       : bpy.props.PointerProperty(type=bpy.types.MovieClip)
-    Nodetree        : bpy.props.PointerProperty(type=bpy.types.NodeTree)
-    Object          : bpy.props.PointerProperty(type=bpy.types.Object)
-    Paintcurve      : bpy.props.PointerProperty(type=bpy.types.PaintCurve)
-    Palette         : bpy.props.PointerProperty(type=bpy.types.Palette)
-    Particle        : bpy.props.PointerProperty(type=bpy.types.ParticleSettings)
-    Pointcloud      : bpy.props.PointerProperty(type=bpy.types.PointCloud)
-    Scene           : bpy.props.PointerProperty(type=bpy.types.Scene)
-    Screen          : bpy.props.PointerProperty(type=bpy.types.Screen)
-    Sound           : bpy.props.PointerProperty(type=bpy.types.Sound)
-    Speaker         : bpy.props.PointerProperty(type=bpy.types.Speaker)
-    Text            : bpy.props.PointerProperty(type=bpy.types.Text)
-    Texture         : bpy.props.PointerProperty(type=bpy.types.Texture)
-    Font            : bpy.props.PointerProperty(type=bpy.types.VectorFont)
-    Volume          : bpy.props.PointerProperty(type=bpy.types.Volume)
-    Wm              : bpy.props.PointerProperty(type=bpy.types.WindowManager)
-    Workspace       : bpy.props.PointerProperty(type=bpy.types.WorkSpace)
-    World           : bpy.props.PointerProperty(type=bpy.types.World)
+    Action          : bpy.props.PointerProperty(type=bpy.types.Action, update=update_signal)
+    Armature        : bpy.props.PointerProperty(type=bpy.types.Armature, update=update_signal)
+    Brush           : bpy.props.PointerProperty(type=bpy.types.Brush, update=update_signal)
+    Cachefile       : bpy.props.PointerProperty(type=bpy.types.CacheFile, update=update_signal)
+    Camera          : bpy.props.PointerProperty(type=bpy.types.Camera, update=update_signal)
+    Collection      : bpy.props.PointerProperty(type=bpy.types.Collection, update=update_signal)
+    Curve           : bpy.props.PointerProperty(type=bpy.types.Curve, update=update_signal)
+    Curves          : bpy.props.PointerProperty(type=bpy.types.Curves, update=update_signal)
+    Linestyle       : bpy.props.PointerProperty(type=bpy.types.FreestyleLineStyle, update=update_signal)
+    Greasepencil    : bpy.props.PointerProperty(type=bpy.types.GreasePencil, update=update_signal)
+    Greasepencil_V3 : bpy.props.PointerProperty(type=bpy.types.GreasePencil, update=update_signal)
+    Image           : bpy.props.PointerProperty(type=bpy.types.Image, update=update_signal)
+    Key             : bpy.props.PointerProperty(type=bpy.types.Key, update=update_signal)
+    Lattice         : bpy.props.PointerProperty(type=bpy.types.Lattice, update=update_signal)
+    Library         : bpy.props.PointerProperty(type=bpy.types.Library, update=update_signal)
+    Light           : bpy.props.PointerProperty(type=bpy.types.Light, update=update_signal)
+    Lightprobe      : bpy.props.PointerProperty(type=bpy.types.LightProbe, update=update_signal)
+    Mask            : bpy.props.PointerProperty(type=bpy.types.Mask, update=update_signal)
+    Material        : bpy.props.PointerProperty(type=bpy.types.Material, update=update_signal)
+    Mesh            : bpy.props.PointerProperty(type=bpy.types.Mesh, update=update_signal)
+    Meta            : bpy.props.PointerProperty(type=bpy.types.MetaBall, update=update_signal)
+    Movieclip       : bpy.props.PointerProperty(type=bpy.types.MovieClip, update=update_signal)
+    Nodetree        : bpy.props.PointerProperty(type=bpy.types.NodeTree, update=update_signal)
+    Object          : bpy.props.PointerProperty(type=bpy.types.Object, update=update_signal)
+    Paintcurve      : bpy.props.PointerProperty(type=bpy.types.PaintCurve, update=update_signal)
+    Palette         : bpy.props.PointerProperty(type=bpy.types.Palette, update=update_signal)
+    Particle        : bpy.props.PointerProperty(type=bpy.types.ParticleSettings, update=update_signal)
+    Pointcloud      : bpy.props.PointerProperty(type=bpy.types.PointCloud, update=update_signal)
+    Scene           : bpy.props.PointerProperty(type=bpy.types.Scene, update=update_signal)
+    Screen          : bpy.props.PointerProperty(type=bpy.types.Screen, update=update_signal)
+    Sound           : bpy.props.PointerProperty(type=bpy.types.Sound, update=update_signal)
+    Speaker         : bpy.props.PointerProperty(type=bpy.types.Speaker, update=update_signal)
+    Text            : bpy.props.PointerProperty(type=bpy.types.Text, update=update_signal)
+    Texture         : bpy.props.PointerProperty(type=bpy.types.Texture, update=update_signal)
+    Font            : bpy.props.PointerProperty(type=bpy.types.VectorFont, update=update_signal)
+    Volume          : bpy.props.PointerProperty(type=bpy.types.Volume, update=update_signal)
+    Wm              : bpy.props.PointerProperty(type=bpy.types.WindowManager, update=update_signal)
+    Workspace       : bpy.props.PointerProperty(type=bpy.types.WorkSpace, update=update_signal)
+    World           : bpy.props.PointerProperty(type=bpy.types.World, update=update_signal)
 
     pointer_types = [
         'Action', 'Armature', 'Brush', 'Cachefile', 'Camera', 'Collection', 
@@ -195,9 +197,26 @@ class Base():
         """generic update function"""
 
         cache_booster_nodes_parent_tree(self.id_data)
+        tag_dependencies_dirty()
 
         return None
 
+    def get_dependencies(self) -> set:
+        """the data this node needs to be refreshed on, see 'dep_utils.py'"""
+
+        id_data = getattr(self, self.id_type.title())
+        deps = {id_data,}
+
+        #the path might lead to another ID, ex: 'data.lens' of a camera object.
+        if (id_data and ('.' in self.data_path)):
+            try:
+                owner = id_data.path_resolve(self.data_path.rsplit('.',1)[0])
+                deps.add(getattr(owner, 'id_data', None))
+            except Exception:
+                pass
+
+        return deps
+
     def resolve_user_path(self, assign_socketype=False):
         """resolve the data path and assign value to output socket"""
 
@@ -210,7 +229,7 @@ class Base():
 
         # clean all unused pointers that aren't the id_data, to avoid ghost users.
         for pointer_type in self.pointer_types:
-            if (pointer_type != ptrname):
+            if (pointer_type != ptrname) and (getattr(self, pointer_type) is not None):
                 setattr(self, pointer_type, None)
 
         #reset to default
@@ -13,10 +13,11 @@ from ..utils.nbr_utils import map_range
 from ..utils.str_utils import word_wrap
 from ..utils.node_utils import (
     create_new_nodegroup,
-    set_ng_socket_defvalue,
+    set_ng_socket_defvalues,
     get_booster_nodes,
     cache_booster_nodes_parent_tree,
 )
+from ..utils.dep_utils import tag_dependencies_dirty, RefreshRateSettings
 
 
 # NOTE use of AI
@@ -317,7 +318,7 @@ def evaluate_sequencer_audio_data(frame_offset=0, at_sequence_name=None, smoothi
 #  8       `888  888   888 888   888  888    .o 
 # o8o        `8  `Y8bod8P' `Y8bod88P" `Y8bod8P' 
 
-class Base():
+class Base(RefreshRateSettings):
     
     bl_idname = "NodeBoosterSequencerSound"
     bl_label = "Sequencer Sound"
@@ -326,7 +327,7 @@ class Base():
     • Bass/Pitch/Treble Tones components fall within define frequencies in Hz units.
     • If you wish to view or customize these Bass/Pitch/Treble frequencies go in 'N panel > Node Booster > Active node > Parameters'.
     • Expect the value to be automatically updated on each on depsgraph post signals"""
-    auto_upd_flags = {'FRAME_PRE','DEPS_POST',}
+    auto_upd_flags = {'FRAME_PRE','DEPS_POST','PLAYBACK_BAKEABLE',}
     tree_type = "*ChildrenDefined*"
 
 
@@ -466,8 +467,15 @@ class Base():
         """generic update function"""
 
         cache_booster_nodes_parent_tree(self.id_data)
+        tag_dependencies_dirty()
 
         return None
+
+    def get_dependencies(self) -> set:
+        """the data this node needs to be refreshed on, see 'dep_utils.py'"""
+
+        #the sound is sampled at the current frame, the scene is updated when the sequencer strips are edited.
+        return {'FRAME', bpy.context.scene,}
         
     def sync_out_values(self):
         """sync output socket values with data"""
@@ -494,10 +502,7 @@ class Base():
 
         # If not valid circumpstance, no evaluation & go back to default.
         if (not valid):
-            set_ng_socket_defvalue(ng, socket_name='Volume',value=0,)
-            set_ng_socket_defvalue(ng, socket_name='Pitch',value=0,)
-            set_ng_socket_defvalue(ng, socket_name='Bass',value=0,)
-            set_ng_socket_defvalue(ng, socket_name='Treble',value=0,)
+            set_ng_socket_defvalues(ng, {'Volume':0, 'Pitch':0, 'Bass':0, 'Treble':0,})
             return None
 
         #update frequencies range?
@@ -517,21 +522,12 @@ class Base():
             frequencies=frequencies,
             )
 
-        if (evalvolume):
-              set_ng_socket_defvalue(ng, socket_name='Volume',value=data['volume'],)
-        else: set_ng_socket_defvalue(ng, socket_name='Volume',value=0,)
-
-        if (evalpitch):
-              set_ng_socket_defvalue(ng, socket_name='Pitch',value=data['pitch'],)
-        else: set_ng_socket_defvalue(ng, socket_name='Pitch',value=0,)
-
-        if (evalbass):
-              set_ng_socket_defvalue(ng, socket_name='Bass',value=data['bass'],)
-        else: set_ng_socket_defvalue(ng, socket_name='Bass',value=0,)
-
-        if (evaltreble):
-              set_ng_socket_defvalue(ng, socket_name='Treble',value=data['treble'],)
-        else: set_ng_socket_defvalue(ng, socket_name='Treble',value=0,)
+        set_ng_socket_defvalues(ng, {
+            'Volume': data['volume'] if (evalvolume) else 0,
+            'Pitch':  data['pitch']  if (evalpitch)  else 0,
+            'Bass':   data['bass']   if (evalbass)   else 0,
+            'Treble': data['treble'] if (evaltreble) else 0,
+            })
 
         return None
     
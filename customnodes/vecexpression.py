@@ -3,6 +3,7 @@ import bpy
 from .arrayvector import Base as _ArrayBase
 from .mathexpression import MATHEXFUNCDOC, MATHNOTATIONDOC
 from ..utils.str_utils import word_wrap
+from ..utils.queue_utils import queue_node_rebuild
 
 
 class Base(_ArrayBase):
@@ -12,7 +13,7 @@ class Base(_ArrayBase):
 
     def update_signal(self, context):
         self.user_mathexp = f"[{self.x_expr}, {self.y_expr}, {self.z_expr}]"
-        self.apply_user_expression()
+        queue_node_rebuild(self, 'apply_user_expression')
         return None
 
     active_field: bpy.props.IntProperty(default=0, options={'HIDDEN'})
@@ -35,11 +35,7 @@ from collections import defaultdict # For grouping outlines
 from ..__init__ import get_addon_prefs
 from .. operators.favorites import FAVORITEUNICODE
 from ..utils.nbr_utils import map_positions
-from ..utils.node_utils import (
-    get_node_absolute_location,
-    get_node_bounds,
-    get_nodes_bounds,
-)
+from ..utils.spatial_utils import NodesBoundsTable
 
 
 #Global dict of minimap bounds being draw, key is the area as_pointer() memory adress as str
@@ -510,12 +506,12 @@ def draw_minimap(node_tree, area, window_region, view2d, space, dpi_fac, zoom,):
         return None
 
     all_nodes = node_tree.nodes
-    all_nodes_bounds = [loc for node in all_nodes for loc in get_node_bounds(node)] 
+    bounds_table = NodesBoundsTable(node_tree)
 
     # 1. Find the minimap bounds from the nodetree.nodes
 
     #rassemble all nodes bounds
-    bounds_nodetree = get_nodes_bounds(node_tree.nodes, mode='PASSED_DATA', passed_locs=all_nodes_bounds,)
+    bounds_nodetree = bounds_table.bounds()
     bound_nodetree_bottomleft, bound_nodetree_topright = bounds_nodetree
     node_tree_width = bound_nodetree_topright.x - bound_nodetree_bottomleft.x
     node_tree_height = bound_nodetree_topright.y - bound_nodetree_bottomleft.y
@@ -674,7 +670,7 @@ def draw_minimap(node_tree, area, window_region, view2d, space, dpi_fac, zoom,):
     all_active_states = [n == node_tree.nodes.active for n in all_nodes]
 
     # gather bounds positions and map them 2x bounds loc per node
-    all_positions = map_positions(np.array(all_nodes_bounds), bounds_nodetree, bounds_minimap_nodetree,)
+    all_positions = map_positions(bounds_table.corners(), bounds_nodetree, bounds_minimap_nodetree,)
 
     # sort the element we are going to draw arranged with their draw args as well..
     frame_to_draw, node_to_draw, star_to_draw = [], [], []
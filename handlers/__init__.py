@@ -5,13 +5,36 @@
 
 import bpy 
 
+import time
 from collections.abc import Iterable
 
 from ..gpudraw import register_gpu_drawcalls
 from ..__init__ import get_addon_prefs, dprint
 from ..operators.palette import msgbus_palette_callback
-from ..utils.node_utils import get_booster_nodes, cache_all_booster_nodes_parent_trees
+from ..utils.node_utils import get_booster_nodes, rebuild_booster_nodes_registry, check_booster_nodes_registry, clear_ng_defvalues_shadow
+from ..utils.dep_utils import (
+    get_changed_dependencies,
+    get_nodes_to_refresh,
+    index_node_dependencies,
+    tag_dependencies_dirty,
+    is_refreshing,
+    refreshing_nodes,
+    clear_feedback_echo,
+    count_suppressed_cycle,
+    node_key,
+    throttle_nodes,
+    pop_trailing_nodes,
+    get_next_trailing_delay,
+    clear_throttle_state,
+)
+from ..utils.queue_utils import clear_rebuild_queue, clear_refresh_queue
+from ..utils.graph_utils import tag_updated_tree_graphs, clear_tree_graphs
+from ..utils.spatial_utils import clear_spatial_indexes
+from ..utils.farm_utils import is_render_farm
+from ..utils.prof_utils import instrument, instrumented, set_instrumentation
+from ..operators.search import clear_search_indexes
 from ..customnodes import allcustomnodes
+from ..customnodes.evaluator import tag_updated_evaluation_dependencies, tag_evaluation_dependencies_dirty, clear_evaluation_cache
 from ..customnodes import NODEBOOSTER_NG_GN_IsRenderedView
 
 
@@ -27,6 +50,7 @@ from ..customnodes import NODEBOOSTER_NG_GN_IsRenderedView
 MSGBUSOWNER_VIEWPORT_SHADING = object()
 MSGBUSOWNER_PALETTE =  object()
 
+@instrumented('HANDLER', 'msgbus_viewport_shading')
 def msgbus_viewportshading_callback(*args):
 
     if (get_addon_prefs().debug_depsgraph):
@@ -79,15 +103,17 @@ def on_plugin_installation():
         
         dprint(f"HANDLER: on_plugin_installation(): Loading Plugin: Running few functions..",)
         
-        #register gpu drawing functions
-        register_gpu_drawcalls()
-        
-        #start the minimap navigation automatically?
-        if (get_addon_prefs().auto_launch_minimap_navigation):
-            bpy.context.window_manager.nodebooster.minimap_modal_operator_is_active = True
+        if (not is_render_farm()):
+
+            #register gpu drawing functions
+            register_gpu_drawcalls()
+
+            #start the minimap navigation automatically?
+            if (get_addon_prefs().auto_launch_minimap_navigation):
+                bpy.context.window_manager.nodebooster.minimap_modal_operator_is_active = True
 
-        #on init we find all booster nodes parent trees, to save perfs at runtime.
-        cache_all_booster_nodes_parent_trees()
+        #on init we find all booster nodes, to save perfs at runtime.
+        rebuild_booster_nodes_registry()
 
         return None
 
@@ -118,6 +144,26 @@ def windows_changed():
     return state
 
 
+def upd_custom_nodes(classes:list, nodes:list):
+    """run the update_all() function of the given custom node classes, for the given nodes instances"""
+
+    #cls with 'auto_upd_flags' property are eligible for automatic execution.
+    for cls in classes:
+        if (not hasattr(cls,'update_all')):
+            continue
+        #automatic re-evaluation of the Python Expression and Python Nex Nodes, for security reasons, only if the user allows it expressively.
+        if ('AUTORIZATION_REQUIRED' in cls.auto_upd_flags) and \
+           (not bpy.context.window_manager.nodebooster.authorize_automatic_execution):
+            continue
+        cls_nodes = [n for n in nodes if (n.bl_idname==cls.bl_idname)]
+        if (cls_nodes):
+            with instrument('NODE', cls.__name__):
+                cls.update_all(signal_from_handlers=True, using_nodes=cls_nodes)
+        continue
+
+    return None
+
+
 def upd_all_custom_nodes(classes:list):
     """automatically run the update_all() function of all custom nodes passed"""
 
@@ -133,30 +179,122 @@ def upd_all_custom_nodes(classes:list):
     nodes = get_booster_nodes(by_idnames=matching_blid,)
     # print("upd_all_custom_nodes().nodes:", matching_blid, nodes, )
 
-    #cls with 'auto_upd_flags' property are eligible for automatic execution.
-    auto_update_nodes = [n for n in nodes if (hasattr(n,'update_all')) and (hasattr(n,'auto_upd_flags'))]
+    upd_custom_nodes(classes, nodes)
+    return None
 
-    for n in auto_update_nodes:
-        #automatic re-evaluation of the Python Expression and Python Nex Nodes, for security reasons, only if the user allows it expressively.
-        if ('AUTORIZATION_REQUIRED' in n.auto_upd_flags) and \
-           (not bpy.context.window_manager.nodebooster.authorize_automatic_execution):
-            continue
-        n.update_all(signal_from_handlers=True, using_nodes=nodes)
-        continue
 
+def is_interacting() -> bool:
+    """are we interacting with the scene? false while rendering, playing an animation, or on a render farm"""
+
+    if (IS_RENDER_FARM) or (bpy.app.is_job_running('RENDER')):
+        return False
+    for w in bpy.context.window_manager.windows:
+        if (w.screen is not None) and (w.screen.is_animation_playing):
+            return False
+
+    return True
+
+def upd_scheduled_custom_nodes(classes:list, changed:set, throttle:bool=False,):
+    """run the update_all() function of the custom nodes passed, only for the instances depending on the changed data.
+    See 'dep_utils.py' for more information about the dependencies of our nodes.
+    throttle: apply the nodes refresh rate settings, only for interactive depsgraph signals."""
+
+    if (not classes):
+        return None
+
+    idnames = {cls.bl_idname for cls in classes}
+    nodes = get_nodes_to_refresh(idnames, changed, index_idnames=SCHEDULED_IDNAMES,)
+    if (not nodes):
+        return None
+
+    #some nodes might be rate limited or debounced, their refresh is then postponed to the trailing edge timer.
+    #while rendering or playing, every frame needs exact values.
+    if (throttle) and (is_interacting()):
+        nodes = throttle_nodes(nodes)
+        register_trailing_refresh_timer()
+        if (not nodes):
+            return None
+
+    refresh_custom_nodes(classes, nodes)
     return None
 
 
+def refresh_custom_nodes(classes:list, nodes:list):
+    """refresh the given nodes, recognizing the echo of our writes and indexing their dependencies again"""
+
+    #our writes will trigger new depsgraph signals, we need to recognize them. See 'feedback' note in 'dep_utils.py'.
+    with refreshing_nodes(nodes):
+        upd_custom_nodes(classes, nodes)
+
+    #the dependencies of a node might change after its refresh. ex: active camera changed.
+    for n in nodes:
+        index_node_dependencies(n)
+
+    return None
+
+
+def trailing_refresh_timer():
+    """refresh the rate limited or debounced nodes once their postponed refresh is due. See 'throttling' note in 'dep_utils.py'."""
+
+    keys, idnames, delay = pop_trailing_nodes()
+
+    if (keys):
+        classes = [cls for cls in SCHEDULED_CLASSES if (cls.bl_idname in idnames)]
+        classes = get_unbaked_classes(classes, bpy.context.scene)
+        nodes = [n for n in get_booster_nodes(by_idnames=idnames) if (node_key(n) in keys)]
+        if (classes and nodes):
+            refresh_custom_nodes(classes, nodes)
+
+    return delay
+
+def register_trailing_refresh_timer():
+    """make sure the trailing edge timer will run in time for the next postponed refresh"""
+
+    delay = get_next_trailing_delay()
+    if (delay is None):
+        return None
+
+    #the timer might be registered for a later refresh, a debounce shorter than the previous one for example.
+    if (bpy.app.timers.is_registered(trailing_refresh_timer)):
+        bpy.app.timers.unregister(trailing_refresh_timer)
+    bpy.app.timers.register(trailing_refresh_timer, first_interval=delay)
+
+    return None
+
+
+def get_unbaked_classes(classes:list, scene) -> list:
+    """when the playback is baked, the values of the 'PLAYBACK_BAKEABLE' nodes are keyframed, no need to refresh them"""
+
+    if (scene is None) or (not scene.nodebooster.playback_baked):
+        return classes
+    return [cls for cls in classes if ('PLAYBACK_BAKEABLE' not in cls.auto_upd_flags)]
+
+
+IS_RENDER_FARM = is_render_farm()
+
 DEPSPOST_UPD_NODES = [cls for cls in allcustomnodes if ('DEPS_POST' in cls.auto_upd_flags)]
+FRAMEPRE_UPD_NODES = [cls for cls in allcustomnodes if ('FRAME_PRE' in cls.auto_upd_flags)]
+SCHEDULED_CLASSES = list(dict.fromkeys(DEPSPOST_UPD_NODES + FRAMEPRE_UPD_NODES))
+SCHEDULED_IDNAMES = {cls.bl_idname for cls in SCHEDULED_CLASSES}
 
 @bpy.app.handlers.persistent
+@instrumented('HANDLER', 'depsgraph_update_post')
 def nodebooster_handler_depspost(scene,desp):
     """update on depsgraph change"""
 
+    #the nodetrees snapshots used by our traversals, and the interpolation values depending on updated IDs, might be outdated.
+    tag_updated_tree_graphs(desp)
+    tag_updated_evaluation_dependencies(desp)
+
+    #signal sent while we are refreshing our nodes? it's our own doing.
+    if (is_refreshing()):
+        count_suppressed_cycle()
+        return None
+
     if (get_addon_prefs().debug_depsgraph):
         print("nodebooster_handler_depspost(): depsgraph signal")
 
-    if (get_addon_prefs().auto_launch_minimap_navigation):
+    if (get_addon_prefs().auto_launch_minimap_navigation) and (not IS_RENDER_FARM):
         if (windows_changed()):
             win_sett = bpy.context.window_manager.nodebooster
             # we are forced to restart the modal navigation when a window is opened.
@@ -165,46 +303,114 @@ def nodebooster_handler_depspost(scene,desp):
             win_sett.minimap_modal_operator_is_active = False
             win_sett.minimap_modal_operator_is_active = True
 
-    #updates for our custom nodes
-    upd_all_custom_nodes(DEPSPOST_UPD_NODES)
+    #updates for our custom nodes, only the ones depending on the updated data
+    changed = get_changed_dependencies(depsgraph=desp,)
+    if (changed is None):
+        #this signal is only the echo of our previous writes
+        return None
+    upd_scheduled_custom_nodes(get_unbaked_classes(DEPSPOST_UPD_NODES, scene), changed, throttle=True,)
     return None
 
-FRAMEPRE_UPD_NODES = [cls for cls in allcustomnodes if ('FRAME_PRE' in cls.auto_upd_flags)]
-
 @bpy.app.handlers.persistent
+@instrumented('HANDLER', 'frame_change_pre')
 def nodebooster_handler_framepre(scene,desp):
     """update on frame change"""
 
+    if (is_refreshing()):
+        count_suppressed_cycle()
+        return None
+
     if (get_addon_prefs().debug_depsgraph):
         print("nodebooster_handler_framepre(): frame_pre signal")
 
-    #updates for our custom nodes
-    upd_all_custom_nodes(FRAMEPRE_UPD_NODES)
+    #an echo left by a previous refresh is outdated, only the writes of this frame should be recognized.
+    clear_feedback_echo()
+
+    #the interpolation values depending on time are outdated
+    tag_evaluation_dependencies_dirty({'FRAME'})
+
+    #updates for our custom nodes, only the ones depending on the frame or on animated data
+    changed = get_changed_dependencies(scene=scene,)
+    upd_scheduled_custom_nodes(get_unbaked_classes(FRAMEPRE_UPD_NODES, scene), changed)
     return None
 
 LOADPOST_UPD_NODES = [cls for cls in allcustomnodes if ('LOAD_POST' in cls.auto_upd_flags)]
 
 @bpy.app.handlers.persistent
+@instrumented('HANDLER', 'load_post')
 def nodebooster_handler_loadpost(scene,desp):
     """Handler function when user is loading a file"""
     
     if (get_addon_prefs().debug_depsgraph):
         print("nodebooster_handler_framepre(): frame_pre signal")
 
-    #need to add message bus on each blender load
-    register_msgbusses()
+    #interactive features are meaningless on a render farm
+    if (not IS_RENDER_FARM):
 
-    #register gpu drawing functions
-    register_gpu_drawcalls()
+        #need to add message bus on each blender load
+        register_msgbusses()
+
+        #register gpu drawing functions
+        register_gpu_drawcalls()
 
-    #start the minimap navigation automatically? only if the user enabled it.
-    if (get_addon_prefs().auto_launch_minimap_navigation):
-        bpy.context.window_manager.nodebooster.minimap_modal_operator_is_active = True
+        #start the minimap navigation automatically? only if the user enabled it.
+        if (get_addon_prefs().auto_launch_minimap_navigation):
+            bpy.context.window_manager.nodebooster.minimap_modal_operator_is_active = True
             
-    #updates for our custom nodes
+    #updates for our custom nodes, the nodes registry & dependencies needs to be indexed again for this new file.
+    clear_rebuild_queue()
+    clear_refresh_queue()
+    clear_throttle_state()
+    clear_ng_defvalues_shadow()
+    clear_tree_graphs()
+    clear_evaluation_cache()
+    clear_spatial_indexes()
+    clear_search_indexes()
+    rebuild_booster_nodes_registry()
+    tag_dependencies_dirty()
     upd_all_custom_nodes(LOADPOST_UPD_NODES)
     return None
 
+@bpy.app.handlers.persistent
+@instrumented('HANDLER', 'undo_post')
+def nodebooster_handler_undopost(scene,desp):
+    """Handler function when user is undoing or redoing"""
+
+    if (get_addon_prefs().debug_depsgraph):
+        print("nodebooster_handler_undopost(): undo_post signal")
+
+    #the socket values we wrote might have been reverted, our shadow of these values is no longer reliable.
+    clear_ng_defvalues_shadow()
+    #the nodetrees memory changed as well, our topology snapshots & evaluated values are referring to old adresses.
+    clear_tree_graphs()
+    clear_evaluation_cache()
+    return None
+
+@bpy.app.handlers.persistent
+@instrumented('HANDLER', 'render_init')
+def nodebooster_handler_renderinit(scene,desp):
+    """Handler function when a render starts, only used in render-farm mode"""
+
+    #the user might have baked the playback already
+    if (scene.nodebooster.playback_baked):
+        return None
+
+    #a farm job only renders a part of the range, the frame handler evaluates our nodes on each of its frames.
+    #but some nodes need the previous frames to be evaluated as well, ex: the velocity is computed from a frame history.
+    history = max((getattr(cls, 'history_frames', 0) for cls in FRAMEPRE_UPD_NODES), default=0)
+    frame_orig = scene.frame_current
+    frame_from = max(scene.frame_start, frame_orig-history)
+    if (frame_from>=frame_orig):
+        return None
+
+    t = time.perf_counter()
+    for frame in range(frame_from, frame_orig):
+        scene.frame_set(frame)
+    scene.frame_set(frame_orig)
+    print(f"Node-Booster: render-farm mode, evaluated history frames {frame_from}-{frame_orig-1} in {time.perf_counter()-t:.2f}s")
+
+    return None
+
 
 # ooooooooo.                        
 # `888   `Y88.                      
@@ -216,6 +422,17 @@ def nodebooster_handler_loadpost(scene,desp):
 #                        d"     YD  
 #                        "Y88888P'  
                                   
+REGISTRY_CHECK_INTERVAL = 10.0
+
+def booster_nodes_registry_check_timer():
+    """periodic consistency check of the booster nodes registry, it might miss renamed nodes or nodetrees"""
+
+    if (not check_booster_nodes_registry()):
+        dprint("HANDLER: booster_nodes_registry_check_timer(): registry was inconsistent, rebuilt it.")
+        tag_dependencies_dirty()
+
+    return REGISTRY_CHECK_INTERVAL
+
 def all_handlers(name=False):
     """return a list of handler stored in .blend""" 
 
@@ -232,6 +449,8 @@ def load_handlers():
     
     handler_names = [h.__name__ for h in all_handlers()]
 
+    set_instrumentation(get_addon_prefs().debug_instrumentation)
+
     if ('nodebooster_handler_depspost' not in handler_names):
         bpy.app.handlers.depsgraph_update_post.append(nodebooster_handler_depspost)
 
@@ -240,6 +459,17 @@ def load_handlers():
 
     if ('nodebooster_handler_loadpost' not in handler_names):
         bpy.app.handlers.load_post.append(nodebooster_handler_loadpost)
+
+    if ('nodebooster_handler_undopost' not in handler_names):
+        bpy.app.handlers.undo_post.append(nodebooster_handler_undopost)
+        bpy.app.handlers.redo_post.append(nodebooster_handler_undopost)
+
+    if (IS_RENDER_FARM):
+        if ('nodebooster_handler_renderinit' not in handler_names):
+            bpy.app.handlers.render_init.append(nodebooster_handler_renderinit)
+
+    elif (not bpy.app.timers.is_registered(booster_nodes_registry_check_timer)):
+        bpy.app.timers.register(booster_nodes_registry_check_timer, first_interval=REGISTRY_CHECK_INTERVAL, persistent=True,)
         
     return None 
 
@@ -256,4 +486,22 @@ def unload_handlers():
         if(h.__name__=='nodebooster_handler_loadpost'):
             bpy.app.handlers.load_post.remove(h)
 
+        if(h.__name__=='nodebooster_handler_renderinit'):
+            bpy.app.handlers.render_init.remove(h)
+
+        if(h.__name__=='nodebooster_handler_undopost'):
+            for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+                if (h in handlers):
+                    handlers.remove(h)
+
+    if (bpy.app.timers.is_registered(booster_nodes_registry_check_timer)):
+        bpy.app.timers.unregister(booster_nodes_registry_check_timer)
+
+    if (bpy.app.timers.is_registered(trailing_refresh_timer)):
+        bpy.app.timers.unregister(trailing_refresh_timer)
+
+    clear_rebuild_queue()
+    clear_refresh_queue()
+    clear_throttle_state()
+
     return None
@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE ABOUT: headless batch recompilation of the Nex script nodes, across many .blend files.
+#  Useful to re-build assets libraries after an upgrade of the plugin, without opening each files in the UI.
+#  The plugin must be installed & enabled in the blender instance running this script. Usage:
+#    blender -b --python path/to/nodebooster/nex/batchcompile.py -- a.blend b.blend libs/*.blend --report report.json
+#  Options:
+#    --report PATH  write the json report to this file (by default the report is printed in the console).
+#    --no-save      do not save the .blend files after recompilation.
+#    --keep-going   still save a file even if one of its nex nodes raised an error.
+
+# NOTE CODE INFO:
+# - When executed via '--python' this file runs as '__main__', without its package context,
+#   so we first find the installed plugin package back, and then run 'main()' from there.
+# - The NexFactory is bound to a node instance, we reuse the node own 'interpret_nex_script()' to compile,
+#   so the result is exactly what the user would get by pressing the 'Execute' button.
+
+import bpy
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+
+
+def parse_arguments(argv:list) -> argparse.Namespace:
+    """parse the arguments passed after blender '--' separator"""
+
+    if ('--' in argv):
+          argv = argv[argv.index('--')+1:]
+    else: argv = []
+
+    parser = argparse.ArgumentParser(prog="nodebooster batchcompile",
+        description="Recompile every Nex script node of the given .blend files.",)
+    parser.add_argument('blends', nargs='*', help="list of .blend files to recompile. If empty, the currently opened file is used.",)
+    parser.add_argument('--report', default='', help="write the json report to this filepath.",)
+    parser.add_argument('--no-save', action='store_true', help="do not save the .blend files.",)
+    parser.add_argument('--keep-going', action='store_true', help="save the .blend files even if errors occured.",)
+
+    return parser.parse_args(argv)
+
+def compile_nex_node(node) -> dict:
+    """recompile a single nex node, return a report dict"""
+
+    t = time.perf_counter()
+    node.interpret_nex_script(rebuild=True)
+    build_time = time.perf_counter() - t
+
+    return {
+        'node': node.name,
+        'node_tree': node.id_data.name,
+        'tree_type': node.id_data.bl_idname,
+        'text': node.user_textdata.name if (node.user_textdata) else None,
+        'build_time_ms': round(build_time*1000, 3),
+        'nodes_count': node.debug_nodes_quantity,
+        'error': node.error_message or None,
+        }
+
+def compile_current_file(save:bool=True, keep_going:bool=False,) -> dict:
+    """recompile all nex nodes of the currently opened file, return a report dict"""
+
+    from ..utils.node_utils import get_booster_nodes, rebuild_booster_nodes_registry
+    from ..customnodes import NODEBOOSTER_NG_GN_PyNexScript, NODEBOOSTER_NG_SH_PyNexScript, NODEBOOSTER_NG_CP_PyNexScript
+
+    # In background mode our usual 'on_plugin_installation()' or nodes .update() might not had a chance to run yet.
+    rebuild_booster_nodes_registry()
+
+    idnames = {NODEBOOSTER_NG_GN_PyNexScript.bl_idname, NODEBOOSTER_NG_SH_PyNexScript.bl_idname, NODEBOOSTER_NG_CP_PyNexScript.bl_idname,}
+    nodes = sorted(get_booster_nodes(by_idnames=idnames), key=lambda n: (n.id_data.name, n.name),)
+
+    t = time.perf_counter()
+    results = [compile_nex_node(n) for n in nodes]
+    errors = [r for r in results if r['error']]
+
+    saved = False
+    if (save and nodes and bpy.data.filepath):
+        if (keep_going or not errors):
+            bpy.ops.wm.save_mainfile()
+            saved = True
+
+    return {
+        'filepath': bpy.data.filepath,
+        'nodes': results,
+        'nodes_total': len(results),
+        'errors_total': len(errors),
+        'build_time_ms': round((time.perf_counter() - t)*1000, 3),
+        'saved': saved,
+        }
+
+def main(argv:list=None) -> dict:
+    """command line entry point, see module header for usage"""
+
+    args = parse_arguments(sys.argv if (argv is None) else argv)
+
+    report = {'files':[], 'errors_total':0, 'nodes_total':0,}
+
+    filepaths = [os.path.abspath(p) for p in args.blends]
+    if (not filepaths):
+        filepaths = [None]
+
+    for filepath in filepaths:
+
+        if (filepath is not None):
+            if (not os.path.isfile(filepath)):
+                report['files'].append({'filepath':filepath, 'error':"File not found",})
+                continue
+            try:
+                bpy.ops.wm.open_mainfile(filepath=filepath, load_ui=False,)
+            except Exception as e:
+                report['files'].append({'filepath':filepath, 'error':f"{type(e).__name__}: {e}",})
+                continue
+
+        r = compile_current_file(save=not args.no_save, keep_going=args.keep_going,)
+        report['files'].append(r)
+        report['nodes_total'] += r['nodes_total']
+        report['errors_total'] += r['errors_total']
+
+        print(f"NodeBooster batchcompile: '{r['filepath']}' {r['nodes_total']} node(s), {r['errors_total']} error(s), {r['build_time_ms']}ms")
+        continue
+
+    dump = json.dumps(report, indent=4)
+    if (args.report):
+        with open(args.report, 'w') as f:
+            f.write(dump)
+    else:
+        print(dump)
+
+    return report
+
+
+if (__name__=="__main__"):
+
+    # find the installed plugin package back, extensions are registered as 'bl_ext.{repo}.nodebooster'
+    package = None
+    for name in bpy.context.preferences.addons.keys():
+        if (name.split('.')[-1]=='nodebooster'):
+            package = name
+            break
+
+    if (package is None):
+        print("ERROR: NodeBooster batchcompile: the plugin is not enabled in this blender instance.")
+        sys.exit(1)
+
+    report = importlib.import_module(f"{package}.nex.batchcompile").main()
+    sys.exit(1 if report['errors_total'] else 0)
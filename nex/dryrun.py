@@ -0,0 +1,367 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE ABOUT: this module is a numpy 'dry-run' interpreter for the math expression compiler.
+#  Instead of creating nodes & links like 'nodesetter.py' does, we evaluate the very same function call tree
+#  (the one produced by 'AstTranformer' and consumed by 'ast_function_caller()') on numpy arrays of samples.
+#  It can also walk an already generated float math nodetree, so we can verify that a compiled nodegroup
+#  produces the same numbers as its expression.
+
+# NOTE CODE INFO:
+# - This module must never import bpy nor mathutils, it needs to be usable headlessly, outside of blender.
+#   The nodetree walker only relies on duck-typed attributes (node.bl_idname, node.operation, socket.links ect..).
+# - The kernels below try to replicate blender's 'safe' math behaviors (division by zero returns 0, ect..),
+#   see 'source/blender/blenlib/BLI_math_base_safe.h' & 'NOD_math_functions.hh'.
+
+# TODO
+# - support vector math kernels, for now we only support the float domain of the mathex functions.
+# - extend the nodetree walker to more node types if nexscript needs it someday.
+
+import ast
+import functools
+
+import numpy as np
+
+
+class DryRunError(Exception):
+    """raised when the dry-run interpreter meet something it cannot evaluate"""
+
+
+# 88  dP 888888 88""Yb 88b 88 888888 88     .dP"Y8
+# 88odP  88__   88__dP 88Yb88 88__   88     `Ybo."
+# 88"Yb  88""   88"Yb  88 Y88 88""   88  .o o.`Y8b
+# 88  Yb 888888 88  Yb 88  Y88 888888 88ood8 8bodP'
+
+def _safe_div(a, b):
+    b = np.asarray(b, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(b!=0, np.divide(a, np.where(b!=0, b, 1.0)), 0.0)
+
+def _safe_pow(a, b):
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+    valid = (a>=0) | (b==np.floor(b))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return np.where(valid, np.power(np.where(valid, a, 1.0), b), 0.0)
+
+def _safe_log(a, b):
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+    valid = (a>0) & (b>0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(valid, _safe_div(np.log(np.where(valid, a, 1.0)), np.log(np.where(valid, b, 2.0))), 0.0)
+
+def _safe_sqrt(a):
+    a = np.asarray(a, dtype=np.float64)
+    return np.where(a>0, np.sqrt(np.abs(a)), 0.0)
+
+def _safe_invsqrt(a):
+    a = np.asarray(a, dtype=np.float64)
+    return np.where(a>0, 1.0/np.sqrt(np.where(a>0, a, 1.0)), 0.0)
+
+def _safe_fmod(a, b):
+    b = np.asarray(b, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(b!=0, np.fmod(a, np.where(b!=0, b, 1.0)), 0.0)
+
+def _floored_mod(a, b):
+    return np.where(np.asarray(b)!=0, a - np.floor(_safe_div(a, b)) * b, 0.0)
+
+def _wrap(v, vmax, vmin):
+    vrange = np.asarray(vmax - vmin, dtype=np.float64)
+    return np.where(vrange!=0, v - vrange * np.floor(_safe_div(v - vmin, vrange)), vmin)
+
+def _pingpong(v, scale):
+    scale = np.asarray(scale, dtype=np.float64)
+    fract = lambda x: x - np.floor(x)
+    return np.where(scale!=0, np.abs(fract(_safe_div(v - scale, scale * 2.0)) * scale * 2.0 - scale), 0.0)
+
+def _smoothmin(a, b, dist):
+    dist = np.asarray(dist, dtype=np.float64)
+    h = _safe_div(np.maximum(dist - np.abs(a - b), 0.0), dist)
+    return np.where(dist!=0, np.minimum(a, b) - h * h * h * dist * (1.0/6.0), np.minimum(a, b))
+
+def _clamp_range(v, a, b):
+    return np.clip(v, np.minimum(a, b), np.maximum(a, b))
+
+def _maprange(interpolation_type, v, a, b, x, y, steps=4.0):
+    factor = _safe_div(v - a, b - a)
+    match interpolation_type:
+        case 'LINEAR':
+            pass
+        case 'STEPPED':
+            steps = np.asarray(steps, dtype=np.float64)
+            factor = np.where(steps>0, _safe_div(np.floor(factor * (steps + 1.0)), steps), 0.0)
+        case 'SMOOTHSTEP':
+            t = np.clip(factor, 0.0, 1.0)
+            factor = (3.0 - 2.0 * t) * t * t
+        case 'SMOOTHERSTEP':
+            t = np.clip(factor, 0.0, 1.0)
+            factor = t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+    return x + factor * (y - x)
+
+#Blender 'ShaderNodeMath' & 'CompositorNodeMath' operations, also 'ShaderNodeClamp' as 'CLAMP.' prefix.
+FLOATMATH_KERNELS = {
+    'ADD':           lambda a, b, c: a + b,
+    'SUBTRACT':      lambda a, b, c: a - b,
+    'MULTIPLY':      lambda a, b, c: a * b,
+    'DIVIDE':        lambda a, b, c: _safe_div(a, b),
+    'MULTIPLY_ADD':  lambda a, b, c: a * b + c,
+    'POWER':         lambda a, b, c: _safe_pow(a, b),
+    'LOGARITHM':     lambda a, b, c: _safe_log(a, b),
+    'SQRT':          lambda a, b, c: _safe_sqrt(a),
+    'INVERSE_SQRT':  lambda a, b, c: _safe_invsqrt(a),
+    'ABSOLUTE':      lambda a, b, c: np.abs(a),
+    'EXPONENT':      lambda a, b, c: np.exp(a),
+    'MINIMUM':       lambda a, b, c: np.minimum(a, b),
+    'MAXIMUM':       lambda a, b, c: np.maximum(a, b),
+    'LESS_THAN':     lambda a, b, c: (a < b).astype(np.float64),
+    'GREATER_THAN':  lambda a, b, c: (a > b).astype(np.float64),
+    'SIGN':          lambda a, b, c: np.sign(a),
+    'COMPARE':       lambda a, b, c: (np.abs(a - b) <= np.maximum(c, 1e-5)).astype(np.float64),
+    'SMOOTH_MIN':    lambda a, b, c: _smoothmin(a, b, c),
+    'SMOOTH_MAX':    lambda a, b, c: -_smoothmin(-a, -b, c),
+    'ROUND':         lambda a, b, c: np.floor(a + 0.5),
+    'FLOOR':         lambda a, b, c: np.floor(a),
+    'CEIL':          lambda a, b, c: np.ceil(a),
+    'TRUNC':         lambda a, b, c: np.trunc(a),
+    'FRACT':         lambda a, b, c: a - np.floor(a),
+    'MODULO':        lambda a, b, c: _safe_fmod(a, b),
+    'FLOORED_MODULO':lambda a, b, c: _floored_mod(a, b),
+    'WRAP':          lambda a, b, c: _wrap(a, b, c),
+    'SNAP':          lambda a, b, c: np.floor(_safe_div(a, b)) * b,
+    'PINGPONG':      lambda a, b, c: _pingpong(a, b),
+    'SINE':          lambda a, b, c: np.sin(a),
+    'COSINE':        lambda a, b, c: np.cos(a),
+    'TANGENT':       lambda a, b, c: np.tan(a),
+    'ARCSINE':       lambda a, b, c: np.arcsin(np.clip(a, -1.0, 1.0)),
+    'ARCCOSINE':     lambda a, b, c: np.arccos(np.clip(a, -1.0, 1.0)),
+    'ARCTANGENT':    lambda a, b, c: np.arctan(a),
+    'ARCTAN2':       lambda a, b, c: np.arctan2(a, b),
+    'SINH':          lambda a, b, c: np.sinh(a),
+    'COSH':          lambda a, b, c: np.cosh(a),
+    'TANH':          lambda a, b, c: np.tanh(a),
+    'RADIANS':       lambda a, b, c: np.radians(a),
+    'DEGREES':       lambda a, b, c: np.degrees(a),
+    'CLAMP.MINMAX':  lambda a, b, c: np.minimum(np.maximum(a, b), c),
+    'CLAMP.RANGE':   lambda a, b, c: _clamp_range(a, b, c),
+    }
+
+def floatmath(operation_type:str, a=0.0, b=0.0, c=0.0):
+    """evaluate a blender float math operation on arrays"""
+
+    kernel = FLOATMATH_KERNELS.get(operation_type)
+    if (kernel is None):
+        raise DryRunError(f"Operation '{operation_type}' not supported by the dry-run interpreter.")
+
+    a, b, c = (np.asarray(v, dtype=np.float64) for v in (a, b, c))
+    with np.errstate(all='ignore'):
+        return kernel(a, b, c)
+
+# 8b    d8    db    888888 88  88 888888 Yb  dP
+# 88b  d88   dPYb     88   88  88 88__    YbdP
+# 88YbdP88  dP__Yb    88   888888 88""    dPYb
+# 88 YY 88 dP""""Yb   88   88  88 888888 dP  Yb
+
+#Equivalent of the 'mathex' user functions of nodesetter.py. Same names, same arguments order.
+MATHEX_DRYRUN_FUNCTIONS = {
+    'add':       lambda a, b: floatmath('ADD', a, b),
+    'sub':       lambda a, b: floatmath('SUBTRACT', a, b),
+    'mult':      lambda a, b: floatmath('MULTIPLY', a, b),
+    'div':       lambda a, b: floatmath('DIVIDE', a, b),
+    'pow':       lambda a, n: floatmath('POWER', a, n),
+    'log':       lambda a, n: floatmath('LOGARITHM', a, n),
+    'sqrt':      lambda a: floatmath('SQRT', a),
+    'invsqrt':   lambda a: floatmath('INVERSE_SQRT', a),
+    'nroot':     lambda a, n: floatmath('POWER', a, floatmath('DIVIDE', 1, n)),
+    'abs':       lambda a: floatmath('ABSOLUTE', a),
+    'neg':       lambda a: floatmath('SUBTRACT', 0, a),
+    'round':     lambda a: floatmath('ROUND', a),
+    'floor':     lambda a: floatmath('FLOOR', a),
+    'ceil':      lambda a: floatmath('CEIL', a),
+    'trunc':     lambda a: floatmath('TRUNC', a),
+    'frac':      lambda a: floatmath('FRACT', a),
+    'mod':       lambda a, b: floatmath('MODULO', a, b),
+    'floormod':  lambda a, b: floatmath('FLOORED_MODULO', a, b),
+    'wrap':      lambda v, a, b: floatmath('WRAP', v, a, b),
+    'snap':      lambda v, i: floatmath('SNAP', v, i),
+    'pingpong':  lambda v, scale: floatmath('PINGPONG', v, scale),
+    'floordiv':  lambda a, b: floatmath('FLOOR', floatmath('DIVIDE', a, b)),
+    'sin':       lambda a: floatmath('SINE', a),
+    'cos':       lambda a: floatmath('COSINE', a),
+    'tan':       lambda a: floatmath('TANGENT', a),
+    'asin':      lambda a: floatmath('ARCSINE', a),
+    'acos':      lambda a: floatmath('ARCCOSINE', a),
+    'atan':      lambda a: floatmath('ARCTANGENT', a),
+    'sinh':      lambda a: floatmath('SINH', a),
+    'cosh':      lambda a: floatmath('COSH', a),
+    'tanh':      lambda a: floatmath('TANH', a),
+    'rad':       lambda a: floatmath('RADIANS', a),
+    'deg':       lambda a: floatmath('DEGREES', a),
+    'radians':   lambda a: floatmath('RADIANS', a),
+    'degrees':   lambda a: floatmath('DEGREES', a),
+    'min':       lambda *floats: functools.reduce(lambda a, b: floatmath('MINIMUM', a, b), floats),
+    'max':       lambda *floats: functools.reduce(lambda a, b: floatmath('MAXIMUM', a, b), floats),
+    'smin':      lambda a, b, dist: floatmath('SMOOTH_MIN', a, b, dist),
+    'smax':      lambda a, b, dist: floatmath('SMOOTH_MAX', a, b, dist),
+    'lerp':      lambda f, a, b: np.asarray(a) + np.asarray(f) * (np.asarray(b) - np.asarray(a)),
+    'mix':       lambda f, a, b: np.asarray(a) + np.asarray(f) * (np.asarray(b) - np.asarray(a)),
+    'clamp':     lambda v, a=0, b=1: floatmath('CLAMP.MINMAX', v, a, b),
+    'clampauto': lambda v, a, b: floatmath('CLAMP.RANGE', v, a, b),
+    'mapl':      lambda v, a, b, x, y: _maprange('LINEAR', *np.broadcast_arrays(*(np.asarray(e, dtype=np.float64) for e in (v,a,b,x,y)))),
+    'mapst':     lambda v, a, b, x, y, step: _maprange('STEPPED', *np.broadcast_arrays(*(np.asarray(e, dtype=np.float64) for e in (v,a,b,x,y))), steps=step),
+    'mapsmo':    lambda v, a, b, x, y: _maprange('SMOOTHSTEP', *np.broadcast_arrays(*(np.asarray(e, dtype=np.float64) for e in (v,a,b,x,y)))),
+    'mapsmoo':   lambda v, a, b, x, y: _maprange('SMOOTHERSTEP', *np.broadcast_arrays(*(np.asarray(e, dtype=np.float64) for e in (v,a,b,x,y)))),
+    'combixyz':  lambda x, y, z: np.stack(np.broadcast_arrays(*(np.asarray(e, dtype=np.float64) for e in (x,y,z))), axis=-1),
+    }
+
+@functools.lru_cache(maxsize=128)
+def parse_function_expression(fctexp:str) -> ast.AST:
+    """parse a function expression string, such as the one displayed in the mathexpression 'Function Expression' debug field"""
+
+    try:
+        return ast.parse(fctexp, mode='eval').body
+    except SyntaxError as e:
+        raise DryRunError(f"Function Expression Not Recognized: {e}")
+
+def dryrun_function_expression(visited, vareq:dict=None, consteq:dict=None):
+    """Recursively evaluate the transformed AST tree on numpy arrays, mirror of 'mathexpression.ast_function_caller()'.
+    'visited' can either be the ast tree given by 'AstTranformer.get_function_expression()' or its unparsed string.
+    'vareq' are the variable names with their sample values, can be floats or arrays of samples."""
+
+    if (type(visited) is str):
+        visited = parse_function_expression(visited)
+
+    def caller(node):
+
+        match node:
+
+            case ast.Call():
+                evaluated_args = [caller(arg) for arg in node.args]
+
+                if not isinstance(node.func, ast.Name):
+                    raise DryRunError("Only direct function calls are supported.")
+
+                func = MATHEX_DRYRUN_FUNCTIONS.get(node.func.id)
+                if (func is None):
+                    raise DryRunError(f"Function '{node.func.id}' not recognized.")
+
+                return func(*evaluated_args)
+
+            case ast.Name():
+                if (vareq is not None and node.id in vareq):
+                    return np.asarray(vareq[node.id], dtype=np.float64)
+                elif (consteq is not None and node.id in consteq):
+                    return np.asarray(consteq[node.id], dtype=np.float64)
+                raise DryRunError(f"Element '{node.id}' not recognized.")
+
+            case ast.Constant():
+                key = str(node.value)
+                if (consteq is not None and key in consteq):
+                    return np.asarray(consteq[key], dtype=np.float64)
+                return np.asarray(node.value, dtype=np.float64)
+
+            case ast.Tuple():
+                raise DryRunError("Wrong use of '( , )' Synthax")
+
+            case _:
+                raise DryRunError(f"Unknown ast type '{type(node).__name__}'.")
+
+    return caller(visited)
+
+def sample_variables(varnames, count:int=64, low:float=-10.0, high:float=10.0, seed:int=0,) -> dict:
+    """generate a dict of random sample arrays for the given variable names, stable from the given seed"""
+
+    rng = np.random.default_rng(seed)
+    return {name:rng.uniform(low, high, count) for name in sorted(varnames)}
+
+# 88b 88  dP"Yb  8888b.  888888 888888 88""Yb 888888 888888
+# 88Yb88 dP   Yb  8I  Yb 88__     88   88__dP 88__   88__
+# 88 Y88 Yb   dP  8I  dY 88""     88   88"Yb  88""   88""
+# 88  Y8  YbodP  8888Y"  888888   88   88  Yb 888888 888888
+
+def _node_input_value(socket, vareq, cache):
+    """get the value flowing into the given node input socket"""
+
+    links = [l for l in socket.links if not getattr(l,'is_muted',False)]
+    if (not links):
+        return np.asarray(socket.default_value, dtype=np.float64)
+
+    return _socket_output_value(links[0].from_socket, vareq, cache)
+
+def _socket_output_value(socket, vareq, cache):
+    """evaluate the given node output socket, recursively"""
+
+    node = socket.node
+    key = (node.name, socket.identifier)
+    if (key in cache):
+        return cache[key]
+
+    inputs = node.inputs
+    match node.bl_idname:
+
+        case 'NodeGroupInput':
+            if (socket.name not in vareq):
+                raise DryRunError(f"Missing sample values for input '{socket.name}'.")
+            r = np.asarray(vareq[socket.name], dtype=np.float64)
+
+        case 'NodeReroute':
+            r = _node_input_value(inputs[0], vareq, cache)
+
+        case 'ShaderNodeValue' | 'CompositorNodeValue':
+            r = np.asarray(socket.default_value, dtype=np.float64)
+
+        case 'ShaderNodeMath' | 'CompositorNodeMath':
+            args = [_node_input_value(s, vareq, cache) for s in list(inputs)[:3]]
+            r = floatmath(node.operation, *args)
+            if (node.use_clamp):
+                r = np.clip(r, 0.0, 1.0)
+
+        case 'ShaderNodeClamp':
+            args = [_node_input_value(s, vareq, cache) for s in list(inputs)[:3]]
+            r = floatmath(f'CLAMP.{node.clamp_type}', *args)
+
+        case 'ShaderNodeMapRange' if (node.data_type=='FLOAT'):
+            v, a, b, x, y, step = [_node_input_value(inputs[i], vareq, cache) for i in range(6)]
+            r = _maprange(node.interpolation_type, *np.broadcast_arrays(v,a,b,x,y), steps=step)
+            if (node.clamp):
+                r = _clamp_range(r, x, y)
+
+        case 'ShaderNodeMix' if (node.data_type=='FLOAT'):
+            f, a, b = [_node_input_value(inputs[i], vareq, cache) for i in range(3)]
+            if (node.clamp_factor):
+                f = np.clip(f, 0.0, 1.0)
+            r = a + f * (b - a)
+
+        case _:
+            raise DryRunError(f"Node '{node.name}' of type '{node.bl_idname}' not supported by the dry-run interpreter.")
+
+    cache[key] = r
+    return r
+
+def dryrun_node_tree(node_tree, vareq:dict, output_idx:int=0,):
+    """evaluate an already generated float nodetree on numpy arrays, from the 'Group Output' input socket at given index.
+    useful to verify a compiled nodegroup against the dry-run of its expression."""
+
+    out_node = None
+    for n in node_tree.nodes:
+        if (n.bl_idname=='NodeGroupOutput' and getattr(n,'is_active_output',True)):
+            out_node = n
+            break
+    if (out_node is None):
+        raise DryRunError("No 'Group Output' node found.")
+
+    return _node_input_value(out_node.inputs[output_idx], vareq, {})
+
+def compare_dryruns(expected, result, rtol:float=1e-4, atol:float=1e-5,) -> tuple:
+    """compare two dry-run results, return (allclose, max_abs_error)"""
+
+    expected, result = np.broadcast_arrays(np.asarray(expected, dtype=np.float64), np.asarray(result, dtype=np.float64))
+    if (expected.size==0):
+        return True, 0.0
+
+    with np.errstate(invalid='ignore'):
+        err = np.abs(expected - result)
+    ok = np.allclose(expected, result, rtol=rtol, atol=atol, equal_nan=True)
+    maxerr = float(np.nanmax(err)) if np.any(np.isfinite(err)) else 0.0
+
+    return bool(ok), maxerr
@@ -0,0 +1,330 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE ABOUT: Nex library modules.
+#  A Nex script can import helper modules stored as other Text datablocks: 'from nexlib_noise import fbm'.
+#  The module name is resolved to the 'nexlib_noise' or 'nexlib_noise.py' text datablock, if no text is found
+#  we fall back on the regular python import.
+#  - Library functions are inlined in the caller nodetree, like any python function would.
+#  - Library functions decorated with '@nexgroup' are emitted as shared nodegroups instead. The group is built once
+#    per library content hash & arguments signature, then simply instanced by every script calling it.
+#    Nex arguments become the group inputs, the returned Nex become the group outputs. Python arguments are
+#    baked within the group (they are part of the group signature), pass sockets for values changing over time.
+
+# NOTE CODE INFO:
+# - Libraries are transformed & compiled once, the code objects are cached by the hash of their transformed
+#   source. Editing a comment won't invalidate the cache.
+# - Libraries are executed once per script execution, in a namespace seeded with the Nex toys of the caller.
+# - To build a nodegroup, we create a NexFactory bound to that group and execute the library again in that
+#   context, so nested functions & nested '@nexgroup' calls are also built within the group nodetree.
+# - The caller script cache also keeps track of the libraries hashes, see 'get_libraries_signature()'.
+
+# TODO
+# - Orphan '.NexGroup.' nodegroups are only purged by blender on file reload. Perhaps purge them ourselves.
+# - Support packages? 'import nexlib.noise'.
+
+import bpy
+
+import ast
+import types
+import inspect
+import hashlib
+import builtins
+import functools
+from mathutils import Vector, Matrix, Quaternion, Color
+
+from ..nex.nextypes import NexFactory, NexError
+from ..nex.nextransform import transform_nex_script
+from ..nex.nodesetter import get_unique_name, NODE_XOFF, NODE_YOFF
+from ..utils.node_utils import (
+    TREE_TO_GROUP_EQUIV,
+    create_new_nodegroup,
+    create_ng_socket,
+    link_sockets,
+)
+from ..utils.spatial_utils import NodesBoundsTable
+
+NEXGROUP_PREFIX = ".NexGroup."
+BAKEABLE_TYPES = (int, float, bool, str, type(None), tuple, Vector, Matrix, Quaternion, Color,)
+
+_COMPILED_LIBRARIES = {} #(content hash, text name) -> code object
+_COMPILED_LIBRARIES_MAX = 64
+_GROUPS_IN_CONSTRUCTION = set()
+
+
+def hash_source(source:str) -> str:
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+def get_library_text(name:str):
+    """get the text datablock corresponding to the given module name, if any"""
+
+    if ('.' in name):
+        return None
+    for textname in (name, f"{name}.py"):
+        text = bpy.data.texts.get(textname)
+        if (text is not None):
+            return text
+    return None
+
+@functools.lru_cache(maxsize=64)
+def _find_imports(source:str) -> tuple:
+    """get the absolute modules names imported by the given source"""
+
+    if ('import' not in source):
+        return ()
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return ()
+
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and (node.level==0) and (node.module):
+            names.append(node.module)
+        continue
+
+    return tuple(dict.fromkeys(names))
+
+def get_libraries_signature(source:str, nextypes:list) -> str:
+    """get a signature of the content of all the libraries imported by the given script, recursively.
+    Used by the caller to know if it needs a rebuild when a library changed."""
+
+    hashes = {}
+    queue = list(_find_imports(source))
+    while (queue):
+        name = queue.pop()
+        if (name in hashes):
+            continue
+        text = get_library_text(name)
+        if (text is None):
+            continue
+        libsource = transform_nex_script(text.as_string(), nextypes)
+        hashes[name] = hash_source(libsource)
+        queue += _find_imports(libsource)
+        continue
+
+    return ''.join(f"\n#nexlib {k}:{v}" for k,v in sorted(hashes.items()))
+
+def compile_library(text, nextypes:list) -> tuple:
+    """transform & compile the given library text, return the code object and the content hash"""
+
+    source = transform_nex_script(text.as_string(), nextypes)
+    key = (hash_source(source), text.name)
+
+    code = _COMPILED_LIBRARIES.get(key)
+    if (code is None):
+        code = compile(source, text.name, 'exec')
+        _COMPILED_LIBRARIES[key] = code
+        if (len(_COMPILED_LIBRARIES) > _COMPILED_LIBRARIES_MAX):
+            del _COMPILED_LIBRARIES[next(iter(_COMPILED_LIBRARIES))]
+
+    return code, key[0]
+
+
+class NexImporter():
+    """Handle the 'import' statements of a Nex script execution, and the '@nexgroup' functions calls.
+    An importer is bound to the nodetree the library functions will build their nodes into."""
+
+    def __init__(self, node_tree, nextoys:dict, callhistory:list, include_types:bool=True,):
+        self.node_tree = node_tree
+        self.nextoys = nextoys
+        self.callhistory = callhistory
+        self.include_types = include_types #expose the Nex inputs/outputs types to the libraries?
+        self.modules = {}
+        self.loading = set()
+        self.builtins = dict(builtins.__dict__, __import__=self.import_module,)
+
+    def namespace(self, modulename:str='__main__', modulehash:str='',) -> dict:
+        """a namespace for the scripts executed within this importer"""
+
+        namespace = {'__name__':modulename, '__builtins__':self.builtins, '__nexhash__':modulehash,}
+        if (self.include_types or modulename=='__main__'):
+            namespace.update(self.nextoys['nexusertypes'])
+        namespace.update(self.nextoys['nexuserfunctions'])
+        if (modulename!='__main__'):
+            namespace['nexgroup'] = self.nexgroup
+        return namespace
+
+    def import_module(self, name, globals=None, locals=None, fromlist=(), level=0,):
+        """replacement of the builtin '__import__', resolve libraries text datablocks first"""
+
+        if (level==0):
+            text = get_library_text(name)
+            if (text is not None):
+                return self.load(name, text)
+
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    def load(self, name:str, text,):
+        """execute the library once for this importer, and return it as a module"""
+
+        module = self.modules.get(name)
+        if (module is not None):
+            return module
+
+        if (name in self.loading):
+            raise NexError(f"ImportError. Circular import of the Nex library '{name}'.")
+
+        code, modulehash = compile_library(text, self.nextoys['nexusertypes'].keys())
+
+        module = types.ModuleType(name)
+        module.__dict__.update(self.namespace(name, modulehash,))
+
+        self.loading.add(name)
+        try:
+            exec(code, module.__dict__)
+        finally:
+            self.loading.discard(name)
+
+        self.modules[name] = module
+        return module
+
+    def nexgroup(self, function):
+        """decorator, emit the function as a shared nodegroup instead of inlining its nodes"""
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return self.call_nexgroup(function, args, kwargs)
+
+        return wrapper
+
+    def call_nexgroup(self, function, args:tuple, kwargs:dict):
+        """instance the nodegroup of the given function in our nodetree, build the group if needed"""
+
+        fname = function.__name__
+        if ('<locals>' in function.__qualname__):
+            raise NexError(f"NexGroupError. '{fname}' A @nexgroup function must be defined at the library module level.")
+
+        try:
+            bound = inspect.signature(function).bind(*args, **kwargs)
+        except TypeError as e:
+            raise NexError(f"ArgumentError. Function {fname}() {e}.")
+        bound.apply_defaults()
+
+        # Nex arguments are the group inputs, python arguments are baked in the group
+        nexargs, pyargs = {}, {}
+        for k,v in bound.arguments.items():
+            if ('Nex' in type(v).__name__):
+                nexargs[k] = v
+            elif isinstance(v, BAKEABLE_TYPES):
+                if (type(v) is tuple and any(('Nex' in type(e).__name__) for e in v)):
+                    raise NexError(f"ArgumentError. Function {fname}() variable arguments of Nex types are not supported. '{k}'.")
+                pyargs[k] = v
+            else:
+                raise NexError(f"ArgumentError. Function {fname}() cannot pass '{type(v).__name__}' argument '{k}' to a @nexgroup function.")
+            continue
+
+        ng = self.node_tree
+        modulename = function.__globals__.get('__name__','')
+        signature = '|'.join((
+            ng.bl_idname,
+            modulename,
+            function.__qualname__,
+            function.__globals__.get('__nexhash__',''),
+            *(f"{k}:{v.nxstype}" for k,v in nexargs.items()),
+            *(f"{k}={v!r}" for k,v in pyargs.items()),
+            ))
+        groupname = f"{NEXGROUP_PREFIX}{fname[:32]}.{hash_source(signature)[:10]}"
+
+        group = bpy.data.node_groups.get(groupname)
+        if (group is None):
+            group = self.build_nexgroup(groupname, modulename, function.__qualname__, nexargs, pyargs,)
+
+        # Instance the group in our nodetree, stable name thanks to the call history
+        uniquename = get_unique_name(f"NexGroup.{fname}", self.callhistory)
+        node = ng.nodes.get(uniquename)
+        needs_linking = False
+
+        if (node is None):
+            last = ng.nodes.active
+            if (last):
+                  location = (last.location.x + last.width + NODE_XOFF, last.location.y - NODE_YOFF,)
+            else: location = (0,200,)
+
+            node = ng.nodes.new(TREE_TO_GROUP_EQUIV[ng.bl_idname])
+            node.location = location
+            node.name = node.label = uniquename
+            ng.nodes.active = node
+            needs_linking = True
+
+        if (node.node_tree!=group):
+            old = node.node_tree
+            node.node_tree = group
+            needs_linking = True
+            # baked arguments changed, the previous group might not be used anymore
+            if (old and old.users==0 and old.name.startswith(NEXGROUP_PREFIX)):
+                bpy.data.node_groups.remove(old)
+
+        if (needs_linking):
+            for i,v in enumerate(nexargs.values()):
+                link_sockets(v.nxsock, node.inputs[i])
+
+        AutoNexType = self.nextoys['nexautotype']
+        outputs = tuple(AutoNexType(s) for s in node.outputs if (s.type!='CUSTOM'))
+
+        match len(outputs):
+            case 0: return None
+            case 1: return outputs[0]
+            case _: return outputs
+
+    def build_nexgroup(self, groupname:str, modulename:str, qualname:str, nexargs:dict, pyargs:dict,):
+        """create a new nodegroup and build the function nodes in it"""
+
+        if (groupname in _GROUPS_IN_CONSTRUCTION):
+            raise NexError(f"NexGroupError. Recursive call of the @nexgroup function '{qualname}'.")
+
+        text = get_library_text(modulename)
+        if (text is None):
+            raise NexError(f"NexGroupError. Library '{modulename}' of the @nexgroup function '{qualname}' not found.")
+
+        group = create_new_nodegroup(groupname,
+            tree_type=self.node_tree.bl_idname,
+            in_sockets={k:v.nxstype for k,v in nexargs.items()},
+            )
+        in_nod, out_nod = group.nodes["Group Input"], group.nodes["Group Output"]
+        group.nodes.active = in_nod
+
+        _GROUPS_IN_CONSTRUCTION.add(groupname)
+        try:
+            # Execute the library again, this time with Nex toys bound to the group nodetree.
+            # NOTE the NexFactory only need a '.node_tree' from the node instance. Nex inputs/outputs types
+            # are not available within groups, the function arguments & returns are the group sockets.
+            toys = NexFactory(types.SimpleNamespace(node_tree=group), [], [], [],)
+            importer = NexImporter(group, toys, [], include_types=False,)
+            module = importer.load(modulename, text,)
+
+            function = module
+            for attr in qualname.split('.'):
+                function = getattr(function, attr)
+            function = getattr(function, '__wrapped__', function)
+
+            AutoNexType = toys['nexautotype']
+            groupargs = {k:AutoNexType(s) for k,s in zip(nexargs.keys(), in_nod.outputs)}
+            bound = inspect.BoundArguments(inspect.signature(function), {**groupargs, **pyargs},)
+            result = function(*bound.args, **bound.kwargs)
+
+            results = result if (type(result) in {tuple,list}) else (result,)
+            for i,r in enumerate(results):
+                if ('Nex' not in type(r).__name__):
+                    raise NexError(f"NexGroupError. The @nexgroup function '{qualname}' must return Nex socket types. Got '{type(r).__name__}'.")
+                sockname = 'Result' if (len(results)==1) else f'Result {i+1}'
+                outsock = create_ng_socket(group, in_out='OUTPUT', socket_type=r.nxstype, socket_name=sockname,)
+                link_sockets(r.nxsock, outsock)
+                continue
+
+        except BaseException:
+            bpy.data.node_groups.remove(group)
+            raise
+
+        finally:
+            _GROUPS_IN_CONSTRUCTION.discard(groupname)
+
+        bounds_table = NodesBoundsTable(group)
+        farest = bounds_table.farthest('BOTTOM_RIGHT')
+        if (bounds_table.names[farest]!=out_nod.name):
+            out_nod.location.x = bounds_table.locations[farest,0] + 250
+
+        return group
@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE ABOUT: source transformation of the user Nex scripts, before compilation.
+#  - The python type hinting notation is transformed into Nex type constructors:
+#      "VAR : TYPE = VALUE" → "VAR = TYPE('VAR', VALUE)"
+#      "VAR : TYPE"         → "VAR = TYPE('VAR', None)"
+#  - Comments are removed. (this way editing a comment doesn't count as a script modification).
+
+# NOTE CODE INFO:
+# - We locate the annotated assignments with the 'ast' module & the comments with the 'tokenize' module,
+#   then we splice the original text in place. This way the transformed script keeps the exact same
+#   line numbers as the user script, important for our error reporting. '#' in strings or ';' statements
+#   are naturally supported, as we are relying on the python parser itself.
+# - If the script can't be parsed, we return it untouched, the compilation will raise a proper SyntaxError.
+# - This module must stay bpy independent, run it directly for a benchmark: 'python nextransform.py'
+
+import io
+import ast
+import time
+import tokenize
+import functools
+
+
+def _char_col(line:str, byte_col:int) -> int:
+    """ast offsets are utf8 bytes offsets, we need characters offsets"""
+    if (line.isascii()):
+        return byte_col
+    return len(line.encode('utf-8')[:byte_col].decode('utf-8', errors='ignore'))
+
+def _iter_annassigns(body:list):
+    """yield all annotated assignments statements, recursively. Faster than 'ast.walk()', we only visit statements"""
+    for stmt in body:
+        if isinstance(stmt, ast.AnnAssign):
+            yield stmt
+            continue
+        for field in ('body','orelse','finalbody','handlers','cases'):
+            sub = getattr(stmt, field, None)
+            if (sub):
+                yield from _iter_annassigns(sub)
+        continue
+
+def _find_assign_op(lines:list, l:int, c:int) -> tuple:
+    """find the '=' position following the annotation end, only whitespaces or line continuations can be in between"""
+    while True:
+        line = lines[l]
+        while (c < len(line)):
+            if (line[c]=='='):
+                return l, c
+            c += 1
+        l, c = l+1, 0
+
+@functools.lru_cache(maxsize=64)
+def _transform(source:str, nextypes:tuple) -> str:
+    """see 'transform_nex_script()', cached by the source & nextypes hash"""
+
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return source
+
+    lines = source.splitlines(keepends=True)
+
+    # Gather all text edits, as (lineidx, start, end, replacement) with lines index starting at 0
+    edits = []
+
+    if ('#' in source):
+        try:
+            for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+                if (tok.type==tokenize.COMMENT):
+                    (l, c), (_, ce) = tok.start, tok.end
+                    edits.append((l-1, c, ce, ''))
+        except (tokenize.TokenError, SyntaxError):
+            return source
+
+    for node in _iter_annassigns(tree.body):
+        if not (isinstance(node.target, ast.Name) and isinstance(node.annotation, ast.Name)):
+            continue
+        typename = node.annotation.id
+        if (typename not in nextypes):
+            continue
+
+        varname = node.target.id
+        tl, tc = node.target.lineno-1, node.target.col_offset
+        tc = _char_col(lines[tl], tc)
+        al, ac = node.annotation.end_lineno-1, _char_col(lines[node.annotation.end_lineno-1], node.annotation.end_col_offset)
+
+        if (node.value is None):
+            edits.append((tl, tc, (al, ac), f"{varname} = {typename}('{varname}', None)"))
+            continue
+
+        # replace 'VAR : TYPE =' by 'VAR = TYPE('VAR', ' and close the parenthesis at the end of the statement.
+        # NOTE the value node position exclude its enclosing parenthesis, that's why we search for the '=' instead.
+        el, ec = node.end_lineno-1, _char_col(lines[node.end_lineno-1], node.end_col_offset)
+        eql, eqc = _find_assign_op(lines, al, ac)
+        edits.append((el, ec, ec, ")"))
+        edits.append((tl, tc, (eql, eqc+1), f"{varname} = {typename}('{varname}',"))
+        continue
+
+    if (not edits):
+        return ''.join(lines)
+
+    # Apply edits from the end of the text, so previous offsets stay valid.
+    # An edit may span over multiple lines (ex: 'a : infloat = \\' + newline + '5'), in that case we merge the
+    # remaining text into the first line, and leave blank lines behind, line numbers stay intact.
+    edits.sort(key=lambda e: (e[0], e[1]), reverse=True)
+    for l, start, end, text in edits:
+
+        el, ec = end if (type(end) is tuple) else (l, end)
+
+        lines[l] = lines[l][:start] + text + lines[el][ec:]
+        for i in range(l+1, el+1):
+            lines[i] = "\n"
+        continue
+
+    return ''.join(lines)
+
+def transform_nex_script(original_text:str, nextypes:list) -> str:
+    """
+    Transforms a Nex script:
+    - Remove comments
+    - Replace with custom Nex type declarations
+        "VAR : TYPE = RESTOFTHELINE" → "VAR = TYPE('VAR', RESTOFTHELINE)"
+        "VAR : TYPE"                 → "VAR = TYPE('VAR', None)"
+    """
+    return _transform(original_text, tuple(sorted(nextypes)))
+
+
+if (__name__=="__main__"):
+
+    import re
+
+    def legacy_transform_nex_script(original_text:str, nextypes:list) -> str:
+        """previous per-line regex implementation, for comparison"""
+        def replacer(match):
+            varname, typename, rest = match.group(1), match.group(2), match.group(3)
+            if (rest is None or rest.strip() == ''):
+                  return f"{varname} = {typename}('{varname}', None)"
+            else: return f"{varname} = {typename}('{varname}', {rest.strip()})"
+        pattern = re.compile(rf"\b(\w+)\s*:\s*({'|'.join(nextypes)})\s*(?:=\s*(.+))?")
+        return '\n'.join(pattern.sub(replacer, re.sub(r'#.*', '', line)) for line in original_text.splitlines())
+
+    NEXTYPES = ['inbool','inint','infloat','invec','incol','inquat','inmat','outbool','outint','outfloat','outvec','outcol','outquat','outmat','outauto',]
+
+    block = [
+        "a{i} : infloat = 1.0 # some comment",
+        "v{i} : invec",
+        "b{i} = (a{i} + 2) * 3 ; c{i} = '#not a comment'",
+        "if a{i}:",
+        "    d{i} : outfloat = (b{i} +",
+        "        a{i})",
+        ]
+    script = '\n'.join(line.format(i=i) for i in range(334) for line in block)
+    assert len(script.splitlines())>=2000
+
+    def bench(fct, repeat=20):
+        t = time.perf_counter()
+        for _ in range(repeat):
+            fct()
+        return (time.perf_counter()-t)/repeat*1000
+
+    result = transform_nex_script(script, NEXTYPES)
+    assert len(result.splitlines())==len(script.splitlines()), "line numbers are not preserved"
+    compile(result, 'bench', 'exec')
+
+    print(f"Nex transform benchmark on {len(script.splitlines())} lines:")
+    print(f"  legacy regex : {bench(lambda: legacy_transform_nex_script(script, NEXTYPES)):.2f}ms")
+    print(f"  ast (cold)   : {bench(lambda: (_transform.cache_clear(), transform_nex_script(script, NEXTYPES))):.2f}ms")
+    print(f"  ast (cached) : {bench(lambda: transform_nex_script(script, NEXTYPES)):.4f}ms")
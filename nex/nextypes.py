@@ -2308,4 +2308,7 @@ def NexFactory(NODEINSTANCE, ALLINPUTS=[], ALLOUTPUTS=[], CALLHISTORY=[],):
     nextoys['nexuserfunctions'] = {}
     nextoys['nexuserfunctions'].update(NexWrappedUserFcts)
 
+    # Internal, used by the Nex library modules to wrap the sockets of their shared nodegroups.
+    nextoys['nexautotype'] = AutoNexType
+
     return nextoys
\ No newline at end of file
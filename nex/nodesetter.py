@@ -57,6 +57,7 @@ from mathutils import Vector, Matrix, Quaternion, Color
 from ..nex.pytonode import py_to_Vec3, py_to_Mtx16, py_to_RGBA
 from ..utils.node_utils import link_sockets, frame_nodes, create_ng_constant_node
 from ..utils.fct_utils import is_annotation_compliant, alltypes, anytype, ColorRGBA
+from ..utils.prof_utils import profiled
 
 #shortcuts for socket types
 sAny = bpy.types.NodeSocket
@@ -207,6 +208,7 @@ def assert_purple_node(node):
 #  `Y8bood8P'   `Y8bod8P' o888o o888o `Y8bod8P' d888b    `Y888""8o o888o      o888o        `Y8bod8P'   "888" 8""888P' 
 
 
+@profiled('node_creation')
 def generalnewnode(ng, callhistory, 
     unique_tag:str,
     node_type:str,
@@ -248,6 +250,7 @@ def generalnewnode(ng, callhistory,
     
     return tuple(node.outputs)
 
+@profiled('node_creation')
 def generalreroute(ng, callhistory, socket,):
     """generic operation for adding a reroute."""
 
@@ -278,6 +281,7 @@ def generalreroute(ng, callhistory, socket,):
 
     return node.outputs[0]
 
+@profiled('node_creation')
 def generalfloatmath(ng, callhistory,
     operation_type:str,
     val1:sFlo|sInt|sBoo|float|int|None=None,
@@ -343,6 +347,7 @@ def generalfloatmath(ng, callhistory,
 
     return node.outputs[0]
 
+@profiled('node_creation')
 def generalvecmath(ng, callhistory,
     operation_type:str,
     val1:sFlo|sInt|sBoo|sVec|sVecXYZ|sVecT|float|int|bool|Vector|None=None,
@@ -406,6 +411,7 @@ def generalvecmath(ng, callhistory,
     return node.outputs[outidx]
 
 @user_domain('nexclassmethod')
+@profiled('node_creation')
 def generalcolormath(ng, callhistory, #TODO do generalcolormix instead, later for color functions..
     blend_type:str,
     colA:sFlo|sInt|sBoo|sVec|sVecXYZ|sVecT|sCol|float|int|bool|ColorRGBA|Vector,
@@ -468,6 +474,7 @@ def generalcolormath(ng, callhistory, #TODO do generalcolormix instead, later fo
 
     return node.outputs[2]
 
+@profiled('node_creation')
 def generalverotate(ng, callhistory,
     rotation_type:str,
     invert:bool,
@@ -531,6 +538,7 @@ def generalverotate(ng, callhistory,
 
     return node.outputs[0]
 
+@profiled('node_creation')
 def generalmix(ng, callhistory,
     data_type:str,
     factor:sFlo|sInt|sBoo|sVec|sVecXYZ|sVecT|float|int|Vector|None=None,
@@ -619,6 +627,7 @@ def generalmix(ng, callhistory,
 
     return node.outputs[outidx]
 
+@profiled('node_creation')
 def generalentryfloatmath(ng, callhistory,
     sepa_data_type:str,
     operation_type:str,
@@ -644,6 +653,7 @@ def generalentryfloatmath(ng, callhistory,
 
     return r
 
+@profiled('node_creation')
 def generalparrallelvecfloatmath(ng, callhistory,
     operation_type:str,
     vA:sFlo|sInt|sBoo|sVec|sVecXYZ|sVecT|float|int|Vector,
@@ -684,6 +694,7 @@ def generalparrallelvecfloatmath(ng, callhistory,
 
     return rvec
 
+@profiled('node_creation')
 def generalmaprange(ng, callhistory,
     data_type:str,
     interpolation_type:str,
@@ -765,6 +776,7 @@ def generalmaprange(ng, callhistory,
 
     return node.outputs[outidx]
 
+@profiled('node_creation')
 def generalminmax(ng, callhistory,
     operation_type:str,
     *floats:sFlo|sInt|sBoo|float|int,
@@ -788,6 +800,7 @@ def generalminmax(ng, callhistory,
     frame_nodes(ng, *to_frame, label='Batch MinMax',)
     return new
 
+@profiled('node_creation')
 def generalcompare(ng, callhistory,
     data_type:str,
     operation:str,
@@ -858,6 +871,7 @@ def generalcompare(ng, callhistory,
 
     return node.outputs[0]
 
+@profiled('node_creation')
 def generalboolmath(ng, callhistory,
     operation:str,
     val1:sFlo|sInt|sBoo|sVec|sVecXYZ|sVecT|sCol|bool,
@@ -904,6 +918,7 @@ def generalboolmath(ng, callhistory,
 
     return node.outputs[0]
 
+@profiled('node_creation')
 def generalbatchcompare(ng, callhistory,
     operation_type:str,
     epsilon:sFlo|sInt|sBoo|float|int,
@@ -965,6 +980,7 @@ def generalbatchcompare(ng, callhistory,
     frame_nodes(ng, *to_frame, label="Batch Compare",)
     return final
 
+@profiled('node_creation')
 def generalmatrixmath(ng, callhistory,
     operation_type:str,
     vec1:sFlo|sInt|sBoo|sVec|sVecXYZ|sVecT|float|int|bool|Vector|None=None,
@@ -1033,6 +1049,7 @@ def generalmatrixmath(ng, callhistory,
 
     return node.outputs[outidx]
 
+@profiled('node_creation')
 def generalcombsepa(ng, callhistory,
     operation_type:str,
     data_type:str, 
@@ -1183,6 +1200,7 @@ def generalcombsepa(ng, callhistory,
 
             return node.outputs[0]
 
+@profiled('node_creation')
 def generalswitch(ng, callhistory,
     Type:str,
     idx:sFlo|sInt|sBoo|float|int|bool,
@@ -1286,6 +1304,7 @@ def generalswitch(ng, callhistory,
 
     return node.outputs[0]
 
+@profiled('node_creation')
 def generalrandom(ng, callhistory,
     data_type:str,
     valmin:sFlo|sInt|sBoo|sVec|sVecXYZ|sVecT|float|int|Vector|None=None,
@@ -6,8 +6,9 @@
 import bpy
 
 from .drawroute import NODEBOOSTER_OT_draw_route
-from .bake import NODEBOOSTER_OT_bake_customnode
+from .bake import NODEBOOSTER_OT_bake_customnode, NODEBOOSTER_OT_bake_playback
 from .purge import NODEBOOSTER_OT_node_purge_unused
+from .search import NODEBOOSTER_OT_search_goto
 from .favorites import (
     NODEBOOSTER_OT_favorite_add,
     NODEBOOSTER_OT_favorite_teleport,
@@ -23,12 +24,15 @@ from .palette import (
     )
 from .codetemplates import NODEBOOSTER_OT_text_templates
 from .vecexpr_nav import NODEBOOSTER_OT_vec_expr_nav
+from .instrumentation import NODEBOOSTER_OT_instrumentation_export, NODEBOOSTER_OT_instrumentation_clear
 from ..gpudraw.minimap import NODEBOOSTER_OT_MinimapInteraction
 
 classes = (
     NODEBOOSTER_OT_draw_route,
     NODEBOOSTER_OT_bake_customnode,
+    NODEBOOSTER_OT_bake_playback,
     NODEBOOSTER_OT_node_purge_unused,
+    NODEBOOSTER_OT_search_goto,
     NODEBOOSTER_OT_favorite_add,
     NODEBOOSTER_OT_favorite_teleport,
     NODEBOOSTER_OT_favorite_remove,
@@ -40,6 +44,8 @@ classes = (
     NODEBOOSTER_OT_initalize_palette,
     NODEBOOSTER_OT_text_templates,
     NODEBOOSTER_OT_vec_expr_nav,
+    NODEBOOSTER_OT_instrumentation_export,
+    NODEBOOSTER_OT_instrumentation_clear,
     NODEBOOSTER_OT_MinimapInteraction,
     )
 
@@ -5,7 +5,88 @@
 
 import bpy
 
-from ..utils.node_utils import replace_node_by_ng
+from ..utils.node_utils import replace_node_by_ng, get_booster_nodes, clear_ng_defvalues_shadow
+from ..customnodes import allcustomnodes
+
+
+# NOTE about the batch conversion:
+#  - Nodes offering a 'get_bake_signature()' can be converted to plain nodegroups in bulk: the selected nodes, the
+#    nodes of the active nodetree, or all of them in the file. Once converted, the file no longer needs our python.
+#  - Nodes with identical signatures (same expression, same script) have identical nodetrees, they share a single
+#    baked nodegroup instead of a copy each. Their inputs values are kept on the group nodes.
+
+def convert_node_to_group(node_tree, node, node_group):
+    """replace the booster node by a group node using the given nodegroup, labeled by its expression/script"""
+
+    name = None
+    if hasattr(node,"user_mathexp"):
+        name = str(node.user_mathexp)
+    if hasattr(node,"user_textdata"):
+        if (node.user_textdata):
+            name = node.user_textdata.name
+
+    new_node = replace_node_by_ng(node_tree, node, node_group,)
+    if (new_node is None):
+        return None
+
+    if (name):
+        new_node.label = name
+
+    return new_node
+
+def get_convertible_nodes(context, scope:str='SELECTED',) -> list:
+    """get the (nodetree, node name) of the booster nodes convertible to groups, in the given scope"""
+
+    match scope:
+        case 'SELECTED':
+            ng = context.space_data.edit_tree
+            nodes = [n for n in ng.nodes if n.select]
+        case 'TREE':
+            ng = context.space_data.edit_tree
+            nodes = list(ng.nodes)
+        case 'FILE':
+            nodes = get_booster_nodes()
+
+    nodes = [n for n in nodes if hasattr(n,'get_bake_signature') and (n.node_tree is not None)]
+    nodes.sort(key=lambda n: (n.id_data.name, n.name))
+
+    return [(n.id_data, n.name) for n in nodes]
+
+def convert_nodes_to_groups(nodes:list) -> tuple:
+    """convert the given (nodetree, node name) to groups, sharing a nodegroup between identical nodes.
+    return the number of converted nodes & the created nodegroups"""
+
+    baked = {} #(node idname, tree type, signature) -> baked nodegroup
+    created, count = [], 0
+
+    for node_tree, node_name in nodes:
+        node = node_tree.nodes.get(node_name)
+        if (node is None):
+            continue
+
+        signature = node.get_bake_signature()
+        key = None if (signature is None) else (node.bl_idname, node.node_tree.bl_idname, signature)
+
+        node_group = baked.get(key) if (key is not None) else None
+        if (node_group is None):
+            node_group = node.node_tree.copy()
+            node_group.name = f'{node.node_tree.name}.Baked'
+            created.append(node_group)
+            if (key is not None):
+                baked[key] = node_group
+
+        if (convert_node_to_group(node_tree, node, node_group) is None):
+            continue
+        count += 1
+        continue
+
+    #nodetrees not supported by 'replace_node_by_ng()', our copy is not used
+    for node_group in created.copy():
+        if (node_group.users==0):
+            created.remove(node_group)
+            bpy.data.node_groups.remove(node_group)
+
+    return count, created
 
 
 class NODEBOOSTER_OT_bake_customnode(bpy.types.Operator):
@@ -17,6 +98,14 @@ class NODEBOOSTER_OT_bake_customnode(bpy.types.Operator):
 
     nodegroup_name: bpy.props.StringProperty()
     node_name: bpy.props.StringProperty()
+    scope: bpy.props.EnumProperty(
+        default='NODE',
+        items=(('NODE',"Node","Convert the given node",),
+               ('SELECTED',"Selected","Convert the selected booster nodes",),
+               ('TREE',"NodeTree","Convert all booster nodes of the active nodetree",),
+               ('FILE',"File","Convert all booster nodes of the file",),),
+        options={'SKIP_SAVE'},
+        )
 
     @classmethod
     def poll(cls, context):
@@ -27,6 +116,16 @@ class NODEBOOSTER_OT_bake_customnode(bpy.types.Operator):
         space = context.space_data
         node_tree = space.edit_tree
 
+        if (self.scope!='NODE'):
+            nodes = get_convertible_nodes(context, scope=self.scope)
+            if (not nodes):
+                self.report({'WARNING'}, "No booster nodes to convert")
+                return {'CANCELLED'}
+
+            count, created = convert_nodes_to_groups(nodes)
+            self.report({'INFO'}, f"Converted {count} node(s) using {len(created)} node group(s)")
+            return {'FINISHED'}
+
         old_node = node_tree.nodes.get(self.node_name)
         if (old_node is None):
             self.report({'ERROR'}, "Node with given name not found")
@@ -37,24 +136,137 @@ class NODEBOOSTER_OT_bake_customnode(bpy.types.Operator):
             self.report({'ERROR'}, "Node group with given name not found")
             return {'CANCELLED'}
 
-        name = None
-        if hasattr(old_node,"user_mathexp"):
-            name = str(old_node.user_mathexp)
-        if hasattr(old_node,"user_textdata"):
-            if (old_node.user_textdata):
-                name = old_node.user_textdata.name
-        
         node_group = node_group.copy()
         node_group.name = f'{node_group.name}.Baked'
 
-        new_node = replace_node_by_ng(node_tree, old_node, node_group,)
+        new_node = convert_node_to_group(node_tree, old_node, node_group,)
         if (new_node is None):
             self.report({'ERROR'}, "Current NodeTree type not supported")
             return {'FINISHED'}
 
-        if (name):
-            new_node.label = name
+        self.report({'INFO'}, f"Replaced node '{self.node_name}' with node group '{node_group.name}'")
+
+        return {'FINISHED'}
+
+
+# NOTE about the playback bake:
+#  During playback, the 'FRAME_PRE' handler runs python for every info node, on every frame.
+#  Instead, we can evaluate these nodes once across the frame range, and store their outputs values as keyframes
+#  on their nodegroups. While baked, their automatic updates are disabled, see 'get_unbaked_classes()' in handlers.
+#  - Only numeric sockets can be keyframed. Object or string outputs keep their last evaluated value.
+#  - The nodegroups of these nodes are unique per node instance, and only animated by this bake.
+
+BAKEABLE_CLASSES = [cls for cls in allcustomnodes if ('PLAYBACK_BAKEABLE' in cls.auto_upd_flags)]
+
+def keyframe_output_values(node, frame:int) -> None:
+    """insert keyframes for the current values of the node nodegroup outputs"""
+
+    ng = node.node_tree
+    for i,socket in enumerate(ng.nodes["Group Output"].inputs):
+
+        match socket.type:
+            case 'VALUE' | 'INT' | 'BOOLEAN' | 'VECTOR' | 'RGBA':
+                socket.keyframe_insert('default_value', frame=frame, group="NodeBooster Bake", options={'INSERTKEY_NEEDED'},)
+            case 'ROTATION' | 'MATRIX':
+                #these values are stored on a special node, see 'set_ng_socket_defvalue()'
+                defnod = ng.nodes.get(f"D|Quat|outputs[{i}]") or ng.nodes.get(f"D|Matrix|outputs[{i}]")
+                if (defnod is not None):
+                    for inp in defnod.inputs:
+                        inp.keyframe_insert('default_value', frame=frame, group="NodeBooster Bake", options={'INSERTKEY_NEEDED'},)
+        continue
+
+    return None
+
+def clear_playback_bake(scene) -> None:
+    """remove the baked keyframes & restore the automatic updates"""
+
+    for n in get_booster_nodes(by_idnames={cls.bl_idname for cls in BAKEABLE_CLASSES}):
+        if (n.node_tree and n.node_tree.animation_data):
+            n.node_tree.animation_data_clear()
+        clear_ng_defvalues_shadow(n.node_tree)
+
+    scene.nodebooster.playback_baked = False
+    return None
+
+
+def bake_playback(scene, frame_start:int=None, frame_end:int=None,) -> int:
+    """bake the info nodes values over the given frame range, the scene range by default. Return the number of baked nodes"""
+
+    if (frame_start is None):
+        frame_start = scene.frame_start
+    if (frame_end is None):
+        frame_end = scene.frame_end
+
+    #always start from a clean state
+    clear_playback_bake(scene)
+
+    nodes = get_booster_nodes(by_idnames={cls.bl_idname for cls in BAKEABLE_CLASSES})
+    nodes = [n for n in nodes if (n.node_tree is not None)]
+    if (not nodes):
+        return 0
+
+    frame_orig = scene.frame_current
+
+    #the handlers will ignore our nodes while we evaluate them ourselves
+    scene.nodebooster.playback_baked = True
+
+    try:
+        for frame in range(frame_start, frame_end+1):
+            scene.frame_set(frame)
+
+            for n in nodes:
+                clear_ng_defvalues_shadow(n.node_tree)
+            for cls in BAKEABLE_CLASSES:
+                cls.update_all(using_nodes=nodes)
+            for n in nodes:
+                keyframe_output_values(n, frame)
+
+            continue
+
+    except Exception:
+        clear_playback_bake(scene)
+        raise
+
+    finally:
+        scene.frame_set(frame_orig)
+
+    return len(nodes)
+
+
+class NODEBOOSTER_OT_bake_playback(bpy.types.Operator):
+    """Evaluate the info nodes across the frame range and store their values as keyframes, for a faster playback"""
+
+    bl_idname = "nodebooster.bake_playback"
+    bl_label = "Bake for Playback"
+    bl_description = "Evaluate the info nodes across the scene frame range and store their outputs values as keyframes. While baked, their automatic updates are disabled, and the playback no longer needs to execute python for them"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    clear : bpy.props.BoolProperty(
+        default=False,
+        description="Remove the baked keyframes and restore the automatic updates",
+        )
+
+    def execute(self, context):
+
+        scene = context.scene
+
+        if (self.clear):
+            clear_playback_bake(scene)
+            for cls in BAKEABLE_CLASSES:
+                cls.update_all()
+            self.report({'INFO'}, "Cleared the playback bake")
+            return {'FINISHED'}
+
+        try:
+            count = bake_playback(scene)
+        except Exception as e:
+            self.report({'ERROR'}, f"Playback bake failed: {e}")
+            return {'CANCELLED'}
+
+        if (not count):
+            self.report({'WARNING'}, "No info nodes to bake")
+            return {'CANCELLED'}
 
-        self.report({'INFO'}, f"Replaced node '{self.node_name}' with node group '{self.node_name}'")
+        self.report({'INFO'}, f"Baked {count} node(s) over {scene.frame_end-scene.frame_start+1} frames")
 
         return {'FINISHED'}
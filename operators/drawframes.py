@@ -11,7 +11,7 @@ import bpy
 
 from datetime import datetime
 
-from ..utils.node_utils import get_node_absolute_location
+from ..utils.spatial_utils import get_spatial_index
 from ..utils.draw_utils import ensure_mouse_cursor
 
 
@@ -23,16 +23,13 @@ def get_nodes_in_frame_box(frame, nodes, frame_support=True,):
     bounds_top = frame.location.y
     bounds_bottom = frame.location.y - frame.dimensions.y
 
-    for n in nodes:
-        if ((n==frame) or (n.parent==frame)):
+    #frames are not part of the spatial index
+    index = get_spatial_index(nodes.id_data)
+    for i in index.query_box(bounds_left, bounds_bottom, bounds_right, bounds_top, mode='LOCATION'):
+        n = nodes[i]
+        if (n.parent==frame):
             continue
-        if (n.type=="FRAME"):
-            continue
-
-        x, y = get_node_absolute_location(n)
-        if (bounds_left <= x <= bounds_right) and \
-           (bounds_top >= y >= bounds_bottom):
-            yield n
+        yield n
 
 
 class NODEBOOSTER_OT_draw_frame(bpy.types.Operator):
@@ -14,6 +14,7 @@ from mathutils import Vector
 
 from ..utils.node_utils import get_nearest_node_at_position, create_ng_socket, get_ng_socket_from_socketui
 from ..utils.draw_utils import ensure_mouse_cursor
+from ..utils.graph_utils import get_tree_graph, tag_tree_topology_dirty
 
 
 def get_next_itm_after_active(itter, active=None, step=1):
@@ -26,27 +27,15 @@ def get_next_itm_after_active(itter, active=None, step=1):
 
 def get_linkchain_finalsocket_type(link):
     """Given a link object with, returns the final socket type after following any reroute chain."""
-    
-    if (link.to_socket.node.type=='REROUTE'):
 
-        while True:
-            
-            nd = link.to_socket.node
-            if (nd.type!='REROUTE'):
-                break
-            if (not nd.outputs): #necessary?
-                break
-            if (not nd.outputs[0].links):
-                break
-            
-            # Assign next link
-            # NOTE in that context, the draw_route operator cannot create branched path
-            # so we only have a single link possibility, using [0] will work
-            link = nd.outputs[0].links[0]
-            
-            continue
-        
-    return link.to_socket.type
+    # NOTE in that context, the draw_route operator cannot create branched path
+    # so we only have a single link possibility, following the first link will work
+    graph = get_tree_graph(link.id_data)
+    si = graph.socket_id(link.to_socket)
+    if (si is None):
+        return link.to_socket.type
+
+    return graph.socket_types[graph.follow_reroutes(si)]
 
 class NODEBOOSTER_OT_draw_route(bpy.types.Operator):
 
@@ -463,6 +452,9 @@ class NODEBOOSTER_OT_draw_route(bpy.types.Operator):
 
     def confirm(self, context):
 
+        # our modal relinked sockets many times, the tree snapshot can't be trusted.
+        tag_tree_topology_dirty(self.node_tree)
+
         # TODO: The lines below seems to make blender debug build. 
         # Unsure why? perhaps debug mode is too picky.
 
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+
+import bpy
+
+from ..utils.prof_utils import write_instrumentation, clear_instrumentation, get_instrumentation_stats
+
+
+class NODEBOOSTER_OT_instrumentation_export(bpy.types.Operator):
+    """Export the handlers & nodes instrumentation records"""
+
+    bl_idname = "nodebooster.instrumentation_export"
+    bl_label = "Export Instrumentation"
+    bl_description = "Export the handlers & nodes instrumentation records, either as a JSON stats summary, or as a Chrome-Trace json file readable in 'chrome://tracing' or 'ui.perfetto.dev'"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    format : bpy.props.EnumProperty(
+        items=(("JSON","JSON","Stats summary, per handler and per node class"),
+               ("CHROME","Chrome-Trace","Every recorded measure on a timeline"),),
+        default="JSON",
+        )
+    filepath : bpy.props.StringProperty(subtype='FILE_PATH',)
+    filter_glob : bpy.props.StringProperty(default="*.json", options={'HIDDEN'},)
+
+    def invoke(self, context, event):
+        if (not self.filepath):
+            self.filepath = "NodeBoosterInstrumentation.json" if (self.format=='JSON') else "NodeBoosterTrace.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+
+        if (not get_instrumentation_stats()):
+            self.report({'ERROR'}, "Nothing recorded yet")
+            return {'CANCELLED'}
+
+        filepath = write_instrumentation(bpy.path.abspath(self.filepath), format=self.format,)
+        self.report({'INFO'}, f"Exported instrumentation to '{filepath}'")
+
+        return {'FINISHED'}
+
+
+class NODEBOOSTER_OT_instrumentation_clear(bpy.types.Operator):
+    """Clear the handlers & nodes instrumentation records"""
+
+    bl_idname = "nodebooster.instrumentation_clear"
+    bl_label = "Clear Instrumentation"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    def execute(self, context):
+
+        clear_instrumentation()
+
+        return {'FINISHED'}
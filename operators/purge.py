@@ -5,35 +5,84 @@
 
 import bpy 
 
+import time
+from collections import deque
 
-def is_node_used(node):
-    """check if node is reaching output"""
-            
-    found_output = False
-    
-    def recur_node(n):
-
-        #reached destination? 
-        if (n.type == "GROUP_OUTPUT"):
-            nonlocal found_output
-            found_output = True
-            return 
-
-        #else continue parcour
-        for out in n.outputs:
-            for link in out.links:
-                recur_node(link.to_node)
-
-        return None 
-        
-    recur_node(node)
+from ..utils.graph_utils import get_tree_graph
+from ..utils.node_utils import get_booster_nodes
+from ..nex.nexlibrary import NEXGROUP_PREFIX
+
+
+# NOTE a node is used if its data reaches an output node. Instead of exploring downstream from each node, we do a
+#  single reverse reachability pass from the output nodes, each socket is visited once. Muted links don't carry data,
+#  and muted nodes only pass data through their internal links.
+
+# NOTE the file-wide purge skips the nodetrees of our booster nodes, they are generated & managed by the nodes.
+#  The storage frames of our expressions & scripts are never linked, but are always kept: once a node is converted
+#  to a group, they are the only copy of its expression or script.
+
+STORAGE_FRAMES = {"EquationStorage", "ScriptStorage",}
+BOOSTER_TREE_PREFIXES = (".NodeBooster", NEXGROUP_PREFIX,)
+
+OUTPUT_NODE_TYPES = {
+    'GeometryNodeTree': {'GROUP_OUTPUT', 'VIEWER',},
+    'ShaderNodeTree': {'GROUP_OUTPUT', 'OUTPUT_MATERIAL', 'OUTPUT_WORLD', 'OUTPUT_LIGHT', 'OUTPUT_AOV', 'OUTPUT_LINESTYLE',},
+    'CompositorNodeTree': {'GROUP_OUTPUT', 'COMPOSITE', 'VIEWER', 'OUTPUT_FILE', 'SPLITVIEWER',},
+    }
+
+def get_used_nodes(node_tree, graph=None) -> set:
+    """get the indices of the snapshot nodes reaching an output node, in one reverse pass"""
+
+    if (graph is None):
+        graph = get_tree_graph(node_tree)
+
+    output_types = OUTPUT_NODE_TYPES.get(type(node_tree).__name__, {'GROUP_OUTPUT',})
+    outputs = [ni for ni,t in enumerate(graph.node_types) if (t in output_types)]
+
+    used = set(outputs)
+    visited = set()
+    queue = deque(si for ni in outputs for si in graph.node_inputs[ni])
+
+    while queue:
+        si = queue.popleft()
+        if (si in visited):
+            continue
+        visited.add(si)
 
-    return found_output
+        for li in graph.directed_links(si, 'LEFT'):
+            if (graph.link_muted[li]):
+                continue
+            src = graph.link_from[li]
+            if (src is None):
+                continue
+            ni = graph.socket_node[src]
+            used.add(ni)
+
+            if (graph.node_muted[ni]):
+                through = graph.internal_links.get(src)
+                if (through is not None):
+                    queue.append(through)
+                continue
+
+            queue.extend(graph.node_inputs[ni])
+            continue
+
+    return used
+
+def is_node_used(node, used:set, graph):
+    """check if node is reaching output. 'used' is the result of 'get_used_nodes()' for this graph,
+    computed once for all the nodes of the tree"""
+
+    return graph.node_index.get(node.name) in used
 
 
 def purge_unused_nodes(node_group, delete_muted=True, delete_reroute=True, delete_frame=True):
     """delete all unused nodes, using 'ops.node.delete_reconnect' operator"""
-        
+
+    #removing unused nodes doesn't change the reachability of the others, one fresh snapshot is enough.
+    graph = get_tree_graph(node_group, refresh=True)
+    used = get_used_nodes(node_group, graph=graph)
+
     for n in list(node_group.nodes):
         
         #deselct all
@@ -54,7 +103,7 @@ def purge_unused_nodes(node_group, delete_muted=True, delete_reroute=True, delet
             continue 
         
         #delete if unconnected
-        if not is_node_used(n):
+        if (not is_node_used(n, used, graph)) and (n.name not in STORAGE_FRAMES):
             node_group.nodes.remove(n)
             
         continue 
@@ -65,6 +114,82 @@ def purge_unused_nodes(node_group, delete_muted=True, delete_reroute=True, delet
     return None 
 
 
+def get_node_groups_topological_order() -> list:
+    """get all local nodegroups, ordered so that a nodegroup always comes before the nodegroups it uses"""
+
+    children = {}
+    indegree = {ng.session_uid:0 for ng in bpy.data.node_groups}
+    groups = {ng.session_uid:ng for ng in bpy.data.node_groups}
+
+    for ng in groups.values():
+        used = {n.node_tree.session_uid for n in ng.nodes if getattr(n, 'node_tree', None)}
+        used.discard(ng.session_uid)
+        children[ng.session_uid] = used
+        for uid in used:
+            indegree[uid] += 1
+
+    queue = deque(uid for uid,d in indegree.items() if (d==0))
+    order = []
+    while queue:
+        uid = queue.popleft()
+        order.append(groups[uid])
+        for child in children[uid]:
+            indegree[child] -= 1
+            if (indegree[child]==0):
+                queue.append(child)
+
+    #nodegroups recursion is not allowed by blender, but just in case, we don't forget any group.
+    if (len(order)!=len(groups)):
+        ordered = {ng.session_uid for ng in order}
+        order += [ng for uid,ng in groups.items() if (uid not in ordered)]
+
+    return order
+
+
+def purge_file_unused_nodes(delete_frame=True) -> tuple:
+    """purge the unused nodes of every nodegroup of the file, then remove the nodegroups that became unused.
+    Muted nodes and reroutes are not dissolved, it requires an editor context for each nodetree.
+    Return the number of nodes & nodegroups removed, and the time taken."""
+
+    t = time.perf_counter()
+    removed_nodes = removed_groups = 0
+
+    #the nodetrees of our booster nodes are theirs to manage
+    booster_trees = {n.node_tree.session_uid for n in get_booster_nodes() if (getattr(n, 'node_tree', None) is not None)}
+    order = [ng for ng in get_node_groups_topological_order() if (not ng.library)]
+    had_users = {ng.session_uid for ng in order if (ng.users)}
+
+    #parents first, removing a group node of a parent might make a nodegroup unused, and so on.
+    for ng in order:
+
+        if (ng.session_uid in booster_trees) or (ng.name.startswith(BOOSTER_TREE_PREFIXES)):
+            continue
+
+        graph = get_tree_graph(ng, refresh=True)
+        used = get_used_nodes(ng, graph=graph)
+
+        #no output node? ex: a nodegroup under construction, we don't want to empty it.
+        if (not used):
+            continue
+
+        for n in list(ng.nodes):
+            if (delete_frame==False and n.type=="FRAME") or (n.name in STORAGE_FRAMES):
+                continue
+            if (not is_node_used(n, used, graph)):
+                ng.nodes.remove(n)
+                removed_nodes += 1
+            continue
+
+    #only remove the nodegroups we made unused, not the ones the user keeps around.
+    for ng in order:
+        if (ng.session_uid in had_users) and (ng.users==0) and (not ng.use_fake_user) and (not ng.asset_data):
+            bpy.data.node_groups.remove(ng)
+            removed_groups += 1
+        continue
+
+    return removed_nodes, removed_groups, time.perf_counter()-t
+
+
 def re_arrange_nodes(node_group, Xmultiplier=1):
     """re-arrange node by sorting them in X location, (could improve)"""
 
@@ -85,6 +210,12 @@ class NODEBOOSTER_OT_node_purge_unused(bpy.types.Operator):
     bl_description = ""
     bl_options     = {'REGISTER','UNDO',}
 
+    scope : bpy.props.EnumProperty(
+        name="Scope",
+        default='TREE',
+        items=(('TREE', "Active Tree", "Purge the nodetree you are editing",),
+               ('FILE', "Whole File", "Purge every nodegroup of the file, then remove the nodegroups that became unused",),),
+        )
     delete_frame : bpy.props.BoolProperty(
         default=True,
         name="Remove Frame(s)",
@@ -112,6 +243,12 @@ class NODEBOOSTER_OT_node_purge_unused(bpy.types.Operator):
         return (context.space_data.type=='NODE_EDITOR') and (context.space_data.node_tree is not None)
 
     def execute(self, context):
+
+        if (self.scope=='FILE'):
+            nodes_count, groups_count, duration = purge_file_unused_nodes(delete_frame=self.delete_frame)
+            self.report({'INFO'}, f"Purged {nodes_count} node(s) and {groups_count} nodegroup(s) in {duration:.2f}s")
+            return {'FINISHED'}
+
         node_group = context.space_data.node_tree
 
         purge_unused_nodes(
@@ -131,7 +268,13 @@ class NODEBOOSTER_OT_node_purge_unused(bpy.types.Operator):
 
     def draw(self, context):
         layout = self.layout 
-        
+
+        layout.row().prop(self, "scope", expand=True)
+
+        if (self.scope=='FILE'):
+            layout.prop(self, "delete_frame")
+            return None
+
         layout.prop(self, "delete_muted")
         layout.prop(self, "delete_reroute")
         layout.prop(self, "delete_frame")
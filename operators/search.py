@@ -5,97 +5,279 @@
 
 import bpy
 
+import json
+from bisect import bisect_left
+from collections import deque
+from difflib import get_close_matches
+
+from ..utils.graph_utils import get_tree_graph, get_tree_revision
+
 
 #NOTE this functinality is implemented on an property update level
 
+#NOTE about the search index:
+# - rebuilding the terms of every node on every keystroke is slow on large trees. Instead each nodetree gets an
+#   inverted index of {field: {token: node indices}}, built lazily, and kept until the revision of the tree changes,
+#   see 'graph_utils.get_tree_revision()', or until a node is renamed or relabeled. The revision doesn't see these
+#   edits, so the names & labels are compared on each access, a cheap pass compared to a rebuild.
+#   A keystroke only scans the tokens vocabulary of the enabled fields.
+# - the vocabulary is kept sorted, prefix matching is a bisect. Fuzzy matching uses difflib on the vocabulary.
+# - recursive search goes through the nodegroups of the nodetree, each distinct nodegroup is searched once, found
+#   through the first group node path leading to it. Results are stored in 'scene.nodebooster.search_results'.
+
 #TODO Requires rework
-# - would be nice to add a recursive search feature in there
 # - perhaps better to use a search operator instead of using a prop update
-# - perhaps it would be nicer to confirm if user want to select (or enter a subgroup)
-#    right now we directly select everything after search, perhaps 1) search, then display 
-#    the found match on the ui, then 2) propose operators to select, recenter view, and enter nodetrees?
 # - instead of simple boolean for types, we should have enum with type match..
 # - add a case for matching nodetree names
-# - add a recursive toggle option
 
 
-def search_upd(self, context):
-    """search in context nodetree for nodes"""
+_SEARCH_INDEXES = {} #nodetree session_uid -> NodeSearchIndex
 
-    ng = context.space_data.edit_tree
+SEARCH_FIELDS = ('labels', 'types', 'names', 'socket_names', 'socket_types',)
 
-    keywords = self.search_keywords.lower().replace(","," ").split(" ")
-    keywords = set(keywords)
 
-    def is_matching(keywords,terms):
-        matches = []
-        for k in keywords:
-            for t in terms:
-                matches.append(k in t)
-        return any(matches) 
+def clear_search_indexes() -> None:
+    """forget all indexes, ex: on file load"""
+    _SEARCH_INDEXES.clear()
+    return None
 
-    found = []
-    for n in ng.nodes:
-        terms = []
+def get_nodes_naming(node_tree) -> int:
+    """hash of the names & labels of the nodes, they can change without changing the tree revision"""
+    return hash(tuple((n.name, n.label) for n in node_tree.nodes))
+
+def get_search_index(node_tree):
+    """get the up to date search index of this nodetree"""
+
+    index = _SEARCH_INDEXES.get(node_tree.session_uid)
+    if (index is None) or (index.revision!=get_tree_revision(node_tree)) or (index.naming!=get_nodes_naming(node_tree)):
+        index = _SEARCH_INDEXES[node_tree.session_uid] = NodeSearchIndex(node_tree)
+
+    return index
+
+
+class NodeSearchIndex():
+    """inverted index of the search terms of the nodes of a nodetree"""
+
+    __slots__ = ('revision', 'naming', 'node_names', 'node_is_frame', 'node_has_inputs', 'group_nodes', 'tokens', 'vocabulary',)
+
+    def __init__(self, node_tree):
+
+        #the sockets names & types are read from the nodetree snapshot
+        graph = get_tree_graph(node_tree)
+        #a renamed node is unknown to the snapshot
+        if any((n.name not in graph.node_index) for n in node_tree.nodes):
+            graph = get_tree_graph(node_tree, refresh=True)
+        self.revision = graph.revision
+        self.naming = get_nodes_naming(node_tree)
+
+        self.node_names, self.node_is_frame, self.node_has_inputs = [], [], []
+        self.group_nodes = [] #node indices of the group nodes, for recursive search
+        self.tokens = {f:{} for f in SEARCH_FIELDS} #field -> token -> set of node indices
+
+        for i,n in enumerate(node_tree.nodes):
+            self.node_names.append(n.name)
+            self.node_is_frame.append(n.type=='FRAME')
+            self.node_has_inputs.append(len(n.inputs)!=0)
+            if (getattr(n,'node_tree',None) is not None):
+                self.group_nodes.append(i)
+
+            ni = graph.node_index.get(n.name)
+            sockets = [] if (ni is None) else graph.node_inputs[ni] + graph.node_outputs[ni]
 
-        if (self.search_labels):
             name = n.label.lower()
             if not name:
                 name = n.bl_label.lower()
-            terms += name.split(" ")
+            self._add('labels', name.split(" "), i)
+            self._add('types', n.type.lower().split(" "), i)
+            name = n.name + " " + n.bl_idname
+            self._add('names', name.replace("_"," ").lower().split(" "), i)
+            for si in sockets:
+                self._add('socket_names', graph.socket_names[si].lower().split(" "), i)
+                self._add('socket_types', graph.socket_types[si].lower().split(" "), i)
+            continue
 
-        if (self.search_types):
-            terms += n.type.lower().split(" ")
+        self.vocabulary = {f:sorted(t) for f,t in self.tokens.items()}
 
-        if (self.search_names):
-            name = n.name + " " + n.bl_idname
-            terms += name.replace("_"," ").lower().split(" ")
+    def _add(self, field:str, tokens:list, i:int) -> None:
+        for t in tokens:
+            if (t):
+                self.tokens[field].setdefault(t, set()).add(i)
+        return None
 
-        if (self.search_socket_names):
-            for s in [*list(n.inputs),*list(n.outputs)]:
-                name = s.name.lower() 
-                if name not in terms:
-                    terms += name.split(" ")
+    def match(self, field:str, keyword:str, mode:str='CONTAINS',) -> set:
+        """get the indices of the nodes with a token of this field matching the keyword"""
 
-        if (self.search_socket_types):
-            for s in [*list(n.inputs),*list(n.outputs)]:
-                name = s.type.lower() 
-                if name not in terms:
-                    terms += name.split(" ")
+        vocabulary = self.vocabulary[field]
+        match mode:
+            case 'PREFIX':
+                matched = []
+                for t in vocabulary[bisect_left(vocabulary, keyword):]:
+                    if (not t.startswith(keyword)):
+                        break
+                    matched.append(t)
+            case 'CONTAINS':
+                matched = [t for t in vocabulary if (keyword in t)]
+            case 'FUZZY':
+                matched = [t for t in vocabulary if (keyword in t)]
+                matched += get_close_matches(keyword, vocabulary, n=10, cutoff=0.7)
 
-        if (not is_matching(keywords,terms)):
-            continue
+        found = set()
+        for t in matched:
+            found.update(self.tokens[field][t])
+        return found
+
+    def search(self, keywords:set, fields:set, mode:str='CONTAINS',) -> list:
+        """get the indices of the nodes matching any of the keywords, sorted"""
+
+        found = set()
+        for k in keywords:
+            for f in fields:
+                found.update(self.match(f, k, mode))
+
+        return sorted(found)
+
+
+def search_nodes(node_tree, keywords:set, fields:set, mode:str='CONTAINS', recursive:bool=False, input_only:bool=False, frame_only:bool=False,) -> list:
+    """search nodes in the given nodetree, and in its nested nodegroups if recursive.
+    input_only: only keep the nodes without inputs (frames excluded). frame_only: only keep the frames.
+    return a list of (nodetree, group nodes path, node name), the path is the list of group node names to enter,
+    from the searched nodetree, to reach the nodetree of the found node"""
+
+    results = []
+    visited = {node_tree.session_uid}
+    queue = deque(((node_tree, []),))
+
+    while queue:
+        tree, path = queue.popleft()
+        index = get_search_index(tree)
 
-        found.append(n)
+        for i in index.search(keywords, fields, mode):
+            if (input_only) and (index.node_has_inputs[i] or index.node_is_frame[i]):
+                continue
+            if (frame_only) and (not index.node_is_frame[i]):
+                continue
+            results.append((tree, path, index.node_names[i]))
 
+        if (recursive):
+            for i in index.group_nodes:
+                node = tree.nodes.get(index.node_names[i])
+                sub = None if (node is None) else node.node_tree
+                if (sub is None) or (sub.session_uid in visited):
+                    continue
+                visited.add(sub.session_uid)
+                queue.append((sub, path + [node.name]))
         continue
 
+    return results
+
+
+def search_upd(self, context):
+    """search in context nodetree for nodes"""
+
+    ng = context.space_data.edit_tree
+
+    keywords = self.search_keywords.lower().replace(","," ").split(" ")
+    keywords = set(k for k in keywords if k)
+
+    fields = set()
+    if (self.search_labels):
+        fields.add('labels')
+    if (self.search_types):
+        fields.add('types')
+    if (self.search_names):
+        fields.add('names')
+    if (self.search_socket_names):
+        fields.add('socket_names')
+    if (self.search_socket_types):
+        fields.add('socket_types')
+
+    results = []
+    if (keywords and fields):
+        results = search_nodes(ng, keywords, fields,
+            mode=self.search_match,
+            recursive=self.search_recursive,
+            input_only=self.search_input_only,
+            frame_only=self.search_frame_only,
+            )
+
+    #store the results list
+    self.search_results.clear()
+    for tree, path, name in results:
+        item = self.search_results.add()
+        item.name = name
+        item.tree_name = tree.name
+        item.path = json.dumps(path)
+
     #unselect all
     for n in ng.nodes:
         n.select = False
 
-    self.search_found = len(found)
+    self.search_found = len(results)
     if (self.search_found==0):
         return None
 
-    if (self.search_input_only):
-        for n in found.copy():
-            if (len(n.inputs)==0 and (n.type!="FRAME")):
-                continue
-            found.remove(n)
-            continue
-
-    if (self.search_frame_only):
-        for n in found.copy():
-            if (n.type!="FRAME"):
-                found.remove(n)
-            continue
-
-    for n in found:
-        n.select = True 
+    #select the found nodes of this nodetree, and the group nodes leading to nested ones
+    for tree, path, name in results:
+        n = ng.nodes.get(path[0] if (path) else name)
+        if (n is not None):
+            n.select = True
+        continue
 
     if (self.search_center):
-        with bpy.context.temp_override(area=context.area, space=context.area.spaces[0], region=context.area.regions[3]): 
+        with bpy.context.temp_override(area=context.area, space=context.area.spaces[0], region=context.area.regions[3]):
             bpy.ops.node.view_selected()
 
-    return None
\ No newline at end of file
+    return None
+
+
+class NODEBOOSTER_OT_search_goto(bpy.types.Operator):
+    """Enter the nodegroups leading to this search result, and frame it"""
+
+    bl_idname = "nodebooster.search_goto"
+    bl_label = "Go to Search Result"
+    bl_options = {'REGISTER'}
+
+    result_index : bpy.props.IntProperty(
+        default=0,
+        )
+
+    @classmethod
+    def poll(cls, context):
+        return (context.space_data.type=='NODE_EDITOR') and (context.space_data.edit_tree is not None)
+
+    def execute(self, context):
+
+        sett_scene = context.scene.nodebooster
+        space_data = context.space_data
+
+        if (self.result_index>=len(sett_scene.search_results)):
+            return {'CANCELLED'}
+        result = sett_scene.search_results[self.result_index]
+
+        #enter the nodegroups, starting from the searched nodetree
+        ng = space_data.edit_tree
+        for name in json.loads(result.path):
+            group_node = ng.nodes.get(name)
+            if (group_node is None) or (group_node.node_tree is None):
+                self.report({'WARNING'}, f"Group node '{name}' not found in '{ng.name}', please search again")
+                return {'CANCELLED'}
+            space_data.path.append(group_node.node_tree, node=group_node)
+            ng = group_node.node_tree
+
+        node = ng.nodes.get(result.name)
+        if (node is None):
+            self.report({'WARNING'}, f"Node '{result.name}' not found in '{ng.name}', please search again")
+            return {'CANCELLED'}
+
+        for n in ng.nodes:
+            n.select = False
+        ng.nodes.active = node
+        node.select = True
+
+        #the operator needs the main region of the node editor, not the sidebar region the button is drawn in.
+        region = next((r for r in context.area.regions if (r.type=='WINDOW')), None)
+        if (region is not None):
+            with context.temp_override(area=context.area, space=space_data, region=region,):
+                bpy.ops.node.view_selected('INVOKE_DEFAULT')
+
+        return {'FINISHED'}
@@ -6,7 +6,7 @@
 import bpy
 
 from .addon_sett import NODEBOOSTER_AddonPref
-from .scene_sett import NODEBOOSTER_PR_scene, NODEBOOSTER_PR_scene_favorites_data
+from .scene_sett import NODEBOOSTER_PR_scene, NODEBOOSTER_PR_scene_favorites_data, NODEBOOSTER_PR_scene_search_result
 from .windows_sett import NODEBOOSTER_PR_Window
 
 
@@ -14,6 +14,7 @@ classes = (
 
     NODEBOOSTER_AddonPref,
     NODEBOOSTER_PR_scene_favorites_data,
+    NODEBOOSTER_PR_scene_search_result,
     NODEBOOSTER_PR_scene,
     NODEBOOSTER_PR_Window,
 
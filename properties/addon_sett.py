@@ -6,6 +6,12 @@
 import bpy 
 
 
+def upd_instrumentation(self, context):
+    from ..utils.prof_utils import set_instrumentation
+    set_instrumentation(self.debug_instrumentation)
+    return None
+
+
 class NODEBOOSTER_AddonPref(bpy.types.AddonPreferences):
 
     from .. import __package__ as base_package
@@ -19,6 +25,12 @@ class NODEBOOSTER_AddonPref(bpy.types.AddonPreferences):
         name="Depsgraph Debug",
         default=False,
         )
+    debug_instrumentation : bpy.props.BoolProperty(
+        name="Instrumentation",
+        default=False,
+        description="Measure our handlers and nodes updates: counts, durations and socket writes, per handler and per node class. Use it to find out which booster nodes are slowing down your viewport",
+        update=upd_instrumentation,
+        )
     #not exposed
     ui_word_wrap_max_char_factor : bpy.props.FloatProperty(
         default=1.0,
@@ -40,6 +52,15 @@ class NODEBOOSTER_AddonPref(bpy.types.AddonPreferences):
         description="Automatically launch the minimap navigation modal when loading the addon and loading new .blend files.",
         )
     
+    #nex
+    nex_profile_history_size : bpy.props.IntProperty(
+        default=32,
+        min=1,
+        soft_max=256,
+        name="Nex Profiles History",
+        description="Number of execution profiles kept per Nex script node, see the 'Development' panel of the node.",
+        )
+
     #interpolation demo
     interpolation_demo_mode : bpy.props.BoolProperty(
         default=False,
@@ -57,5 +78,45 @@ class NODEBOOSTER_AddonPref(bpy.types.AddonPreferences):
         
         layout.prop(self,"debug",)
         layout.prop(self,"debug_depsgraph",)
+        if (self.debug_depsgraph):
+            from ..utils.dep_utils import get_suppressed_cycles_stats
+            rate, total = get_suppressed_cycles_stats()
+            col = layout.column()
+            col.active = False
+            col.label(text=f"Suppressed Feedback Cycles: {rate:.0f}/s ({total} total)",)
+        layout.prop(self,"nex_profile_history_size",)
+
+        layout.prop(self,"debug_instrumentation",)
+        if (self.debug_instrumentation):
+            self.draw_instrumentation(layout)
+        
+        return None
+
+    def draw_instrumentation(self, layout):
+        """draw the instrumentation stats table"""
+
+        from ..utils.prof_utils import get_instrumentation_stats
+        stats = get_instrumentation_stats()
+
+        box = layout.box()
+        if (not stats):
+            box.active = False
+            box.label(text="Nothing recorded yet",)
+        else:
+            grid = box.grid_flow(row_major=True, columns=6, even_columns=False, align=True,)
+            for title in ("Name","Count","Total","Mean","P95","Writes"):
+                grid.label(text=title,)
+            for d in stats[:20]:
+                grid.label(text=d['name'], icon='TIME' if (d['kind']=='HANDLER') else 'NODE',)
+                grid.label(text=str(d['count']),)
+                grid.label(text=f"{d['total_ms']:.1f}ms",)
+                grid.label(text=f"{d['mean_ms']:.2f}ms",)
+                grid.label(text=f"{d['p95_ms']:.2f}ms",)
+                grid.label(text=str(d['writes']),)
+
+        row = box.row(align=True)
+        row.operator("nodebooster.instrumentation_export", text="Export JSON", icon="EXPORT",).format = 'JSON'
+        row.operator("nodebooster.instrumentation_export", text="Export Chrome-Trace", icon="EXPORT",).format = 'CHROME'
+        row.operator("nodebooster.instrumentation_clear", text="", icon="TRASH",)
         
         return None
@@ -44,6 +44,20 @@ class NODEBOOSTER_PR_scene_favorites_data(bpy.types.PropertyGroup):
             return 'Deleted?'
         return nd.label
 
+class NODEBOOSTER_PR_scene_search_result(bpy.types.PropertyGroup):
+    """search_results = bpy.context.scene.nodebooster.search_results"""
+
+    name : bpy.props.StringProperty(
+        description="Name of the found node",
+        )
+    tree_name : bpy.props.StringProperty(
+        description="Name of the nodetree of the found node",
+        )
+    path : bpy.props.StringProperty(
+        default="[]",
+        description="Json list of the group node names to enter from the searched nodetree",
+        )
+
 class NODEBOOSTER_PR_scene(bpy.types.PropertyGroup): 
     """sett_scene = bpy.context.scene.nodebooster"""
 
@@ -142,9 +156,34 @@ class NODEBOOSTER_PR_scene(bpy.types.PropertyGroup):
         name="Frame Only",
         update=search_upd,
         )
+    search_recursive : bpy.props.BoolProperty(
+        default=False,
+        name="Recursive",
+        description="Also search within the nested nodegroups",
+        update=search_upd,
+        )
+    search_match : bpy.props.EnumProperty(
+        default='CONTAINS',
+        name="Match",
+        items=(('CONTAINS',"Contains","Keywords are found within the terms",),
+               ('PREFIX',"Prefix","Terms are starting with the keywords",),
+               ('FUZZY',"Fuzzy","Terms are containing or are close to the keywords, tolerating typos",),),
+        update=search_upd,
+        )
     search_found : bpy.props.IntProperty(
         default=0,
         )
+    search_results : bpy.props.CollectionProperty(
+        type=NODEBOOSTER_PR_scene_search_result,
+        name="Search Results",
+        )
+
+    #playback bake
+    playback_baked : bpy.props.BoolProperty(
+        default=False,
+        name="Baked Playback",
+        description="The info nodes values are baked as keyframes on their nodegroups, their automatic updates are disabled. Use the 'Clear Bake' operator to restore them",
+        )
 
     #favorite tool
     favorites_data : bpy.props.CollectionProperty(
@@ -11,6 +11,9 @@ from ..__init__ import get_addon_prefs
 from ..utils.str_utils import word_wrap
 
 
+SEARCH_RESULTS_DRAWN = 25
+
+
 class NODEBOOSTER_PT_active_node(bpy.types.Panel):
 
     bl_idname = "NODEBOOSTER_PT_active_node"
@@ -52,6 +55,45 @@ class NODEBOOSTER_PT_active_node(bpy.types.Panel):
               active.draw_panel(layout, context)
         else: layout.label(text="No Interface Defined", icon='GHOST_DISABLED')
 
+        #info nodes values can be baked for a faster playback
+        if ('PLAYBACK_BAKEABLE' in getattr(active, 'auto_upd_flags', ())):
+            header, panel = layout.panel("playback_panelid", default_closed=True,)
+            header.label(text="Playback",)
+            if (panel):
+                sett_scene = context.scene.nodebooster
+                col = panel.column(align=True)
+                if (sett_scene.playback_baked):
+                    col.label(text="Info nodes are baked", icon='KEYFRAME_HLT')
+                    op = col.operator("nodebooster.bake_playback", text="Clear Bake", icon="TRASH",)
+                    op.clear = True
+                else:
+                    op = col.operator("nodebooster.bake_playback", text="Bake for Playback", icon="REC",)
+                    op.clear = False
+
+        #expressions & scripts can be converted to plain nodegroups in bulk
+        if hasattr(active,'get_bake_signature'):
+            header, panel = layout.panel("convertgroups_panelid", default_closed=True,)
+            header.label(text="Convert to Groups",)
+            if (panel):
+                col = panel.column(align=True)
+                op = col.operator("extranode.bake_customnode", text="Selected Nodes", icon="RESTRICT_SELECT_OFF",)
+                op.scope = 'SELECTED'
+                op = col.operator("extranode.bake_customnode", text="All in NodeTree", icon="NODETREE",)
+                op.scope = 'TREE'
+                op = col.operator("extranode.bake_customnode", text="All in File", icon="FILE_BLEND",)
+                op.scope = 'FILE'
+
+        #some nodes can be rate limited while interacting with heavy scenes
+        if hasattr(active,'max_refresh_rate'):
+            header, panel = layout.panel("refreshrate_panelid", default_closed=True,)
+            header.label(text="Refresh Rate",)
+            if (panel):
+                col = panel.column()
+                col.use_property_split = True
+                col.use_property_decorate = False
+                col.prop(active, "max_refresh_rate", text="Max Rate",)
+                col.prop(active, "debounce_ms", text="Debounce",)
+
         return None
 
 
@@ -89,9 +131,21 @@ class NODEBOOSTER_PT_tool_search(bpy.types.Panel):
         col.prop(sett_scene,"search_names")
         col.prop(sett_scene,"search_input_only")
         col.prop(sett_scene,"search_frame_only")
+        col.prop(sett_scene,"search_recursive")
+        layout.prop(sett_scene,"search_match")
 
         s = layout.column()
         s.label(text=f"Found {sett_scene.search_found} Element(s)")
+
+        #results list, only the first ones are drawn
+        if (sett_scene.search_results):
+            col = layout.column(align=True)
+            for i,res in enumerate(sett_scene.search_results[:SEARCH_RESULTS_DRAWN]):
+                text = res.name if (res.path=="[]") else f"{res.tree_name} > {res.name}"
+                op = col.operator("nodebooster.search_goto", text=text, icon="RIGHTARROW_THIN" if (res.path=="[]") else "NODETREE",)
+                op.result_index = i
+            if (len(sett_scene.search_results)>SEARCH_RESULTS_DRAWN):
+                col.label(text=f"+{len(sett_scene.search_results)-SEARCH_RESULTS_DRAWN} more..")
     
         return None
 
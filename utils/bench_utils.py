@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE benchmarks of our internal utilities, on generated heavy files.
+#  - These functions are meant to be run manually from the blender python console, ex:
+#      from bl_ext.user_default.nodebooster.utils.bench_utils import benchmark_booster_nodes_registry
+#      benchmark_booster_nodes_registry(groups_count=2000)
+#  - The data generated for a benchmark is removed afterwards.
+
+import bpy
+
+import time
+
+from ..utils.node_utils import (
+    cache_all_booster_nodes_parent_trees,
+    get_cached_booster_nodes,
+    get_registered_booster_nodes,
+    rebuild_booster_nodes_registry,
+    check_booster_nodes_registry,
+)
+from ..utils.graph_utils import get_tree_graph
+
+
+def bench(fct, repeat:int=20,) -> float:
+    """return the average execution time of the given function, in milliseconds"""
+
+    t = time.perf_counter()
+    for _ in range(repeat):
+        fct()
+    return (time.perf_counter()-t)/repeat*1000
+
+
+def benchmark_booster_nodes_registry(groups_count:int=2000, booster_every:int=20, nodes_per_group:int=10, repeat:int=20,) -> dict:
+    """compare the nodetrees scan with the event indexed registry, on a file with many nodegroups.
+    one nodegroup out of 'booster_every' will contain a booster node."""
+
+    idname = 'GeometryNodeNodeBoosterSceneInfo'
+    created = []
+
+    try:
+        for i in range(groups_count):
+            ng = bpy.data.node_groups.new(f".BenchRegistry.{i:05}", 'GeometryNodeTree')
+            created.append(ng)
+            for _ in range(nodes_per_group):
+                ng.nodes.new('GeometryNodeSetPosition')
+            if (i%booster_every==0):
+                ng.nodes.new(idname)
+
+        rebuild_booster_nodes_registry()
+        expected = len(range(0, groups_count, booster_every))
+        assert len(get_registered_booster_nodes({idname}))>=expected, "ERROR: benchmark_booster_nodes_registry(): registry is missing nodes"
+
+        results = {
+            'full_scan_ms': bench(lambda: (cache_all_booster_nodes_parent_trees(), get_cached_booster_nodes({idname})), repeat),
+            'cached_scan_ms': bench(lambda: get_cached_booster_nodes({idname}), repeat),
+            'registry_ms': bench(lambda: get_registered_booster_nodes({idname}), repeat),
+            'consistency_check_ms': bench(check_booster_nodes_registry, max(1,repeat//4)),
+            }
+
+        print(f"Booster nodes registry benchmark: {groups_count} nodegroups, {expected} booster nodes")
+        for k,v in results.items():
+            print(f"  {k:<22}: {v:.3f}ms")
+
+    finally:
+        for ng in created:
+            bpy.data.node_groups.remove(ng)
+        rebuild_booster_nodes_registry()
+
+    return results
+
+
+def benchmark_purge_unused_nodes(nodes_count:int=5000, unused_every:int=10, repeat:int=5,) -> dict:
+    """compare the reverse reachability pass of the purge with a reachability check per node,
+    on a generated diamond shaped nodetree. one layer out of 'unused_every' also has a dead end node."""
+
+    from ..operators.purge import get_used_nodes
+
+    ng = bpy.data.node_groups.new(".BenchPurge", 'GeometryNodeTree')
+
+    try:
+        ng.interface.new_socket(name="Value", in_out='OUTPUT', socket_type='NodeSocketFloat')
+        out = ng.nodes.new('NodeGroupOutput')
+
+        #each layer has two math nodes, both fed by the two nodes of the previous layer
+        previous, unused = [], 0
+        for i in range(nodes_count//2):
+            layer = [ng.nodes.new('ShaderNodeMath') for _ in range(2)]
+            for n in layer:
+                for j,p in enumerate(previous):
+                    ng.links.new(p.outputs[0], n.inputs[j])
+            if (previous and i%unused_every==0):
+                ng.links.new(previous[0].outputs[0], ng.nodes.new('ShaderNodeMath').inputs[0])
+                unused += 1
+            previous = layer
+        last = ng.nodes.new('ShaderNodeMath')
+        for j,p in enumerate(previous):
+            ng.links.new(p.outputs[0], last.inputs[j])
+        ng.links.new(last.outputs[0], out.inputs[0])
+
+        graph = get_tree_graph(ng, refresh=True)
+        used = get_used_nodes(ng, graph=graph)
+        assert len(graph.node_names)-len(used)==unused, "ERROR: benchmark_purge_unused_nodes(): wrong unused nodes count"
+
+        outputs = [ni for ni,t in enumerate(graph.node_types) if (t=='GROUP_OUTPUT')]
+        def per_node():
+            return [ni for ni in range(len(graph.node_names)) if (not graph.reachable_nodes((ni,),).isdisjoint(outputs))]
+
+        results = {
+            'snapshot_ms': bench(lambda: get_tree_graph(ng, refresh=True), repeat),
+            'reverse_pass_ms': bench(lambda: get_used_nodes(ng, graph=graph), repeat),
+            'per_node_check_ms': bench(per_node, 1),
+            }
+
+        print(f"Purge benchmark: {len(graph.node_names)} nodes, {len(graph.link_from)} links, {unused} unused")
+        for k,v in results.items():
+            print(f"  {k:<22}: {v:.3f}ms")
+
+    finally:
+        bpy.data.node_groups.remove(ng)
+
+    return results
+
+
+def benchmark_refresh_signalling(sources_count:int=200, links_per_source:int=4, repeat:int=5,) -> dict:
+    """compare the legacy relinking refresh signal with the batched refresh service, on a generated nodetree.
+    each source node output is linked to 'links_per_source' nodes, every source is kicked once per run.
+    the link churn is the number of links destroyed & re-created per run."""
+
+    from ..utils.node_utils import send_refresh_signal
+    from ..utils.queue_utils import queue_node_refresh, flush_refresh_queue, clear_refresh_queue, get_refresh_stats
+
+    ng = bpy.data.node_groups.new(".BenchRefresh", 'GeometryNodeTree')
+
+    try:
+        sources = []
+        for _ in range(sources_count):
+            src = ng.nodes.new('ShaderNodeMath')
+            for _ in range(links_per_source):
+                ng.links.new(src.outputs[0], ng.nodes.new('ShaderNodeMath').inputs[0])
+            sources.append(src.name)
+
+        def legacy():
+            for name in sources:
+                send_refresh_signal(ng.nodes[name].outputs[0])
+
+        def batched():
+            for name in sources:
+                queue_node_refresh(ng.nodes[name])
+            flush_refresh_queue()
+
+        get_refresh_stats(reset=True)
+        results = {
+            'legacy_ms': bench(legacy, repeat),
+            'batched_ms': bench(batched, repeat),
+            }
+        stats = get_refresh_stats(reset=True)
+        #the relink removes & re-creates every link of the kicked outputs
+        results['legacy_link_churn'] = sum(len(ng.nodes[name].outputs[0].links) for name in sources)
+        results['batched_link_churn'] = stats['links_churned']//repeat
+        results['batched_trees_tagged'] = stats['trees_tagged']//repeat
+
+        print(f"Refresh signalling benchmark: {sources_count} kicked nodes, {len(ng.links)} links")
+        for k,v in results.items():
+            print(f"  {k:<22}: {v:.3f}" if isinstance(v,float) else f"  {k:<22}: {v}")
+
+    finally:
+        clear_refresh_queue()
+        bpy.data.node_groups.remove(ng)
+
+    return results
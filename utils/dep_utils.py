@@ -0,0 +1,383 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE dependency-aware scheduling of the booster nodes automatic updates.
+#  - Nodes declare what they depend on with a 'get_dependencies()' method, returning a set of ID datablocks
+#    and/or special keys: 'FRAME' the node needs a refresh on each frame change, 'ALWAYS' on any signal.
+#    A node without 'get_dependencies()' method is considered as 'ALWAYS'.
+#  - An ID dependency that is animated is automatically considered as a 'FRAME' dependency as well.
+#  - On each handler signal we gather the changed dependencies (from 'depsgraph.updates' and the frame delta)
+#    and only refresh the nodes depending on them. If nothing relevant changed, no node is even collected.
+
+# NOTE CODE INFO:
+# - We index the nodes by their dependencies. Like in 'node_utils', we don't store any bpy object in globals,
+#   ids are stored as session_uid and nodes as (parent nodetree session_uid, node name) keys.
+# - The index is rebuilt lazily when tagged dirty. Nodes should call 'tag_dependencies_dirty()' on 'update()' and
+#   when a property their dependencies rely on is changed. We also tag it on file load.
+# - We can't simply tag it when a parent nodetree of booster nodes is updated, writing our output values is already
+#   updating these nodetrees, the index would be rebuilt on every signal.
+# - The dependencies of refreshed nodes are re-evaluated after their refresh, as they can change dynamically
+#   (ex: the camera info node following the active scene camera).
+
+# NOTE about feedback:
+#  Writing our output values tags the depsgraph, which will send a new 'depsgraph_update_post' signal, which
+#  will refresh our nodes again, and so on. To stop this loop:
+#  - While refreshing nodes, any re-entrant signal is ignored, see 'is_refreshing()'.
+#  - After a refresh, the nodetrees we wrote to are registered as an 'echo'. All the writes of a refresh are
+#    coalesced into one echo, consumed by the next depsgraph signal. A refresh that wrote nothing (see
+#    'count_socket_writes()' & the defvalues shadow) registers no echo, no signal will follow. The echo is also
+#    cleared on frame change. If this signal contains our echo, the
+#    updates it provoked are ignored: our nodetrees, and the IDs owning or using them, directly or through nested
+#    nodegroups (nodetrees, materials, worlds, scenes via their compositor or world, objects via their geometry
+#    nodes modifiers or material slots), as long as these are not transform updates, see 'is_using_echo()'.
+#    Other IDs of the same types are real changes. The depsgraph scene is sent along with any update of its content,
+#    it is only ignored if nothing else than the echo changed. If nothing else changed, the whole cycle is suppressed.
+#  - The suppressed cycles are counted, see the debug section of the addon preferences.
+
+# NOTE about throttling:
+#  Nodes refreshed on depsgraph signals may inherit 'RefreshRateSettings', defining a 'max_refresh_rate' (Hz) and a
+#  'debounce_ms' property. When the depsgraph handler collects them, 'throttle_nodes()' decides if they can refresh now,
+#  or if their refresh is postponed to a 'due' time. A postponed refresh is never lost: the handlers poll
+#  'pop_trailing_nodes()' from a timer, so the latest value is always applied on the trailing edge, once the user
+#  stopped dragging.
+#  - Throttling is only meant for interactions. Frame changes, playback and renders always refresh immediately.
+
+import bpy
+
+import time
+from collections import deque
+
+from ..utils.node_utils import get_booster_nodes
+from ..utils.prof_utils import get_socket_writes
+
+
+_DEPENDENCIES_INDEX = {}   #dependency key -> set of node keys
+_NODES_DEPENDENCIES = {}   #node key -> set of dependency keys
+_SCHEDULER_STATE = {'dirty':True, 'frame':None,}
+_THROTTLE_STATE = {}       #node key -> {'last':time of last refresh, 'due':time of the postponed refresh or None, 'idname':node idname}
+_FEEDBACK_STATE = {'refreshing':False, 'echo':set(), 'suppressed':deque(maxlen=4096), 'suppressed_total':0,}
+
+ECHO_ID_TYPES = (bpy.types.NodeTree, bpy.types.Material, bpy.types.World, bpy.types.Scene, bpy.types.Object,)
+
+
+def tag_dependencies_dirty():
+    """the nodes dependencies will be re-evaluated on the next signal"""
+    _SCHEDULER_STATE['dirty'] = True
+    return None
+
+def node_key(node) -> tuple:
+    return (node.id_data.session_uid, node.name)
+
+def get_node_dependencies(node) -> set:
+    """get the dependency keys of the given node"""
+
+    get_dependencies = getattr(node, 'get_dependencies', None)
+    if (get_dependencies is None):
+        return {'ALWAYS'}
+
+    keys = set()
+    for dep in get_dependencies():
+
+        if (dep is None):
+            continue
+        if (type(dep) is str):
+            keys.add(dep)
+            continue
+
+        keys.add(dep.original.session_uid)
+
+        #animated data will change on frame change, without any depsgraph update signal.
+        anim = getattr(dep, 'animation_data', None)
+        if (anim and (anim.action or anim.drivers)):
+            keys.add('FRAME')
+        continue
+
+    return keys
+
+def index_node_dependencies(node) -> None:
+    """(re)register the dependencies of the given node in the index"""
+
+    key = node_key(node)
+
+    for dep in _NODES_DEPENDENCIES.pop(key, ()):
+        users = _DEPENDENCIES_INDEX.get(dep)
+        if (users is not None):
+            users.discard(key)
+            if (not users):
+                del _DEPENDENCIES_INDEX[dep]
+
+    deps = get_node_dependencies(node)
+    _NODES_DEPENDENCIES[key] = deps
+    for dep in deps:
+        _DEPENDENCIES_INDEX.setdefault(dep, set()).add(key)
+
+    return None
+
+def rebuild_dependencies_index(idnames:set) -> set:
+    """index all the nodes of the given idnames, return the nodes"""
+
+    _DEPENDENCIES_INDEX.clear()
+    _NODES_DEPENDENCIES.clear()
+
+    nodes = get_booster_nodes(by_idnames=idnames)
+    for n in nodes:
+        index_node_dependencies(n)
+
+    _SCHEDULER_STATE['dirty'] = False
+    return nodes
+
+def is_refreshing() -> bool:
+    """are we currently refreshing nodes? a signal received now is caused by our own writes"""
+    return _FEEDBACK_STATE['refreshing']
+
+class refreshing_nodes():
+    """context manager, flag the nodes refresh and register the echo of their writes once done"""
+
+    __slots__ = ('nodes','writes',)
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.writes = 0
+
+    def __enter__(self):
+        _FEEDBACK_STATE['refreshing'] = True
+        self.writes = get_socket_writes()
+        return self
+
+    def __exit__(self, *args):
+        _FEEDBACK_STATE['refreshing'] = False
+        #nothing written, ex: all values were already up to date, no depsgraph signal will follow.
+        if (get_socket_writes()!=self.writes):
+            register_feedback_echo(self.nodes)
+        return False
+
+def register_feedback_echo(nodes):
+    """the given nodes wrote to their nodetrees, the next depsgraph signal will contain these updates"""
+
+    echo = _FEEDBACK_STATE['echo']
+    for n in nodes:
+        echo.add(n.id_data.session_uid)
+        if (getattr(n, 'node_tree', None)):
+            echo.add(n.node_tree.session_uid)
+
+    return None
+
+def clear_feedback_echo():
+    """forget the echo of our previous writes, ex: on frame change, the next depsgraph signal is not an echo anymore"""
+    _FEEDBACK_STATE['echo'] = set()
+    return None
+
+def count_suppressed_cycle():
+    _FEEDBACK_STATE['suppressed'].append(time.perf_counter())
+    _FEEDBACK_STATE['suppressed_total'] += 1
+    return None
+
+def get_suppressed_cycles_stats(seconds:float=1.0,) -> tuple:
+    """return the number of suppressed feedback cycles per second, and the total since startup"""
+
+    since = time.perf_counter() - seconds
+    recent = sum(1 for t in reversed(_FEEDBACK_STATE['suppressed']) if (t>=since))
+
+    return recent/seconds, _FEEDBACK_STATE['suppressed_total']
+
+def get_used_node_trees(idorig) -> list:
+    """get the nodetrees directly owned or used by this ID"""
+
+    if isinstance(idorig, bpy.types.NodeTree):
+        return [n.node_tree for n in idorig.nodes if (getattr(n, 'node_tree', None) is not None)]
+
+    if isinstance(idorig, (bpy.types.Material, bpy.types.World)):
+        return [idorig.node_tree] if (idorig.node_tree is not None) else []
+
+    if isinstance(idorig, bpy.types.Scene):
+        trees = [getattr(idorig, 'node_tree', None)]
+        if (idorig.world is not None):
+            trees.append(idorig.world.node_tree)
+        return [ng for ng in trees if (ng is not None)]
+
+    if isinstance(idorig, bpy.types.Object):
+        trees = [m.node_group for m in idorig.modifiers if (getattr(m, 'node_group', None) is not None)]
+        trees += [s.material.node_tree for s in idorig.material_slots if (s.material is not None) and (s.material.node_tree is not None)]
+        return trees
+
+    return []
+
+def is_using_echo(idorig, echo:set, _visited=None,) -> bool:
+    """is this ID one of the echoed nodetrees, or owning or using one of them, directly or through nested nodegroups?"""
+
+    if (idorig.session_uid in echo):
+        return True
+
+    if (_visited is None):
+        _visited = set()
+    _visited.add(idorig.session_uid)
+
+    for ng in get_used_node_trees(idorig):
+        if (ng.session_uid not in _visited) and is_using_echo(ng, echo, _visited):
+            return True
+        continue
+
+    return False
+
+def get_changed_dependencies(depsgraph=None, scene=None,) -> set|None:
+    """gather the dependency keys that changed since the last signal.
+    Return None if the depsgraph signal is only the echo of our own writes."""
+
+    changed = {'ALWAYS'}
+
+    if (depsgraph is not None):
+
+        echo = _FEEDBACK_STATE['echo']
+        _FEEDBACK_STATE['echo'] = set()
+
+        updates = [(upd.id.original, upd.is_updated_transform) for upd in depsgraph.updates]
+        is_echo = bool(echo) and any((idorig.session_uid in echo) for idorig,_ in updates)
+
+        scenes = set()
+        for idorig, transform in updates:
+            if (is_echo):
+                if (idorig.session_uid in echo):
+                    continue
+                if (not transform) and isinstance(idorig, ECHO_ID_TYPES):
+                    if is_using_echo(idorig, echo):
+                        continue
+                    #the depsgraph scene is sent along with our writes, only a change if something else changed.
+                    if (idorig==depsgraph.scene.original):
+                        scenes.add(idorig.session_uid)
+                        continue
+            changed.add(idorig.session_uid)
+            continue
+
+        if (is_echo and len(changed)==1):
+            count_suppressed_cycle()
+            return None
+
+        changed.update(scenes)
+
+    if (scene is not None):
+        frame = scene.frame_current
+        if (frame!=_SCHEDULER_STATE['frame']):
+            _SCHEDULER_STATE['frame'] = frame
+            changed.add('FRAME')
+
+    return changed
+
+def get_nodes_to_refresh(idnames:set, changed:set, index_idnames:set=None,) -> list:
+    """get the nodes of the given idnames depending on the changed dependencies.
+    'index_idnames' is the set of all idnames the index should cover, if the index needs a rebuild."""
+
+    nodes = None
+    if (_SCHEDULER_STATE['dirty']):
+        nodes = rebuild_dependencies_index(index_idnames or idnames)
+
+    affected = set()
+    for dep in changed:
+        users = _DEPENDENCIES_INDEX.get(dep)
+        if (users):
+            affected.update(users)
+
+    #nothing relevant changed, we don't even need to collect the nodes
+    if (not affected):
+        return []
+
+    if (nodes is None):
+        nodes = get_booster_nodes(by_idnames=idnames)
+
+    return [n for n in nodes if (n.bl_idname in idnames) and (node_key(n) in affected)]
+
+class RefreshRateSettings():
+    """mixin of the 'max_refresh_rate' & 'debounce_ms' properties, for the nodes refreshed on depsgraph signals"""
+
+    max_refresh_rate : bpy.props.FloatProperty(
+        name="Max Refresh Rate",
+        description="Maximum number of automatic refreshes per second of this node, while interacting with the scene. The latest value is always applied once the limit allows it. 0 means unlimited",
+        default=0.0,
+        min=0.0,
+        soft_max=60.0,
+        )
+    debounce_ms : bpy.props.IntProperty(
+        name="Debounce",
+        description="Wait until this node stopped receiving refresh signals for the given number of milliseconds before refreshing it. Useful while dragging objects. 0 means disabled",
+        default=0,
+        min=0,
+        soft_max=1000,
+        )
+
+def is_throttled(node) -> bool:
+    """does this node define a refresh rate limit or a debounce?"""
+    return bool(getattr(node, 'max_refresh_rate', 0.0)) or bool(getattr(node, 'debounce_ms', 0))
+
+def throttle_nodes(nodes:list) -> list:
+    """filter the nodes allowed to refresh now, according to their 'max_refresh_rate' & 'debounce_ms' settings.
+    The refresh of the other nodes is postponed, see 'pop_trailing_nodes()'."""
+
+    now = time.perf_counter()
+    allowed = []
+
+    for n in nodes:
+
+        if (not is_throttled(n)):
+            allowed.append(n)
+            continue
+
+        key = node_key(n)
+        state = _THROTTLE_STATE.setdefault(key, {'last':0.0, 'due':None, 'idname':n.bl_idname,})
+
+        rate = getattr(n, 'max_refresh_rate', 0.0)
+        debounce = getattr(n, 'debounce_ms', 0) / 1000
+        interval = (1/rate) if (rate>0) else 0.0
+
+        #debounce, we wait for the signals to calm down, the due time keeps moving as long as signals are received
+        if (debounce>0):
+            state['due'] = max(now + debounce, state['last'] + interval)
+            continue
+
+        #rate limit, we refresh immediately if enough time passed, else on the trailing edge
+        if (now - state['last'] >= interval):
+            state['last'] = now
+            state['due'] = None
+            allowed.append(n)
+            continue
+
+        if (state['due'] is None):
+            state['due'] = state['last'] + interval
+        continue
+
+    return allowed
+
+def pop_trailing_nodes() -> tuple:
+    """get the keys & idnames of the nodes with a postponed refresh now due, and the delay until the next due refresh, or None"""
+
+    now = time.perf_counter()
+    keys, idnames, next_due = set(), set(), None
+
+    for key, state in _THROTTLE_STATE.items():
+        due = state['due']
+        if (due is None):
+            continue
+        if (due<=now):
+            state['due'] = None
+            state['last'] = now
+            keys.add(key)
+            idnames.add(state['idname'])
+            continue
+        next_due = due if (next_due is None) else min(next_due, due)
+        continue
+
+    delay = None if (next_due is None) else max(0.0, next_due-now)
+    return keys, idnames, delay
+
+def get_next_trailing_delay() -> float|None:
+    """delay until the next postponed refresh, or None if no refresh is postponed"""
+
+    dues = [state['due'] for state in _THROTTLE_STATE.values() if (state['due'] is not None)]
+    if (not dues):
+        return None
+
+    return max(0.0, min(dues)-time.perf_counter())
+
+def clear_throttle_state() -> None:
+    """forget the postponed refreshes, ex: when loading a new file"""
+    _THROTTLE_STATE.clear()
+    return None
@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE render-farm mode.
+#  - Enabled automatically when blender runs in background, or when passing our flag after the python args separator:
+#      blender -b file.blend -a -- --nodebooster-farm
+#  - In this mode, interactive features are skipped (keyboard/controller listeners, gpu drawing, minimap,
+#    message busses), and the time-dependent info nodes are evaluated on each frame of the job, without throttling.
+#    Before rendering, the frames history some nodes need is evaluated. See 'nodebooster_handler_renderinit()' in handlers.
+
+import bpy
+
+import sys
+
+
+FARM_CLI_FLAG = "--nodebooster-farm"
+
+
+def is_render_farm() -> bool:
+    """are we rendering on a farm?"""
+
+    if (bpy.app.background):
+        return True
+
+    argv = sys.argv
+    if ('--' in argv):
+        return FARM_CLI_FLAG in argv[argv.index('--')+1:]
+
+    return False
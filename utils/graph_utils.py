@@ -0,0 +1,272 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE cached adjacency snapshots of nodetrees.
+#  - Walking a nodetree through the python API is slow: 'socket.links' is re-evaluated on each access and every
+#    attribute read is an RNA call. Our traversals (interpolation evaluator, purge, draw route, search) only need
+#    the topology, so we read it once into a 'TreeGraph' snapshot of plain python indices, and traverse that.
+#  - A snapshot stores the nodes, their sockets, and the links as 'link_from'/'link_to' socket indices arrays,
+#    with the muted flags and the internal links of muted nodes. Traversals pass through reroutes & muted nodes.
+#  - Traversals use 'collections.deque' and return indices. Use 'TreeGraph.socket()', 'TreeGraph.node()' or
+#    'TreeGraph.link()' to find back the bpy objects.
+
+# NOTE about revisions:
+#  - Snapshots are cached per nodetree session_uid, and are valid for a revision of their tree:
+#    a counter bumped by 'tag_tree_graph_dirty()', along with the number of nodes and links of the tree.
+#  - Trees are tagged dirty on depsgraph updates, on the 'update()' of our booster nodes (called by blender on
+#    topology changes of their tree), and by our operators modifying trees. Snapshots are dropped on load & undo.
+#  - Some changes are invisible to the revision, ex: relinking a nodegroup not used by the scene. Resolving a
+#    socket unknown to the snapshot, or a link not matching it, rebuilds the snapshot. Destructive operations
+#    should request a fresh snapshot with 'get_tree_graph(node_tree, refresh=True)'.
+#  - Depsgraph updates are also sent for plain values edits. Caches only depending on the topology (ex: the
+#    evaluation cache & compiled plans of the evaluator) are keyed on 'get_tree_topology_revision()' instead: a counter
+#    bumped by 'tag_tree_topology_dirty()', from the 'update()' of our booster nodes and our linking operators,
+#    along with the number of nodes and links of the tree.
+
+import bpy
+
+from collections import deque
+
+
+_TREE_GRAPHS = {}    #nodetree session_uid -> TreeGraph
+_TREE_REVISIONS = {} #nodetree session_uid -> revision counter
+_TOPOLOGY_REVISIONS = {} #nodetree session_uid -> topology revision counter
+
+
+def tag_tree_graph_dirty(node_tree) -> None:
+    """the snapshot of this nodetree will be rebuilt on next access"""
+    uid = node_tree.session_uid
+    _TREE_REVISIONS[uid] = _TREE_REVISIONS.get(uid, 0) + 1
+    return None
+
+def tag_tree_topology_dirty(node_tree) -> None:
+    """the topology of this nodetree changed: nodes or links added, removed or relinked"""
+    uid = node_tree.session_uid
+    _TOPOLOGY_REVISIONS[uid] = _TOPOLOGY_REVISIONS.get(uid, 0) + 1
+    tag_tree_graph_dirty(node_tree)
+    return None
+
+def tag_updated_tree_graphs(depsgraph) -> None:
+    """tag the snapshots of the nodetrees updated in this depsgraph signal"""
+
+    for upd in depsgraph.updates:
+        if isinstance(upd.id, bpy.types.NodeTree):
+            tag_tree_graph_dirty(upd.id.original)
+
+    return None
+
+def clear_tree_graphs() -> None:
+    """forget all snapshots, ex: on file load or undo, the memory of our nodetrees changed"""
+    _TREE_GRAPHS.clear()
+    return None
+
+def get_tree_revision(node_tree) -> tuple:
+    return (_TREE_REVISIONS.get(node_tree.session_uid, 0), len(node_tree.nodes), len(node_tree.links))
+
+def get_tree_topology_revision(node_tree) -> tuple:
+    return (_TOPOLOGY_REVISIONS.get(node_tree.session_uid, 0), len(node_tree.nodes), len(node_tree.links))
+
+def get_tree_graph(node_tree, refresh:bool=False,):
+    """get the up to date snapshot of this nodetree, (re)built if needed"""
+
+    uid = node_tree.session_uid
+    revision = get_tree_revision(node_tree)
+
+    graph = _TREE_GRAPHS.get(uid)
+    if (refresh) or (graph is None) or (graph.revision!=revision):
+        graph = _TREE_GRAPHS[uid] = TreeGraph(node_tree, revision)
+
+    return graph
+
+
+class TreeGraph():
+    """adjacency snapshot of a nodetree topology, all attributes are plain indices.
+    - node index: position in 'node_names'
+    - socket index: position in 'socket_node', inputs & outputs of all nodes share this range
+    - link index: position in 'link_from', equal to the index of the link in 'node_tree.links'"""
+
+    __slots__ = (
+        'uid', 'revision',
+        'node_names', 'node_idnames', 'node_types', 'node_muted', 'node_index', 'node_inputs', 'node_outputs',
+        'socket_node', 'socket_is_output', 'socket_index', 'socket_identifiers', 'socket_idnames',
+        'socket_names', 'socket_types', 'socket_pointers',
+        'socket_links', 'internal_links',
+        'link_from', 'link_to', 'link_muted',
+        )
+
+    def __init__(self, node_tree, revision:tuple):
+
+        self.uid = node_tree.session_uid
+        self.revision = revision
+
+        self.node_names, self.node_idnames, self.node_types, self.node_muted = [], [], [], []
+        self.node_index = {}    #node name -> node index
+        self.node_inputs, self.node_outputs = [], [] #node index -> list of socket indices
+
+        self.socket_node, self.socket_is_output, self.socket_index = [], [], []
+        self.socket_identifiers, self.socket_idnames, self.socket_names, self.socket_types = [], [], [], []
+        self.socket_pointers = {} #socket memory adress -> socket index, only valid for this revision
+        self.socket_links = []    #socket index -> list of link indices
+        self.internal_links = {}  #socket index -> socket index, internal links of muted nodes, in both directions
+
+        self.link_from, self.link_to, self.link_muted = [], [], []
+
+        for n in node_tree.nodes:
+            ni = len(self.node_names)
+            self.node_names.append(n.name)
+            self.node_idnames.append(n.bl_idname)
+            self.node_types.append(n.type)
+            self.node_muted.append(n.mute)
+            self.node_index[n.name] = ni
+
+            for is_output, sockets, indices in ((False, n.inputs, []), (True, n.outputs, [])):
+                for i,s in enumerate(sockets):
+                    si = len(self.socket_node)
+                    self.socket_node.append(ni)
+                    self.socket_is_output.append(is_output)
+                    self.socket_index.append(i)
+                    self.socket_identifiers.append(s.identifier)
+                    self.socket_idnames.append(s.bl_idname)
+                    self.socket_names.append(s.name)
+                    self.socket_types.append(s.type)
+                    self.socket_links.append([])
+                    self.socket_pointers[s.as_pointer()] = si
+                    indices.append(si)
+                (self.node_outputs if is_output else self.node_inputs).append(indices)
+
+            if (n.mute):
+                for l in n.internal_links:
+                    a = self.socket_pointers.get(l.from_socket.as_pointer())
+                    b = self.socket_pointers.get(l.to_socket.as_pointer())
+                    if (a is not None) and (b is not None):
+                        self.internal_links.setdefault(a, b)
+                        self.internal_links.setdefault(b, a)
+            continue
+
+        for li,l in enumerate(node_tree.links):
+            a = self.socket_pointers.get(l.from_socket.as_pointer())
+            b = self.socket_pointers.get(l.to_socket.as_pointer())
+            self.link_from.append(a)
+            self.link_to.append(b)
+            self.link_muted.append(l.is_muted)
+            if (a is not None):
+                self.socket_links[a].append(li)
+            if (b is not None):
+                self.socket_links[b].append(li)
+            continue
+
+    # Resolving bpy objects
+
+    def socket_id(self, socket) -> int|None:
+        return self.socket_pointers.get(socket.as_pointer())
+
+    def node(self, node_tree, ni:int):
+        return node_tree.nodes.get(self.node_names[ni])
+
+    def socket(self, node_tree, si:int):
+        node = self.node(node_tree, self.socket_node[si])
+        if (node is None):
+            return None
+        sockets = node.outputs if (self.socket_is_output[si]) else node.inputs
+        return sockets[self.socket_index[si]]
+
+    def link(self, node_tree, li:int):
+        """find back the link, None if the snapshot is not matching the tree anymore"""
+        if (li>=len(node_tree.links)):
+            return None
+        link = node_tree.links[li]
+        if (self.socket_id(link.from_socket)!=self.link_from[li]) or (self.socket_id(link.to_socket)!=self.link_to[li]):
+            return None
+        return link
+
+    # Traversals
+
+    def directed_links(self, si:int, direction:str='LEFT',) -> list:
+        """the links arriving to this socket if going left, or leaving it if going right"""
+        ends = self.link_to if (direction=='LEFT') else self.link_from
+        return [li for li in self.socket_links[si] if (ends[li]==si)]
+
+    def socket_intersections(self, si:int, direction:str='LEFT',) -> dict:
+        """parcour the graph from the given socket index, see 'node_utils.socket_intersections()'.
+        return a dictionary of {socket index: [link indices]}"""
+
+        result = {}
+        visited = {si}
+        queue = deque((si,))
+        is_left = (direction=='LEFT')
+
+        while queue:
+            current = queue.popleft()
+
+            for li in self.directed_links(current, direction):
+
+                if (self.link_muted[li]):
+                    continue
+
+                nxt = self.link_from[li] if (is_left) else self.link_to[li]
+                if (nxt is None) or (nxt in visited):
+                    continue
+                visited.add(nxt)
+
+                ni = self.socket_node[nxt]
+                through = None
+
+                #reroutes and muted nodes are passed through, except dead ends
+                if (self.node_idnames[ni]=='NodeReroute'):
+                    sockets = self.node_inputs[ni] if (is_left) else self.node_outputs[ni]
+                    through = sockets[0] if (sockets) else None
+                elif (self.node_muted[ni]):
+                    through = self.internal_links.get(nxt)
+                    if (through is None):
+                        continue
+
+                if (through is not None) and (self.socket_links[through]):
+                    queue.append(through)
+                    continue
+
+                result.setdefault(nxt, []).append(li)
+                continue
+
+        return result
+
+    def reachable_nodes(self, start_nodes, direction:str='RIGHT', skip_muted_links:bool=True,) -> set:
+        """get the node indices reachable from the given node indices, going left (upstream) or right (downstream)"""
+
+        is_left = (direction=='LEFT')
+        visited = set(start_nodes)
+        queue = deque(visited)
+
+        while queue:
+            ni = queue.popleft()
+            for si in (self.node_inputs[ni] if (is_left) else self.node_outputs[ni]):
+                for li in self.directed_links(si, direction):
+                    if (skip_muted_links and self.link_muted[li]):
+                        continue
+                    nxt = self.link_from[li] if (is_left) else self.link_to[li]
+                    if (nxt is None):
+                        continue
+                    nj = self.socket_node[nxt]
+                    if (nj not in visited):
+                        visited.add(nj)
+                        queue.append(nj)
+            continue
+
+        return visited
+
+    def follow_reroutes(self, si:int,) -> int:
+        """follow a reroute chain to the right from the given socket index, return the last input socket reached.
+        NOTE the chain is expected to be linear, on branches the first link is followed."""
+
+        seen = set()
+        while (si not in seen):
+            seen.add(si)
+            ni = self.socket_node[si]
+            if (self.node_idnames[ni]!='NodeReroute') or (not self.node_outputs[ni]):
+                break
+            links = self.directed_links(self.node_outputs[ni][0], 'RIGHT')
+            if (not links):
+                break
+            si = self.link_to[links[0]]
+
+        return si
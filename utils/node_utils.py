@@ -19,6 +19,9 @@ from mathutils import Vector, Matrix, Quaternion
 
 from .draw_utils import get_dpifac
 from .fct_utils import ColorRGBA
+from .prof_utils import profiled, count_socket_writes
+from .graph_utils import get_tree_graph, tag_tree_topology_dirty
+from .spatial_utils import get_spatial_index, NodesBoundsTable
 
 
 SOCK_AVAILABILITY_TABLE = {
@@ -59,88 +62,35 @@ def socket_intersections(socket, direction:str='LEFT',) -> dict:
     """ parcour a nodetree from a given socket with given direction. 
     Will return a dictionary of colliding sockets and their links route.
     Reroutes and muted nodes sockets are ignored along the way, except for dead end reroutes.
+    Muted nodes are parcoured through their internal links.
     - direction: 'LEFT' or 'RIGHT'
     - return function will return a dictionary of {socket: links}.
+    NOTE the parcour is done on the cached snapshot of the nodetree, see 'graph_utils.py'.
     """
 
-    #TODO add support for muted node or links. 
-    # - should skip parcouring if muted node, and respect internal links system.
+    node_tree = socket.id_data
 
-    result = {}  # Will store final sockets and their links
-    visited_sockets = set()  # To avoid feedback loops
-    visited_links = []  # Store all visited links
-    
-    # Start with the initial socket
-    sockets_to_process = [socket]
-    visited_sockets.add(socket)
-
-    while sockets_to_process:
-        current_socket = sockets_to_process.pop(0)
-
-        # Get all links connected to this socket
-        match direction:
-            case 'LEFT': # Going left means we look at inputs, so we need links where current_socket is the to_socket
-                links = [link for link in current_socket.links if link.to_socket == current_socket]
-            case 'RIGHT': # Going right means we look at outputs, so we need links where current_socket is the from_socket
-                links = [link for link in current_socket.links if link.from_socket == current_socket]
+    #the tree might have changed without us noticing, ex: relinked nodegroup not used by the scene.
+    #if the snapshot doesn't know this socket or its links, we parcour again on a fresh snapshot.
+    for refresh in (False, True):
 
-        for link in links:
-            
-            # ignore muted links
-            if (link.is_muted):
-                continue
-            
-            # Add link to visited links
-            visited_links.append(link)
-
-            # Determine the next socket to process
-            next_socket = link.from_socket if (direction == 'LEFT') else link.to_socket
+        graph = get_tree_graph(node_tree, refresh=refresh)
+        si = graph.socket_id(socket)
+        if (si is None):
+            continue
 
-            # Skip if we've already visited this socket
-            if (next_socket in visited_sockets):
-                continue
-            visited_sockets.add(next_socket)
-
-            # Get the node of the next socket
-            next_node = next_socket.node
-
-            # If it's a reroute node, continue traversing
-            if (next_node.bl_idname == 'NodeReroute'):
-                # For reroute, add the socket to process
-                next_socket_to_process = next_node.inputs[0] if (direction == 'LEFT') else next_node.outputs[0]
-                # Check if this reroute leads nowhere (colliding reroute)
-                if (not next_socket_to_process.links):
-                    # This is a dead end
-                    if (next_socket not in result):
-                        result[next_socket] = []
-                    result[next_socket].append(link)
-                else:
-                    sockets_to_process.append(next_socket_to_process)
-                continue
-            
-            # if the node is muted, we need to follow the internal link, skip it..
-            if (next_node.mute):
-                if (not next_node.internal_links):
-                    continue
-                internal_link = next_node.internal_links[0]
-                # For reroute, add the socket to process
-                next_socket_to_process = internal_link.from_socket if (direction == 'LEFT') else internal_link.to_socket
-                # Check if this reroute leads nowhere (colliding reroute)
-                if (not next_socket_to_process.links):
-                    # This is a dead end
-                    if (next_socket not in result):
-                        result[next_socket] = []
-                    result[next_socket].append(link)
-                else:
-                    sockets_to_process.append(next_socket_to_process)
-                continue
+        result = {}
+        for sj, lis in graph.socket_intersections(si, direction=direction).items():
+            links = [graph.link(node_tree, li) for li in lis]
+            if (None in links):
+                result = None
+                break
+            result[graph.socket(node_tree, sj)] = links
 
-            # For non-reroute nodes, add the socket to result
-            if (next_socket not in result):
-                result[next_socket] = []
-            result[next_socket].append(link)
+        if (result is not None):
+            return result
 
-    return result
+    return {}
 
 
 def get_node_objusers(node) -> set:
@@ -194,7 +144,9 @@ def get_nodes_bounds(nodes, mode:str='BOUND_PRECISE', passed_locs:tuple[Vector]=
     # so we have a few shortcuts, for optimization sake.
     match mode:
         case 'BOUND_PRECISE':
-            locs = [loc for node in nodes for loc in get_node_bounds(node)]
+            nodes = list(nodes)
+            table = NodesBoundsTable(nodes[0].id_data)
+            return table.bounds(table.indices(nodes))
         case 'LOC_FAST':
             locs = [node.location for node in nodes]
         case 'PASSED_DATA':
@@ -337,19 +289,132 @@ def get_ng_socket_defvalue(ng, idx:int, in_out:str='OUTPUT',):
             raise Exception("get_ng_socket_defvalue(): in_out arg not valid")
 
 
+#NOTE: Shadow cache of the default values we wrote.
+# 'set_ng_socket_defvalue()' is the hottest call of our info nodes, called for each of their outputs on each signal.
+# Resolving the sockets and comparing values through RNA is costly, and vector/color comparisons never match.
+# So per nodetree we keep the last values we wrote, keyed by socket identifier, as plain python values,
+# and compare them in python with a tolerance. An unchanged value is then skipped before touching any socket.
+# The shadow of a nodetree must be cleared when its interface changes, when its nodes are rebuilt (the helper nodes
+# of rotation & matrix outputs are removed), and all shadows on undo or load.
+# Only the outputs are shadowed, inputs values live on the node instances and can be changed by users anytime.
+
+_DEFVALUES_SHADOW = {} #nodetree session_uid -> {'identifiers': {lookup key: socket identifier}, 'values': {value key: plain value}, 'outputs': {name or index: (index, identifier)}}
+
+SHADOW_TOLERANCE = 1e-6
+
+def clear_ng_defvalues_shadow(ng=None) -> None:
+    """forget the values written to the given nodetree, or to all nodetrees"""
+
+    if (ng is None):
+        _DEFVALUES_SHADOW.clear()
+    else:
+        _DEFVALUES_SHADOW.pop(ng.session_uid, None)
+    return None
+
+def _get_ng_defvalues_shadow(ng) -> dict:
+    shadow = _DEFVALUES_SHADOW.get(ng.session_uid)
+    if (shadow is None):
+        shadow = _DEFVALUES_SHADOW[ng.session_uid] = {'identifiers':{}, 'values':{}, 'outputs':None,}
+    return shadow
+
+def _shadow_value(value):
+    """convert a value into a plain python value we can store and compare"""
+
+    if (value is None) or (type(value) in {bool, int, float, str}):
+        return value
+    if isinstance(value, bpy.types.ID):
+        return ('ID', value.session_uid)
+    try:
+        return tuple(v if (type(v) in {bool, int, float}) else _shadow_value(v) for v in value)
+    except TypeError:
+        return value
+
+def _shadow_equal(a, b) -> bool:
+    """compare two plain values, floats are compared with a relative tolerance"""
+
+    ta, tb = type(a), type(b)
+    if (ta is float or tb is float) and (ta in {float, int}) and (tb in {float, int}):
+        return abs(a-b) <= SHADOW_TOLERANCE * max(1.0, abs(a), abs(b))
+    if (ta is tuple and tb is tuple):
+        return (len(a)==len(b)) and all(_shadow_equal(va, vb) for va, vb in zip(a, b))
+    return (ta is tb) and (a==b)
+
+def _defvalue_differs(default_value, value) -> bool:
+    """compare a socket default_value with a value, vectors & colors needs to be compared as sequences"""
+
+    if (isinstance(default_value, str) or not hasattr(default_value, '__len__')):
+        return default_value != value
+    try:
+        return tuple(default_value) != tuple(value)
+    except TypeError:
+        return True
+
+
+def _write_output_defvalue(ng, out_nod, socket, idx:int, value) -> None:
+    """write a value to a 'Group Output' socket of the given index"""
+
+    # for some socket types, they don't have any default_values property.
+    # so we need to improvise and place a new node and link it!
+    match socket.type:
+
+        case 'ROTATION':
+            #NOTE if you want to pass a vec3 to a rotation socket, don't.
+            defnodname = f"D|Quat|outputs[{idx}]"
+            defnod = ng.nodes.get(defnodname)
+            #We cleanup nodetree and set up our input special.
+            if (defnod is None):
+                defnod = ng.nodes.new('FunctionNodeQuaternionToRotation')
+                defnod.name = defnod.label = defnodname
+                defnod.location = (out_nod.location.x, out_nod.location.y + 350)
+                #link it
+                for l in socket.links:
+                    ng.links.remove(l)
+                ng.links.new(defnod.outputs[0], socket)
+            #assign values
+            for sock,v in zip(defnod.inputs, value):
+                if (sock.default_value!=v):
+                    sock.default_value = v
+
+        case 'MATRIX':
+            defnodname = f"D|Matrix|outputs[{idx}]"
+            defnod = ng.nodes.get(defnodname)
+            #We cleanup nodetree and set up our input special.
+            if (defnod is None):
+                defnod = ng.nodes.new('FunctionNodeCombineMatrix')
+                defnod.name = defnod.label = defnodname
+                defnod.location = (out_nod.location.x + 150, out_nod.location.y + 350)
+                #link it
+                for l in socket.links:
+                    ng.links.remove(l)
+                ng.links.new(defnod.outputs[0], socket)
+                #the node comes with tainted default values
+                for inp in defnod.inputs:
+                    inp.default_value = 0
+            #assign flatten values
+            colflatten = [v for col in zip(*value) for v in col]
+            for sock,v in zip(defnod.inputs, colflatten):
+                if (sock.default_value!=v):
+                    sock.default_value = v
+
+        case _:
+            #we remove any unwanted links, if exists
+            if (socket.links):
+                for l in socket.links:
+                    ng.links.remove(l)
+            #we set def value, simply..
+            if (_defvalue_differs(socket.default_value, value)):
+                socket.default_value = value
+
+    return None
+
+
+@profiled('defvalue_writes')
 def set_ng_socket_defvalue(ng, idx:int=None, socket=None, socket_name:str='', in_out:str='OUTPUT', value=None, node=None,):
     """for a NodeCustomGroup: set the value of the given nodegroups inputs or output sockets"""
 
     assert in_out in {'INPUT','OUTPUT'}, "set_ng_socket_defvalue(): in_out arg not valid"
 
-    in_nod, out_nod = ng.nodes["Group Input"], ng.nodes["Group Output"]
-
-    if (socket_name):
-        match in_out:
-            case 'OUTPUT': socket = out_nod.inputs[socket_name]
-            case 'INPUT':  socket = in_nod.outputs[socket_name]
-
-    assert not (idx is None and socket is None), "Please pass either a socket, an index to a socket, or a socket name"
+    assert not (idx is None and socket is None and not socket_name), "Please pass either a socket, an index to a socket, or a socket name"
 
     #convert color to list
     if type(value) is ColorRGBA:
@@ -359,6 +424,28 @@ def set_ng_socket_defvalue(ng, idx:int=None, socket=None, socket_name:str='', in
     if (ng.type=='COMPOSITING' and type(value) is bool):
         value = int(value)
 
+    #did we already write this value? find the socket identifier back from the shadow & compare.
+    #NOTE inputs values are living on the node instances, users can change them anytime, they are not shadowed.
+    # '_defvalue_differs()' compares them with the live instance value instead.
+    shadow = _get_ng_defvalues_shadow(ng)
+    lookup = (in_out, idx, socket_name) if (socket is None) else None
+    identifier = shadow['identifiers'].get(lookup) if (lookup) else socket.identifier
+    plainvalue = _shadow_value(value)
+    if (in_out=='OUTPUT') and (identifier is not None):
+        valkey = (in_out, identifier, None)
+        if (valkey in shadow['values']) and _shadow_equal(shadow['values'][valkey], plainvalue):
+            return None
+
+    if (in_out=='OUTPUT'):
+        count_socket_writes()
+
+    in_nod, out_nod = ng.nodes["Group Input"], ng.nodes["Group Output"]
+
+    if (socket_name):
+        match in_out:
+            case 'OUTPUT': socket = out_nod.inputs[socket_name]
+            case 'INPUT':  socket = in_nod.outputs[socket_name]
+
     # setting a default value of a input is very different from an output.
     #  - set a defaultval input can only be done by changing all node instances input of that nodegroup..
     #  - set a defaultval output can be done within the ng
@@ -379,58 +466,7 @@ def set_ng_socket_defvalue(ng, idx:int=None, socket=None, socket_name:str='', in
                         idx = i
                         break
 
-            # for some socket types, they don't have any default_values property.
-            # so we need to improvise and place a new node and link it!
-            match socket.type:
-
-                case 'ROTATION':
-                    #NOTE if you want to pass a vec3 to a rotation socket, don't.
-                    defnodname = f"D|Quat|outputs[{idx}]"
-                    defnod = ng.nodes.get(defnodname)
-                    #We cleanup nodetree and set up our input special.
-                    if (defnod is None):
-                        defnod = ng.nodes.new('FunctionNodeQuaternionToRotation')
-                        defnod.name = defnod.label = defnodname
-                        defnod.location = (out_nod.location.x, out_nod.location.y + 350)
-                        #link it
-                        for l in socket.links:
-                            ng.links.remove(l)
-                        ng.links.new(defnod.outputs[0], socket)
-                    #assign values
-                    for sock,v in zip(defnod.inputs, value):
-                        if (sock.default_value!=v):
-                            sock.default_value = v
-
-                case 'MATRIX':
-                    defnodname = f"D|Matrix|outputs[{idx}]"
-                    defnod = ng.nodes.get(defnodname)
-                    #We cleanup nodetree and set up our input special.
-                    if (defnod is None):
-                        defnod = ng.nodes.new('FunctionNodeCombineMatrix')
-                        defnod.name = defnod.label = defnodname
-                        defnod.location = (out_nod.location.x + 150, out_nod.location.y + 350)
-                        #link it
-                        for l in socket.links:
-                            ng.links.remove(l)
-                        ng.links.new(defnod.outputs[0], socket)
-                        #the node comes with tainted default values
-                        for inp in defnod.inputs:
-                            inp.default_value = 0
-                    #assign flatten values
-                    colflatten = [v for col in zip(*value) for v in col]
-                    for sock,v in zip(defnod.inputs, colflatten):
-                        if (sock.default_value!=v):
-                            sock.default_value = v
-
-                case _:
-                    #we remove any unwanted links, if exists
-                    if (socket.links):
-                        for l in socket.links:
-                            ng.links.remove(l)
-                    #we set def value, simply..
-                    #NOTE Vector/Color won't like that, will always be False.. need to use [:]!=[:] for two vec..
-                    if (socket.default_value!=value):
-                        socket.default_value = value
+            _write_output_defvalue(ng, out_nod, socket, idx, value)
 
         case 'INPUT':
 
@@ -449,13 +485,73 @@ def set_ng_socket_defvalue(ng, idx:int=None, socket=None, socket_name:str='', in
             if (instancesocket.type in {'ROTATION','MATRIX'}):
                 return None
             
-            #NOTE Vector/Color won't like that, will always be False.. need to use [:]!=[:] for two vec..
-            if (instancesocket.default_value!=value):
+            if (_defvalue_differs(instancesocket.default_value, value)):
                 instancesocket.default_value = value
+                count_socket_writes()
+
+    #remember what we wrote
+    if (socket is None):
+        socket = out_nod.inputs[idx] if (in_out=='OUTPUT') else in_nod.outputs[idx]
+    identifier = socket.identifier
+    if (lookup):
+        shadow['identifiers'][lookup] = identifier
+    if (in_out=='OUTPUT'):
+        shadow['values'][(in_out, identifier, None)] = plainvalue
 
     return None
 
 
+@profiled('defvalue_writes')
+def set_ng_socket_defvalues(ng, values:dict,) -> int:
+    """for a NodeCustomGroup: set the values of many nodegroup outputs in a single pass.
+    - 'values': {socket name or index: value}. Unchanged values are skipped.
+    - The sockets are resolved from a map built once per nodetree interface revision.
+    Return the number of sockets written."""
+
+    shadow = _get_ng_defvalues_shadow(ng)
+    written = shadow['values']
+    is_compositor = (ng.type=='COMPOSITING')
+
+    #name or index -> (index, identifier), cleared with the shadow when the interface changes
+    outputs = shadow['outputs']
+    if (outputs is None):
+        outputs = shadow['outputs'] = {}
+        for i,s in enumerate(ng.nodes["Group Output"].inputs):
+            outputs[i] = (i, s.identifier)
+            outputs.setdefault(s.name, (i, s.identifier))
+
+    out_nod = None
+    count = 0
+
+    for k,value in values.items():
+
+        idx, identifier = outputs[k]
+
+        if type(value) is ColorRGBA:
+            value = value[:]
+        if (is_compositor and type(value) is bool):
+            value = int(value)
+
+        valkey = ('OUTPUT', identifier, None)
+        plainvalue = _shadow_value(value)
+        if (valkey in written) and _shadow_equal(written[valkey], plainvalue):
+            continue
+
+        if (out_nod is None):
+            out_nod = ng.nodes["Group Output"]
+        _write_output_defvalue(ng, out_nod, out_nod.inputs[idx], idx, value)
+
+        written[valkey] = plainvalue
+        count += 1
+        continue
+
+    if (count):
+        count_socket_writes(count)
+
+    return count
+
+
+@profiled('socket_interface')
 def set_ng_socket_label(ng, idx:int=None, in_out:str='OUTPUT', label:str='', identifier:str=None,) -> None:
     """for a NodeCustomGroup: return the label of the given nodegroups output at given socket idx"""
     if (not label):
@@ -463,6 +559,7 @@ def set_ng_socket_label(ng, idx:int=None, in_out:str='OUTPUT', label:str='', ide
     sockui = get_socketui_from_ng_socket(ng, idx=idx, in_out=in_out, identifier=identifier,)
     if (sockui.name!=label):
         sockui.name = label
+        clear_ng_defvalues_shadow(ng)
     return None  
 
 
@@ -473,6 +570,7 @@ def get_ng_socket_type(ng, idx:int=None, in_out:str='OUTPUT', identifier:str=Non
     return sockui.socket_type
 
 
+@profiled('socket_interface')
 def set_ng_socket_type(ng, idx:int=None, in_out:str='OUTPUT', socket_type:str="NodeSocketFloat", identifier:str=None,):
     """for a NodeCustomGroup: set socket type via bpy.ops.node.tree_socket_change_type() with manual override, context MUST be the geometry node editor"""
     #NOTE blender bug: you might need to use the return value because the original socket after change will be dirty.
@@ -481,9 +579,11 @@ def set_ng_socket_type(ng, idx:int=None, in_out:str='OUTPUT', socket_type:str="N
     sockui = get_socketui_from_ng_socket(ng, idx=idx, in_out=in_out, identifier=identifier,)
     if (sockui.socket_type!=socket_type):
         sockui.socket_type = socket_type
+        clear_ng_defvalues_shadow(ng)
     return get_ng_socket_from_socketui(ng, sockui, in_out=in_out)
 
 
+@profiled('socket_interface')
 def set_ng_socket_description(ng, idx:int=None, in_out:str='OUTPUT', description:str='', identifier:str=None,) -> None:
     """for a NodeCustomGroup: set the description of the given nodegroups socket"""
 
@@ -500,6 +600,7 @@ def get_ng_socket_description(ng, idx:int=None, in_out:str='OUTPUT', identifier:
     return sockui.description
 
 
+@profiled('socket_interface')
 def create_ng_socket(ng, in_out:str='OUTPUT', socket_type:str="NodeSocketFloat",
     socket_name:str="Value", socket_description:str="",): #socket_custom_info:dict=None,):
     """for a NodeCustomGroup: create a new socket output of given type for given nodegroup."""
@@ -545,20 +646,24 @@ def create_ng_socket(ng, in_out:str='OUTPUT', socket_type:str="NodeSocketFloat",
     socket_type = crosseditor_socktype_adjust(socket_type, ng.type)
 
     sockui = ng.interface.new_socket(socket_name, in_out=in_out, socket_type=socket_type,)
+    clear_ng_defvalues_shadow(ng)
     if (socket_description):
         sockui.description = socket_description
     return get_ng_socket_from_socketui(ng, sockui, in_out=in_out)
 
 
+@profiled('socket_interface')
 def remove_ng_socket(ng, idx:int, in_out:str='OUTPUT',) -> None:
     """for a NodeCustomGroup: remove a nodegroup socket output at given index"""
         
     itm = get_socketui_from_ng_socket(ng, idx, in_out=in_out,)
     ng.interface.remove(itm)
+    clear_ng_defvalues_shadow(ng)
     
     return None 
 
 
+@profiled('node_creation')
 def create_ng_constant_node(ng, nodetype:str, value, uniquetag:str, location:str='auto', width:int=200,):
     """for a NodeCustomGroup: add a new constant input node in nodetree if not existing, ensure it's value"""
 
@@ -665,6 +770,7 @@ def import_new_nodegroup(blendpath, ngname, tree_type='GeometryNodeTree'):
     return None
 
 
+@profiled('linking')
 def link_sockets(socket1, socket2):
     """link two nodes together in a nodetree"""
     # if not issubclass(type(socket1), bpy.types.NodeSocket):
@@ -686,8 +792,8 @@ def replace_node_by_ng(node_tree, old_node, node_group):
     old_inputs_defaults = [getattr(sock, 'default_value', None) for sock in old_node.inputs]
     old_inputs_links = [sock.links[0].from_socket if sock.links else None for sock in old_node.inputs]
 
-    # For outputs, store the linked to_socket (if exists)
-    old_outputs_links = [sock.links[0].to_socket if sock.links else None for sock in old_node.outputs]
+    # For outputs, store all the linked to_sockets
+    old_outputs_links = [[l.to_socket for l in sock.links] for sock in old_node.outputs]
 
     # Determine the appropriate node type for a node group.
     ng_type = TREE_TO_GROUP_EQUIV.get(node_tree.bl_idname)
@@ -720,13 +826,15 @@ def replace_node_by_ng(node_tree, old_node, node_group):
 
     # Re-create output links.
     for i, sock in enumerate(new_node.outputs):
-        if (i < len(old_outputs_links) and old_outputs_links[i] is not None):
-            try: node_tree.links.new(sock, old_outputs_links[i])
-            except Exception as e: print(f"Warning: Could not re-link output '{sock.name}': {e}")
+        if (i < len(old_outputs_links)):
+            for to_socket in old_outputs_links[i]:
+                try: node_tree.links.new(sock, to_socket)
+                except Exception as e: print(f"Warning: Could not re-link output '{sock.name}': {e}")
     
     return new_node
 
 
+@profiled('node_creation')
 def frame_nodes(node_tree, *nodes, label:str="Frame",) -> None:
     """Create a Frame node in the given node_tree and parent the specified nodes to it."""
 
@@ -764,6 +872,16 @@ def get_nearest_node_at_position(
     if (forbidden is None):
         forbidden = []
 
+    #when given the nodes of a tree, query the spatial index of the tree instead of scanning all nodes
+    if (optimize) and isinstance(nodes, bpy.types.Nodes):
+        node_tree = nodes.id_data
+        index = get_spatial_index(node_tree)
+        forbidden_names = {n.name for n in forbidden}
+        for i in index.query_nearest(x, y, radius=500):
+            if (index.names[i] not in forbidden_names):
+                return node_tree.nodes[i]
+        return None
+
     # Make a list of each corner (and middle of border) for each node.
     # Will be sorted to find nearest point and thus nearest node
     _nodespts = []
@@ -821,27 +939,12 @@ def get_nearest_node_at_position(
 
 
 def get_farest_node(node_tree, mode='BOTTOM_RIGHT',):
-    """find the lowest/rightest node in nodetree"""
+    """find the lowest/rightest node in nodetree, from the nodes absolute locations"""
     
     assert node_tree and node_tree.nodes, "Nodetree given is empty?"
 
-    # Initialize to extreme values; adjust if you expect nodes to have negative positions.
-    farest = None
-
-    match mode:
-        case 'RIGHT'|'LEFT'|'TOP'|'BOTTOM':
-            axis = 0 if (mode in {'RIGHT','LEFT'}) else 1
-            func = max if (mode in {'TOP','RIGHT'}) else min
-            farest = func(node_tree.nodes[:], key=lambda n: n.location[axis])
-
-        case 'BOTTOM_RIGHT':
-            max_x, min_y = -1e6, 1e6
-            for node in node_tree.nodes:
-                x, y = node.location
-                if ((x > max_x) or \
-                ((x == max_x) and (y < min_y))):
-                    farest = node
-                    max_x, min_y = x, y
+    table = NodesBoundsTable(node_tree)
+    farest = node_tree.nodes[table.farthest(mode)]
 
     return farest
 
@@ -873,22 +976,31 @@ def cache_booster_nodes_parent_tree(node_tree):
     _CACHE_BOOSTER_NODES_PARENT_TREES[nt_type].add(node_tree.session_uid)
     return None
 
+def is_booster_parent_tree_candidate(node_tree) -> bool:
+    """can this nodetree be a parent of booster nodes we keep track of?
+    The scan below & the registry hooks must agree on the same set of nodetrees, see 'check_booster_nodes_registry()'"""
+
+    #we ignore specific ng names
+    if (not node_tree.is_embedded_data) and ('NODEBOOSTER' in node_tree.name.upper()):
+        return False
+    return True
+
 def cache_all_booster_nodes_parent_trees():
     """find all parent nodetrees of booster nodes. 
     Filling '_CACHE_BOOSTER_NODES_PARENT_TREES' cache.."""
 
-    #get all nodes of all materials
-    for mat in bpy.data.materials:
-        if (mat.use_nodes and mat.node_tree):
-            for n in mat.node_tree.nodes:
-                if n.bl_idname.startswith('NODEBOOSTER_'):
-                    _CACHE_BOOSTER_NODES_PARENT_TREES['ShaderNodeTree'].add(mat.node_tree.session_uid)
+    #get all nodes of all materials & worlds
+    for owner in (*bpy.data.materials, *bpy.data.worlds):
+        if (owner.node_tree):
+            for n in owner.node_tree.nodes:
+                if ('NodeBooster' in n.bl_idname):
+                    _CACHE_BOOSTER_NODES_PARENT_TREES['ShaderNodeTree'].add(owner.node_tree.session_uid)
                     break
     #get all nodes of the compositor base tree
     for scn in bpy.data.scenes:
-        if (scn.use_nodes and scn.node_tree):
+        if (scn.node_tree):
             for n in scn.node_tree.nodes:
-                if n.bl_idname.startswith('NODEBOOSTER_'):
+                if ('NodeBooster' in n.bl_idname):
                     _CACHE_BOOSTER_NODES_PARENT_TREES['CompositorNodeTree'].add(scn.node_tree.session_uid)
                     break
     #search all ng
@@ -898,11 +1010,10 @@ def cache_all_booster_nodes_parent_trees():
         if (nt_type not in {'ShaderNodeTree','CompositorNodeTree','GeometryNodeTree'}):
             print(f"ERROR: cache_all_booster_nodes_parent_trees(): type {nt_type} not in '{_CACHE_BOOSTER_NODES_PARENT_TREES.keys()}'")
             continue
-        #we ignore specific ng names?
-        if ('NODEBOOSTER' in ng.name.upper()):
+        if (not is_booster_parent_tree_candidate(ng)):
             continue
         for n in ng.nodes:
-            if n.bl_idname.startswith('NODEBOOSTER_'):
+            if ('NodeBooster' in n.bl_idname):
                 _CACHE_BOOSTER_NODES_PARENT_TREES[nt_type].add(ng.session_uid)
                 break
         continue
@@ -914,7 +1025,7 @@ def get_cached_booster_nodes(by_idnames:set=None,) -> set:
 
     shader_tree_uids = _CACHE_BOOSTER_NODES_PARENT_TREES['ShaderNodeTree']
     if (shader_tree_uids):
-        mat_nt = [mat.node_tree for mat in bpy.data.materials if (mat.use_nodes and mat.node_tree and (mat.node_tree.session_uid in shader_tree_uids))]
+        mat_nt = [mat.node_tree for mat in (*bpy.data.materials, *bpy.data.worlds) if (mat.node_tree and (mat.node_tree.session_uid in shader_tree_uids))]
         shd_nt = [ng for ng in bpy.data.node_groups if (ng.type=='SHADER' and (ng.session_uid in shader_tree_uids))]
     else:
         mat_nt = []
@@ -922,7 +1033,7 @@ def get_cached_booster_nodes(by_idnames:set=None,) -> set:
 
     compositor_tree_uids = _CACHE_BOOSTER_NODES_PARENT_TREES['CompositorNodeTree']
     if (compositor_tree_uids):
-        scn_nt = [scn.node_tree for scn in bpy.data.scenes if (scn.use_nodes and scn.node_tree and (scn.node_tree.session_uid in compositor_tree_uids))]
+        scn_nt = [scn.node_tree for scn in bpy.data.scenes if (scn.node_tree and (scn.node_tree.session_uid in compositor_tree_uids))]
         comp_ng = [ng for ng in bpy.data.node_groups if (ng.type=='COMPOSITING' and (ng.session_uid in compositor_tree_uids))]
     else:
         scn_nt = []
@@ -936,13 +1047,193 @@ def get_cached_booster_nodes(by_idnames:set=None,) -> set:
 
     if (by_idnames):
           return set(n for nt in set(mat_nt + shd_nt + scn_nt + comp_ng + geo_ng) for n in nt.nodes if (n.bl_idname in by_idnames))
-    else: return set(n for nt in set(mat_nt + shd_nt + scn_nt + comp_ng + geo_ng) for n in nt.nodes if n.bl_idname.startswith('NODEBOOSTER_NG_'))
- 
+    else: return set(n for nt in set(mat_nt + shd_nt + scn_nt + comp_ng + geo_ng) for n in nt.nodes if ('NodeBooster' in n.bl_idname))
+
+
+#NOTE: Event indexed registry of booster nodes.
+# the scan above needs to loop over all materials, scenes and nodegroups, then all nodes of the cached trees.
+# Instead, our nodes register themselves on init/copy/update and unregister on free, see 'add_booster_registry_hooks()',
+# and the registry is rebuilt on file load. We can then find back k nodes of given idnames in O(k).
+# Like for the cache above, we don't store bpy objects, we store how to find them back:
+# the owner ID type and name of their nodetree, and their name. Entries that cannot be resolved are dropped.
+# Renaming nodes or nodetrees will lose entries until the node is updated, or until the periodic consistency check.
+# The registry & the scan must cover the same nodetrees, see 'is_booster_parent_tree_candidate()'.
+
+_BOOSTER_NODES_REGISTRY = {} #bl_idname -> {(nodetree session_uid, node name) : (owner type, owner name, node name)}
+
+def get_node_tree_owner(node_tree) -> tuple:
+    """get the (owner type, owner name) of a nodetree, needed to find the nodetree back by name"""
+
+    if (not node_tree.is_embedded_data):
+        return ('NODEGROUP', node_tree.name)
+
+    match node_tree.type:
+        case 'SHADER':
+            for mat in bpy.data.materials:
+                if (mat.node_tree==node_tree):
+                    return ('MATERIAL', mat.name)
+            for wo in bpy.data.worlds:
+                if (wo.node_tree==node_tree):
+                    return ('WORLD', wo.name)
+        case 'COMPOSITING':
+            for scn in bpy.data.scenes:
+                if (scn.node_tree==node_tree):
+                    return ('SCENE', scn.name)
+
+    return (None, None)
+
+def get_node_tree_from_owner(owner_type:str, owner_name:str):
+    """find a nodetree back from its (owner type, owner name)"""
+
+    match owner_type:
+        case 'NODEGROUP':
+            return bpy.data.node_groups.get(owner_name)
+        case 'MATERIAL':
+            owner = bpy.data.materials.get(owner_name)
+        case 'WORLD':
+            owner = bpy.data.worlds.get(owner_name)
+        case 'SCENE':
+            owner = bpy.data.scenes.get(owner_name)
+        case _:
+            return None
+
+    return owner.node_tree if (owner) else None
+
+def register_booster_node(node) -> None:
+    """add the node to the booster nodes registry, cheap if already registered"""
+
+    node_tree = node.id_data
+    key = (node_tree.session_uid, node.name)
+
+    nodes = _BOOSTER_NODES_REGISTRY.get(node.bl_idname)
+    if (nodes is None):
+        nodes = _BOOSTER_NODES_REGISTRY[node.bl_idname] = {}
+    elif (key in nodes):
+        return None
+
+    #same trees as the scan, or the consistency check would never agree
+    if (not is_booster_parent_tree_candidate(node_tree)):
+        return None
+
+    owner_type, owner_name = get_node_tree_owner(node_tree)
+    if (owner_type is None):
+        return None
+
+    nodes[key] = (owner_type, owner_name, node.name)
+    return None
+
+def unregister_booster_node(node) -> None:
+    """remove the node from the booster nodes registry"""
+
+    nodes = _BOOSTER_NODES_REGISTRY.get(node.bl_idname)
+    if (nodes):
+        nodes.pop((node.id_data.session_uid, node.name), None)
+    return None
+
+def rebuild_booster_nodes_registry() -> None:
+    """rebuild the registry from a full scan of the file, ex: on file load"""
+
+    cache_all_booster_nodes_parent_trees()
+
+    _BOOSTER_NODES_REGISTRY.clear()
+    for n in get_cached_booster_nodes():
+        register_booster_node(n)
+
+    return None
+
+def check_booster_nodes_registry() -> bool:
+    """compare the registry with a full scan of the file, rebuild it if inconsistent. Return True if it was consistent"""
+
+    cache_all_booster_nodes_parent_trees()
+    scanned = {(n.bl_idname, n.id_data.session_uid, n.name) for n in get_cached_booster_nodes()}
+    registered = {(idname, *key) for idname, nodes in _BOOSTER_NODES_REGISTRY.items() for key in nodes}
+
+    if (scanned==registered):
+        return True
+
+    rebuild_booster_nodes_registry()
+    return False
+
+def get_registered_booster_nodes(by_idnames:set=None,) -> list:
+    """get the registered nodes instances of the given idnames, or all of them"""
+
+    if (not by_idnames):
+        by_idnames = list(_BOOSTER_NODES_REGISTRY.keys())
+
+    found = []
+    trees = {} #resolved nodetrees per owner, avoid finding the same tree many times
+
+    for idname in by_idnames:
+        nodes = _BOOSTER_NODES_REGISTRY.get(idname)
+        if (not nodes):
+            continue
+
+        for key, (owner_type, owner_name, node_name) in list(nodes.items()):
+
+            owner = (owner_type, owner_name)
+            node_tree = trees.get(owner)
+            if (node_tree is None):
+                node_tree = trees[owner] = get_node_tree_from_owner(owner_type, owner_name)
+
+            node = node_tree.nodes.get(node_name) if (node_tree) else None
+
+            #stale entry? the node or its nodetree might have been removed or renamed.
+            if (node is None) or (node.bl_idname!=idname) or (node_tree.session_uid!=key[0]):
+                del nodes[key]
+                continue
+
+            found.append(node)
+            continue
+
+    return found
+
+def add_booster_registry_hooks(cls) -> None:
+    """wrap the node class init/copy/free/update methods, so the instances are kept in the booster nodes registry.
+    NOTE blender checks the arguments count of these methods on registration, we keep their exact signatures"""
+
+    if (getattr(cls, '_registry_hooked', False)):
+        return None
+
+    _init, _copy, _free, _update = (getattr(cls, name, None) for name in ('init','copy','free','update'))
+
+    def init(self, context):
+        if (_init):
+            _init(self, context)
+        register_booster_node(self)
+        return None
+
+    def copy(self, node):
+        if (_copy):
+            _copy(self, node)
+        register_booster_node(self)
+        return None
+
+    def free(self):
+        unregister_booster_node(self)
+        if (_free):
+            _free(self)
+        return None
+
+    def update(self):
+        #blender calls update() on topology changes of the parent tree, its snapshot is outdated.
+        #tagged first, the node update might already traverse the tree. ex: interpolation evaluators.
+        tag_tree_topology_dirty(self.id_data)
+        if (_update):
+            _update(self)
+        register_booster_node(self)
+        return None
+
+    cls.init, cls.copy, cls.free, cls.update = init, copy, free, update
+    #the original update, for refreshes which are not topology changes. see 'queue_utils.flush_refresh_queue()'
+    cls._unhooked_update = _update
+    cls._registry_hooked = True
+    return None
+
 
 def get_booster_nodes(by_idnames:set=None,) -> set:
     """get nodes instances across many nodetree editor types.
     - 'by_idnames': only get nodes included in the set of given id names.
     """
-    return get_cached_booster_nodes(by_idnames=by_idnames)                                                                               
+    return set(get_registered_booster_nodes(by_idnames=by_idnames))                                                                               
                                                                                                                             
                                                                                                                             
\ No newline at end of file
@@ -0,0 +1,275 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE lightweight profiling utilities.
+#  - A 'ProfileSession' collect timed phases while it's active. Phases can be nested, we keep both the
+#    inclusive events (for chrome-trace visualization) and the exclusive 'self' time per phase name.
+#  - Functions decorated with '@profiled(phase)' cost a single global check when no session is active.
+#  - Chrome-trace json can be opened in 'chrome://tracing' or 'https://ui.perfetto.dev'.
+
+# NOTE about instrumentation:
+#  - Unlike sessions, instrumentation is always-on once enabled (see 'debug_instrumentation' in the addon prefs).
+#    Each handler signal and node class update is measured with 'instrument(kind, name)', along with the
+#    number of socket values actually written meanwhile, see 'count_socket_writes()'.
+#  - The last measures of each (kind, name) are kept in a ring buffer, we derive counts, total/mean/p95 from them.
+
+import os
+import json
+import time
+import functools
+from collections import deque
+
+
+_ACTIVE_SESSIONS = [] #stack of active sessions, only the last one is recording.
+
+_INSTRUMENTATION = {'enabled':False, 'writes':0, 'origin':time.perf_counter(),}
+_INSTRUMENTATION_RECORDS = {} #(kind, name) -> ring buffer of (start, duration, writes, depth)
+_INSTRUMENTATION_DEPTH = [0]
+
+INSTRUMENTATION_RING_SIZE = 2048
+
+
+class ProfileSession():
+    """record timed phases between 'start()' and 'stop()'"""
+
+    def __init__(self, name:str, **metadata):
+        self.name = name
+        self.metadata = metadata
+        self.begin = self.end = 0.0
+        self.phases = {}  #phase name -> [exclusive time in seconds, calls count]
+        self.events = []  #(phase name, start, duration, depth)
+        self._stack = []  #[phase name, start, children time]
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.begin
+
+    def start(self):
+        self.begin = time.perf_counter()
+        _ACTIVE_SESSIONS.append(self)
+        return self
+
+    def stop(self):
+        self.end = time.perf_counter()
+        if (self in _ACTIVE_SESSIONS):
+            _ACTIVE_SESSIONS.remove(self)
+        return self
+
+    def push(self, phase:str):
+        self._stack.append([phase, time.perf_counter(), 0.0])
+        return None
+
+    def pop(self):
+        phase, start, children = self._stack.pop()
+        duration = time.perf_counter() - start
+
+        stat = self.phases.setdefault(phase, [0.0, 0])
+        stat[0] += duration - children
+        stat[1] += 1
+
+        if (self._stack):
+            self._stack[-1][2] += duration
+
+        self.events.append((phase, start, duration, len(self._stack)))
+        return None
+
+    def summary(self) -> dict:
+        """return a json compatible summary of this session, times in milliseconds"""
+
+        return {
+            'name': self.name,
+            'total_ms': self.duration*1000,
+            'phases': {k:{'self_ms':v[0]*1000, 'calls':v[1]} for k,v in self.phases.items()},
+            **self.metadata,
+            }
+
+    def chrome_trace_events(self, pid:int=0, tid:int=0, origin:float=None,) -> list:
+        """convert this session into a list of chrome-trace 'complete' events"""
+
+        if (origin is None):
+            origin = self.begin
+
+        events = [{'name':self.name, 'cat':'session', 'ph':'X', 'pid':pid, 'tid':tid,
+                   'ts':(self.begin-origin)*1e6, 'dur':self.duration*1e6, 'args':dict(self.metadata),},]
+        for phase, start, duration, _ in self.events:
+            events.append({'name':phase, 'cat':'phase', 'ph':'X', 'pid':pid, 'tid':tid,
+                           'ts':(start-origin)*1e6, 'dur':duration*1e6,})
+        return events
+
+
+class profile_phase():
+    """context manager timing a phase in the active session, if any"""
+
+    __slots__ = ('phase','session',)
+
+    def __init__(self, phase:str):
+        self.phase = phase
+        self.session = None
+
+    def __enter__(self):
+        if (_ACTIVE_SESSIONS):
+            self.session = _ACTIVE_SESSIONS[-1]
+            self.session.push(self.phase)
+        return self
+
+    def __exit__(self, *args):
+        if (self.session is not None):
+            self.session.pop()
+            self.session = None
+        return False
+
+
+def profiled(phase:str):
+    """decorator timing the function as a phase of the active session, if any"""
+
+    def decorator(fct):
+        @functools.wraps(fct)
+        def wrapper(*args, **kwargs):
+            if (not _ACTIVE_SESSIONS):
+                return fct(*args, **kwargs)
+            session = _ACTIVE_SESSIONS[-1]
+            session.push(phase)
+            try:
+                return fct(*args, **kwargs)
+            finally:
+                session.pop()
+        return wrapper
+
+    return decorator
+
+
+def is_profiling() -> bool:
+    return bool(_ACTIVE_SESSIONS)
+
+
+def write_chrome_trace(filepath:str, sessions:list, pid:int=0,) -> str:
+    """write the given sessions into a chrome-trace json file. Sessions are laid out on their original timeline"""
+
+    sessions = [s for s in sessions if s.end]
+    origin = min((s.begin for s in sessions), default=0.0)
+
+    events = []
+    for s in sessions:
+        events += s.chrome_trace_events(pid=pid, origin=origin,)
+
+    filepath = os.path.abspath(filepath)
+    with open(filepath, 'w') as f:
+        json.dump({'traceEvents':events, 'displayTimeUnit':'ms',}, f,)
+
+    return filepath
+
+
+def set_instrumentation(enabled:bool) -> None:
+    _INSTRUMENTATION['enabled'] = enabled
+    return None
+
+def is_instrumenting() -> bool:
+    return _INSTRUMENTATION['enabled']
+
+def clear_instrumentation() -> None:
+    _INSTRUMENTATION_RECORDS.clear()
+    _INSTRUMENTATION['origin'] = time.perf_counter()
+    return None
+
+def count_socket_writes(count:int=1) -> None:
+    """to be called when socket values are written"""
+    _INSTRUMENTATION['writes'] += count
+    return None
+
+def get_socket_writes() -> int:
+    """number of socket values written since startup, compare two calls to know if anything was written meanwhile"""
+    return _INSTRUMENTATION['writes']
+
+
+class instrument():
+    """context manager measuring a handler or node update, if instrumentation is enabled"""
+
+    __slots__ = ('key','start','writes',)
+
+    def __init__(self, kind:str, name:str):
+        self.key = (kind, name)
+        self.start = None
+
+    def __enter__(self):
+        if (_INSTRUMENTATION['enabled']):
+            self.writes = _INSTRUMENTATION['writes']
+            _INSTRUMENTATION_DEPTH[0] += 1
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        if (self.start is not None):
+            duration = time.perf_counter() - self.start
+            _INSTRUMENTATION_DEPTH[0] -= 1
+            records = _INSTRUMENTATION_RECORDS.get(self.key)
+            if (records is None):
+                records = _INSTRUMENTATION_RECORDS[self.key] = deque(maxlen=INSTRUMENTATION_RING_SIZE)
+            records.append((self.start, duration, _INSTRUMENTATION['writes']-self.writes, _INSTRUMENTATION_DEPTH[0]))
+            self.start = None
+        return False
+
+
+def instrumented(kind:str, name:str):
+    """decorator measuring the function with 'instrument()'"""
+
+    def decorator(fct):
+        @functools.wraps(fct)
+        def wrapper(*args, **kwargs):
+            with instrument(kind, name):
+                return fct(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def get_instrumentation_stats() -> list:
+    """return a list of json compatible stats per (kind, name), sorted by total time, times in milliseconds"""
+
+    stats = []
+    for (kind, name), records in _INSTRUMENTATION_RECORDS.items():
+        if (not records):
+            continue
+        durations = sorted(r[1] for r in records)
+        total = sum(durations)
+        stats.append({
+            'kind': kind,
+            'name': name,
+            'count': len(durations),
+            'total_ms': total*1000,
+            'mean_ms': total/len(durations)*1000,
+            'p95_ms': durations[min(len(durations)-1, int(len(durations)*0.95))]*1000,
+            'max_ms': durations[-1]*1000,
+            'writes': sum(r[2] for r in records),
+            })
+
+    stats.sort(key=lambda d: d['total_ms'], reverse=True)
+    return stats
+
+
+def write_instrumentation(filepath:str, format:str='JSON',) -> str:
+    """write the instrumentation records, either as a 'JSON' stats summary, or as a 'CHROME' trace"""
+
+    match format:
+
+        case 'JSON':
+            data = {'ring_size':INSTRUMENTATION_RING_SIZE, 'stats':get_instrumentation_stats(),}
+
+        case 'CHROME':
+            origin = _INSTRUMENTATION['origin']
+            events = []
+            for (kind, name), records in _INSTRUMENTATION_RECORDS.items():
+                for start, duration, writes, depth in records:
+                    events.append({'name':name, 'cat':kind, 'ph':'X', 'pid':0, 'tid':0,
+                                   'ts':(start-origin)*1e6, 'dur':duration*1e6, 'args':{'writes':writes,},})
+            events.sort(key=lambda e: e['ts'])
+            data = {'traceEvents':events, 'displayTimeUnit':'ms',}
+
+        case _:
+            raise ValueError(f"write_instrumentation(): format '{format}' not supported")
+
+    filepath = os.path.abspath(filepath)
+    with open(filepath, 'w') as f:
+        json.dump(data, f,)
+
+    return filepath
@@ -0,0 +1,277 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE deferred & coalesced rebuilds of our nodes.
+#  - Some property 'update=' callbacks are triggering heavy rebuilds (ex: a math expression re-generating its
+#    nodetree). Dragging a slider or editing properties from a script can call them dozens of times per second.
+#  - Instead, these callbacks queue their rebuild with 'queue_node_rebuild(node, method)'. The queue is flushed
+#    once from a single 'bpy.app.timers' tick, multiple requests for the same node & method collapse into one.
+#  - On flush, the nodes are ordered by dependency: nodetrees nested in other queued nodetrees first, then
+#    within a nodetree, upstream nodes before the downstream nodes they feed.
+
+# NOTE batched refresh signals.
+#  - Our interpolation nodes need their downstream consumers (ex: 'Map Values') to evaluate again when their values
+#    change. We used to send this signal by removing & re-creating the links of their output, which triggers a
+#    full topology update of the tree and churns links. Consumers also toggled the 'mute' of their curve nodes
+#    twice to force the evaluation of their nodegroups.
+#  - Instead, 'queue_node_refresh(node)' collects the kicked nodes during a tick. On flush, per nodetree, the booster
+#    nodes downstream of the kicked ones get their 'update()' called once, and the nodetree is tagged once for
+#    the depsgraph. The original 'update()' is called, not the registry hook, as the topology did not change. 'queue_tree_refresh(node_tree)' only requests the depsgraph tag.
+#  - 'get_refresh_stats()' counts the kicks, the updates and tags issued, and the links churned by the legacy
+#    relink fallback, used when a nodetree can't be found back by owner. See 'bench_utils' for a comparison.
+#  - On render farms or in background mode, timers are not running, rebuilds are called right away and refresh
+#    requests are flushed right away.
+
+# NOTE CODE INFO:
+# - Like in 'node_utils', we don't store any bpy object in globals, we store how to find the nodes back,
+#   see 'get_node_tree_owner()'. Nodes that can't be found back on flush are ignored.
+# - Requests queued while flushing are kept for the next tick.
+
+import bpy
+
+import traceback
+
+from ..utils.node_utils import get_node_tree_owner, get_node_tree_from_owner, send_refresh_signal
+from ..utils.graph_utils import get_tree_graph
+from ..utils.farm_utils import is_render_farm
+
+
+_REBUILD_QUEUE = {} #(nodetree session_uid, node name, method name) -> (owner type, owner name, node name, args)
+_REFRESH_QUEUE = {} #nodetree session_uid -> (owner type, owner name, set of kicked node names)
+_REFRESH_STATS = {'kicks':0, 'flushes':0, 'trees_tagged':0, 'nodes_updated':0, 'links_churned':0,}
+
+QUEUE_FLUSH_DELAY = 0.05
+
+
+def queue_node_rebuild(node, method:str, *args) -> None:
+    """request a deferred call of 'node.method(*args)'. If already requested, the last arguments are kept"""
+
+    #timers are not running in background or on render farms, nothing to coalesce there anyway.
+    if (is_render_farm()) or (bpy.app.background):
+        getattr(node, method)(*args)
+        return None
+
+    node_tree = node.id_data
+    owner_type, owner_name = get_node_tree_owner(node_tree)
+    if (owner_type is None):
+        getattr(node, method)(*args)
+        return None
+
+    _REBUILD_QUEUE[(node_tree.session_uid, node.name, method)] = (owner_type, owner_name, node.name, args)
+
+    if (not bpy.app.timers.is_registered(flush_rebuild_queue)):
+        bpy.app.timers.register(flush_rebuild_queue, first_interval=QUEUE_FLUSH_DELAY)
+
+    return None
+
+def clear_rebuild_queue() -> None:
+    """forget all pending requests, ex: when loading a new file"""
+
+    _REBUILD_QUEUE.clear()
+    if (bpy.app.timers.is_registered(flush_rebuild_queue)):
+        bpy.app.timers.unregister(flush_rebuild_queue)
+
+    return None
+
+def _tree_nesting_depth(node_tree, _visited=None) -> int:
+    """how deep are the nodegroups nested in this nodetree, trees with a lower depth needs to be rebuilt first"""
+
+    if (_visited is None):
+        _visited = set()
+    _visited.add(node_tree.session_uid)
+
+    depth = 0
+    for n in node_tree.nodes:
+        ng = getattr(n, 'node_tree', None)
+        if (ng is not None) and (ng.session_uid not in _visited):
+            depth = max(depth, 1 + _tree_nesting_depth(ng, _visited))
+        continue
+
+    return depth
+
+def _upstream_order(node_tree, names:set) -> list:
+    """sort the given node names of a nodetree, upstream nodes first"""
+
+    downstream = {}
+    for l in node_tree.links:
+        downstream.setdefault(l.from_node.name, set()).add(l.to_node.name)
+
+    order, visited = [], set()
+
+    def visit(name):
+        #depth first, a node is placed once all its downstream nodes are placed, then the order is reversed
+        stack = [(name, iter(downstream.get(name, ())))]
+        visited.add(name)
+        while stack:
+            current, children = stack[-1]
+            for child in children:
+                if (child not in visited):
+                    visited.add(child)
+                    stack.append((child, iter(downstream.get(child, ()))))
+                    break
+            else:
+                stack.pop()
+                if (current in names):
+                    order.append(current)
+        return None
+
+    for name in sorted(names):
+        if (name not in visited):
+            visit(name)
+
+    order.reverse()
+    return order
+
+def flush_rebuild_queue():
+    """timer function, execute the pending rebuilds in dependency order"""
+
+    pending = dict(_REBUILD_QUEUE)
+    _REBUILD_QUEUE.clear()
+
+    #find back our nodetrees & group the requests per tree
+    trees = {}
+    for (uid, node_name, method), (owner_type, owner_name, _, args) in pending.items():
+        node_tree = get_node_tree_from_owner(owner_type, owner_name)
+        if (node_tree is None) or (node_tree.session_uid!=uid):
+            continue
+        requests = trees.setdefault(uid, (node_tree, {}))[1]
+        requests.setdefault(node_name, []).append((method, args))
+        continue
+
+    depths = {uid: _tree_nesting_depth(node_tree) for uid, (node_tree,_) in trees.items()}
+
+    for uid in sorted(trees, key=lambda uid: depths[uid]):
+        node_tree, requests = trees[uid]
+
+        for node_name in _upstream_order(node_tree, set(requests)):
+            node = node_tree.nodes.get(node_name)
+            if (node is None):
+                continue
+
+            for method, args in requests[node_name]:
+                try:
+                    getattr(node, method)(*args)
+                except Exception:
+                    print(f"ERROR: flush_rebuild_queue(): '{node_name}.{method}()' failed:")
+                    traceback.print_exc()
+                continue
+
+    return None
+
+
+# ooooooooo.              .o88o.                             oooo        
+# `888   `Y88.            888 `"                             `888        
+#  888   .d88'  .ooooo.  o888oo  oooo d8b  .ooooo.   .oooo.o  888 .oo.   
+#  888ooo88P'  d88' `88b  888    `888""8P d88' `88b d88(  "8  888P"Y88b  
+#  888`88b.    888ooo888  888     888     888ooo888 `"Y88b.   888   888  
+#  888  `88b.  888    .o  888     888     888    .o o.  )88b  888   888  
+# o888o  o888o `Y8bod8P' o888o   d888b    `Y8bod8P' 8""888P' o888o o888o 
+
+
+def _queue_refresh(node_tree, node_name:str=None,) -> bool:
+    """add a refresh request for this nodetree, return False if the tree can't be found back later"""
+
+    uid = node_tree.session_uid
+    request = _REFRESH_QUEUE.get(uid)
+    if (request is None):
+        owner_type, owner_name = get_node_tree_owner(node_tree)
+        if (owner_type is None):
+            return False
+        request = _REFRESH_QUEUE[uid] = (owner_type, owner_name, set())
+
+    if (node_name is not None):
+        request[2].add(node_name)
+
+    #timers are not running on render farms, no batching there.
+    if (is_render_farm()):
+        flush_refresh_queue()
+        return True
+
+    if (not bpy.app.timers.is_registered(flush_refresh_queue)):
+        bpy.app.timers.register(flush_refresh_queue, first_interval=0.0)
+
+    return True
+
+def queue_node_refresh(node) -> None:
+    """the values of this node changed, its downstream nodes will be updated on the next tick"""
+
+    _REFRESH_STATS['kicks'] += 1
+
+    if (not _queue_refresh(node.id_data, node.name)):
+        #can't find this tree back on flush, fallback on relinking
+        for socket in node.outputs:
+            _REFRESH_STATS['links_churned'] += len(socket.links)
+            send_refresh_signal(socket)
+
+    return None
+
+def queue_tree_refresh(node_tree) -> None:
+    """this nodetree will be tagged for the depsgraph on the next tick"""
+
+    _REFRESH_STATS['kicks'] += 1
+
+    if (not _queue_refresh(node_tree)):
+        node_tree.update_tag()
+        _REFRESH_STATS['trees_tagged'] += 1
+
+    return None
+
+def clear_refresh_queue() -> None:
+    """forget all pending refresh requests, ex: when loading a new file"""
+
+    _REFRESH_QUEUE.clear()
+    if (bpy.app.timers.is_registered(flush_refresh_queue)):
+        bpy.app.timers.unregister(flush_refresh_queue)
+
+    return None
+
+def get_refresh_stats(reset:bool=False,) -> dict:
+    """get the counters of the refresh service"""
+
+    stats = dict(_REFRESH_STATS)
+    if (reset):
+        for k in _REFRESH_STATS:
+            _REFRESH_STATS[k] = 0
+
+    return stats
+
+def flush_refresh_queue():
+    """timer function, update the downstream nodes of the kicked nodes & tag their nodetrees, once per tree"""
+
+    pending = dict(_REFRESH_QUEUE)
+    _REFRESH_QUEUE.clear()
+    _REFRESH_STATS['flushes'] += 1
+
+    for uid, (owner_type, owner_name, names) in pending.items():
+        node_tree = get_node_tree_from_owner(owner_type, owner_name)
+        if (node_tree is None) or (node_tree.session_uid!=uid):
+            continue
+
+        if (names):
+            graph = get_tree_graph(node_tree)
+            kicked = {graph.node_index[n] for n in names if (n in graph.node_index)}
+            for ni in sorted(graph.reachable_nodes(kicked, 'RIGHT') - kicked):
+                if ('NodeBooster' not in graph.node_idnames[ni]):
+                    continue
+                node = graph.node(node_tree, ni)
+                update = getattr(type(node), '_unhooked_update', None)
+                if (update is None):
+                    continue
+                try:
+                    update(node)
+                    _REFRESH_STATS['nodes_updated'] += 1
+                except Exception:
+                    print(f"ERROR: flush_refresh_queue(): '{node.name}.update()' failed:")
+                    traceback.print_exc()
+                continue
+
+        node_tree.update_tag()
+        _REFRESH_STATS['trees_tagged'] += 1
+        continue
+
+    #updated nodes might have requested refreshes in turn, ex: 'Map Values' tagging its nodegroup
+    if (_REFRESH_QUEUE):
+        return 0.0
+
+    return None
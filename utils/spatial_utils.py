@@ -0,0 +1,225 @@
+# SPDX-FileCopyrightText: 2025 BD3D DIGITAL DESIGN (Dorian B.)
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# NOTE spatial index of the nodes of a nodetree, for our modal hit-testing operators.
+#  - Finding the nodes under/near the cursor, or within a box, by looping over 'node_tree.nodes' and computing their
+#    absolute locations in python on each modal event is slow on trees with thousands of nodes.
+#  - Instead we read all the nodes absolute locations & dimensions at once with 'foreach_get()' into numpy arrays,
+#    and register the node bounds in a uniform grid of 'GRID_CELL_SIZE' cells. Point and box queries only test
+#    the nodes of the overlapping cells.
+#  - The index is cached per nodetree session_uid, and rebuilt lazily: on each access we compare the fresh
+#    locations & dimensions arrays with the indexed ones, which is cheap. Any node moved, resized, added, removed,
+#    or re-ordered (blender re-orders the nodes on selection) rebuilds the index.
+#  - Frames are not indexed, nor compared: their bounds follow their content, and change on each event while
+#    drawing a frame. None of our hit-tests are looking for frames.
+#  - Queries return node indices, positions in 'node_tree.nodes', only valid for the current state of the tree.
+
+# NOTE about the bounds table:
+#  - 'NodesBoundsTable' is a one-shot table of the absolute locations & bounds of all the nodes of a tree, for the
+#    functions needing bounds of many nodes at once (minimap drawing, nodes bounds, farthest node lookups).
+#  - Local locations are read with 'foreach_get()', and resolved to absolute locations level by level through the
+#    frame-parent hierarchy: one vectorized pass per nesting level instead of walking the parents chain of each node.
+#  - Unlike the spatial index, frames are part of the table, with their bounds padding. It is not cached, as frame
+#    parenting changes are not visible from the arrays, build one when needed and drop it.
+
+import bpy
+
+import numpy as np
+from mathutils import Vector
+
+from .draw_utils import get_dpifac
+
+
+_SPATIAL_INDEXES = {} #nodetree session_uid -> NodeSpatialIndex
+
+GRID_CELL_SIZE = 400.0
+
+
+def _read_nodes_arrays(node_tree) -> tuple:
+    """read the absolute locations & dimensions of all nodes at once"""
+
+    count = len(node_tree.nodes)
+    locations = np.empty(count*2, dtype=np.float32)
+    dimensions = np.empty(count*2, dtype=np.float32)
+    node_tree.nodes.foreach_get('location_absolute', locations)
+    node_tree.nodes.foreach_get('dimensions', dimensions)
+
+    return locations.reshape(count,2), dimensions.reshape(count,2)
+
+def get_spatial_index(node_tree):
+    """get the up to date spatial index of this nodetree, rebuilt if any node changed"""
+
+    locations, dimensions = _read_nodes_arrays(node_tree)
+
+    index = _SPATIAL_INDEXES.get(node_tree.session_uid)
+    if (index is None) or (not index.is_matching(locations, dimensions)):
+        index = _SPATIAL_INDEXES[node_tree.session_uid] = NodeSpatialIndex(node_tree, locations, dimensions)
+
+    return index
+
+def clear_spatial_indexes() -> None:
+    """forget all indexes, ex: on file load"""
+    _SPATIAL_INDEXES.clear()
+    return None
+
+
+class NodesBoundsTable():
+    """absolute locations & bounds of all the nodes of a nodetree, row i is 'node_tree.nodes[i]'"""
+
+    __slots__ = ('names', 'is_frame', 'locations', 'mins', 'maxs',)
+
+    def __init__(self, node_tree):
+
+        nodes = node_tree.nodes
+        count = len(nodes)
+        self.names = [n.name for n in nodes]
+        self.is_frame = np.array([(n.type=='FRAME') for n in nodes], dtype=bool)
+
+        local = np.empty(count*2, dtype=np.float32)
+        dimensions = np.empty(count*2, dtype=np.float32)
+        width, height = np.empty(count, dtype=np.float32), np.empty(count, dtype=np.float32)
+        nodes.foreach_get('location', local)
+        nodes.foreach_get('dimensions', dimensions)
+        nodes.foreach_get('width', width)
+        nodes.foreach_get('height', height)
+        local, dimensions = local.reshape(count,2), dimensions.reshape(count,2)
+
+        #resolve the absolute locations, adding the location of one more ancestor on each pass
+        index = {name:i for i,name in enumerate(self.names)}
+        parents = np.array([(-1 if (n.parent is None) else index[n.parent.name]) for n in nodes], dtype=int)
+        self.locations = local.copy()
+        ancestors = parents.copy()
+        while True:
+            mask = ancestors>=0
+            if (not mask.any()):
+                break
+            self.locations[mask] += local[ancestors[mask]]
+            ancestors[mask] = parents[ancestors[mask]]
+
+        #same bounds as 'node_utils.get_node_bounds()'
+        dimx = np.where(self.is_frame, width+40, width)
+        dimy = np.where(self.is_frame, height+20, dimensions[:,1]/get_dpifac())
+        self.mins = np.column_stack((self.locations[:,0], self.locations[:,1]-dimy))
+        self.maxs = np.column_stack((self.locations[:,0]+dimx, self.locations[:,1]))
+
+    def indices(self, nodes) -> list:
+        """rows of the given nodes"""
+        index = {name:i for i,name in enumerate(self.names)}
+        return [index[n.name] for n in nodes]
+
+    def corners(self, rows=None,) -> np.ndarray:
+        """bottom left & top right corners of the nodes, interleaved in a (2*n,2) array"""
+        mins, maxs = (self.mins, self.maxs) if (rows is None) else (self.mins[rows], self.maxs[rows])
+        return np.stack((mins, maxs), axis=1).reshape(-1,2)
+
+    def bounds(self, rows=None,) -> tuple[Vector, Vector]:
+        """bottom left & top right bounds of all or the given nodes"""
+        mins, maxs = (self.mins, self.maxs) if (rows is None) else (self.mins[rows], self.maxs[rows])
+        return Vector(mins.min(axis=0).tolist()), Vector(maxs.max(axis=0).tolist())
+
+    def farthest(self, mode:str='BOTTOM_RIGHT',) -> int:
+        """row of the farthest node location in the given direction"""
+
+        x, y = self.locations[:,0], self.locations[:,1]
+        match mode:
+            case 'RIGHT':
+                return int(np.argmax(x))
+            case 'LEFT':
+                return int(np.argmin(x))
+            case 'TOP':
+                return int(np.argmax(y))
+            case 'BOTTOM':
+                return int(np.argmin(y))
+            case 'BOTTOM_RIGHT':
+                #rightmost, the lowest one on ties
+                return int(np.lexsort((y, -x))[0])
+
+
+class NodeSpatialIndex():
+    """uniform grid of the nodes bounds of a nodetree, in absolute node space, frames excluded"""
+
+    __slots__ = ('names', 'is_frame', 'rows', 'locations', 'dimensions', 'bounds', 'cells',)
+
+    def __init__(self, node_tree, locations, dimensions):
+
+        self.names = [n.name for n in node_tree.nodes]
+        self.is_frame = np.array([(n.type=='FRAME') for n in node_tree.nodes], dtype=bool)
+        self.rows = np.flatnonzero(~self.is_frame) #row -> node index
+        self.locations = locations[self.rows]
+        self.dimensions = dimensions[self.rows]
+
+        #bounds as (xmin, ymin, xmax, ymax), the location is the top left corner of a node.
+        loc, dim = self.locations, self.dimensions / get_dpifac()
+        self.bounds = np.column_stack((loc[:,0], loc[:,1]-dim[:,1], loc[:,0]+dim[:,0], loc[:,1]))
+
+        self.cells = {} #(cell x, cell y) -> list of rows
+        cmin = np.floor(self.bounds[:,:2] / GRID_CELL_SIZE).astype(int).tolist()
+        cmax = np.floor(self.bounds[:,2:] / GRID_CELL_SIZE).astype(int).tolist()
+        for r, (x0, y0), (x1, y1) in zip(range(len(cmin)), cmin, cmax):
+            for cx in range(x0, x1+1):
+                for cy in range(y0, y1+1):
+                    self.cells.setdefault((cx,cy), []).append(r)
+
+    def is_matching(self, locations, dimensions) -> bool:
+        return (len(locations)==len(self.names)) \
+            and np.array_equal(locations[self.rows], self.locations) \
+            and np.array_equal(dimensions[self.rows], self.dimensions)
+
+    def _candidates(self, xmin:float, ymin:float, xmax:float, ymax:float) -> np.ndarray:
+        """rows of the nodes registered in the cells overlapping the given box"""
+
+        x0, y0 = int(np.floor(xmin/GRID_CELL_SIZE)), int(np.floor(ymin/GRID_CELL_SIZE))
+        x1, y1 = int(np.floor(xmax/GRID_CELL_SIZE)), int(np.floor(ymax/GRID_CELL_SIZE))
+
+        found = set()
+        for cx in range(x0, x1+1):
+            for cy in range(y0, y1+1):
+                found.update(self.cells.get((cx,cy), ()))
+
+        return np.fromiter(found, dtype=int, count=len(found))
+
+    def query_box(self, xmin:float, ymin:float, xmax:float, ymax:float, mode:str='LOCATION',) -> list:
+        """get the indices of the nodes within the given box.
+        - mode 'LOCATION': the node top left location is inside the box. 'INTERSECT': the node bounds overlap the box."""
+
+        rows = self._candidates(xmin, ymin, xmax, ymax)
+        if (not len(rows)):
+            return []
+
+        b = self.bounds[rows]
+        match mode:
+            case 'LOCATION':
+                mask = (xmin<=b[:,0]) & (b[:,0]<=xmax) & (ymin<=b[:,3]) & (b[:,3]<=ymax)
+            case 'INTERSECT':
+                mask = (b[:,0]<=xmax) & (b[:,2]>=xmin) & (b[:,1]<=ymax) & (b[:,3]>=ymin)
+
+        return self.rows[np.sort(rows[mask])].tolist()
+
+    def query_nearest(self, x:float, y:float, radius:float=500.0,) -> list:
+        """get the indices of the nodes near the given point, nearest first.
+        Nodes under the point come first, then the distance to the corners & borders middles of the nodes is used.
+        Only the nodes with a top left location within the given radius are considered"""
+
+        rows = self._candidates(x-radius, y-radius, x+radius, y+radius)
+        if (not len(rows)):
+            return []
+
+        loc = self.locations[rows]
+        rows = rows[(np.abs(loc[:,0]-x)<=radius) & (np.abs(loc[:,1]-y)<=radius)]
+        if (not len(rows)):
+            return []
+
+        b = self.bounds[rows]
+        xmin, ymin, xmax, ymax = b[:,0], b[:,1], b[:,2], b[:,3]
+        xmid, ymid = (xmin+xmax)/2, (ymin+ymax)/2
+
+        #distance to the 4 corners & 4 borders middles
+        px = np.column_stack((xmin, xmax, xmin, xmax, xmid, xmid, xmin, xmax))
+        py = np.column_stack((ymax, ymax, ymin, ymin, ymax, ymin, ymid, ymid))
+        dist = np.hypot(px-x, py-y).min(axis=1)
+
+        #nodes directly under the point come first
+        dist[(xmin<=x) & (x<=xmax) & (ymin<=y) & (y<=ymax)] = -1.0
+
+        return self.rows[rows[np.lexsort((rows, dist))]].tolist()